@@ -0,0 +1,101 @@
+"""
+Peak memory and throughput of in-memory vs out-of-core training.
+
+Writes synthetic calibration stores of growing size (backends x days x
+qubits rows) and trains the same XGBoost model on each one with:
+    - memory:   read the whole history, build the feature matrix, fit (notebook path),
+    - quantile: out_of_core with QuantileDMatrix built from batches,
+    - external: out_of_core with ExtMemQuantileDMatrix (binned pages on disk).
+Every run happens in a fresh process so that its peak RSS is its own.
+
+Usage (from the repository root):
+    python benchmarks/bench_out_of_core.py --days 90 365 1095 --backends 4
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+MODES = ["memory", "quantile", "external"]
+
+
+def write_store(root, backends, days, qubits, seed=0):
+    """Write a synthetic store with backends x days x qubits rows (minus missing days)."""
+    from store import CalibrationStore
+    from synthetic import generate_calibrations
+
+    store = CalibrationStore(root)
+    store.write_frame(generate_calibrations(qubits, days, "2022-01-01", backends, seed))
+    return store
+
+
+def run_mode(root, mode, rounds, batch_size):
+    """Train once with `mode` and return timings, rows and peak RSS."""
+    import xgboost as xgb
+
+    from features import CalibrationFeatures, INPUT_COLUMNS, TARGET
+    from out_of_core import TRAIN_COLUMNS, train_out_of_core
+    from store import CalibrationStore
+
+    store = CalibrationStore(root)
+    params = {"max_depth": 5, "learning_rate": 0.03, "subsample": 0.7, "colsample_bytree": 0.7}
+    started = time.perf_counter()
+    if mode == "memory":
+        df = store.read(columns=TRAIN_COLUMNS).dropna(subset=INPUT_COLUMNS + [TARGET])
+        X = CalibrationFeatures().fit(df).transform(df)
+        dtrain = xgb.DMatrix(X, label=df[TARGET].to_numpy())
+        built = time.perf_counter()
+        xgb.train({**params, "tree_method": "hist", "verbosity": 0}, dtrain, num_boost_round=rounds)
+        stats = {"rows": len(df), "build_seconds": built - started, "train_seconds": time.perf_counter() - built}
+    else:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            _, _, stats = train_out_of_core(store, mode=mode, params=params, num_boost_round=rounds,
+                                            batch_size=batch_size, cache_dir=cache_dir)
+    stats["rows_per_second"] = stats["rows"] * rounds / stats["train_seconds"]
+    stats["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[90, 365, 730])
+    parser.add_argument("--backends", type=int, default=2)
+    parser.add_argument("--qubits", type=int, default=127)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--worker", nargs=2, metavar=("STORE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_mode(args.worker[0], args.worker[1], args.rounds, args.batch_size)))
+        return
+
+    results = []
+    for days in args.days:
+        with tempfile.TemporaryDirectory() as root:
+            write_store(root, args.backends, days, args.qubits)
+            for mode in args.modes:
+                out = subprocess.run([sys.executable, __file__, "--worker", root, mode,
+                                      "--rounds", str(args.rounds), "--batch-size", str(args.batch_size)],
+                                     capture_output=True, text=True, check=True)
+                results.append({"days": days, "mode": mode, **json.loads(out.stdout.strip().splitlines()[-1])})
+                print(results[-1], flush=True)
+
+    with pd.option_context("display.width", 200, "display.float_format", "{:.2f}".format):
+        print()
+        print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
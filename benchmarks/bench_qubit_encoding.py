@@ -0,0 +1,112 @@
+"""
+Compare the qubit encodings of features.CalibrationFeatures.
+
+For every encoding, reports the memory of the training matrix, the fit time
+and the test MAE / R² of XGBoost and RandomForest (RandomForest does not
+support the native categorical encoding and is skipped for it).
+
+Usage (from the repository root):
+    python benchmarks/bench_qubit_encoding.py --csv data/raw/df_sherbrooke.csv
+    python benchmarks/bench_qubit_encoding.py --qubits 127 --days 120
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from features import INPUT_COLUMNS, TARGET, CalibrationFeatures  # noqa: E402
+from functions import load_csv  # noqa: E402
+from schema import CALIBRATION_SCHEMA  # noqa: E402
+
+ENCODINGS = ["onehot", "sparse", "categorical", "ordinal", "target"]
+
+
+def matrix_bytes(X):
+    if hasattr(X, "data") and hasattr(X, "indptr"):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    if hasattr(X, "memory_usage"):
+        return int(X.memory_usage(deep=True).sum())
+    return X.nbytes
+
+
+def load_data(args):
+    if args.csv:
+        df = load_csv(args.csv, schema=CALIBRATION_SCHEMA)
+    else:
+        from synthetic import generate_calibrations
+
+        df = generate_calibrations(args.qubits, args.days, seed=args.seed)
+    return df.dropna(subset=INPUT_COLUMNS + [TARGET]).reset_index(drop=True)
+
+
+def run(df, n_estimators, seed):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from xgboost import XGBRegressor
+
+    rng = np.random.default_rng(seed)
+    test = rng.random(len(df)) < 0.2
+    train_df, test_df = df[~test], df[test]
+    y_train = train_df[TARGET].to_numpy()
+    y_test = test_df[TARGET].to_numpy()
+
+    results = []
+    for encoding in ENCODINGS:
+        pipeline = CalibrationFeatures(qubit_encoding=encoding)
+        started = time.perf_counter()
+        X_train = pipeline.fit(train_df).transform(train_df)
+        X_test = pipeline.transform(test_df)
+        feature_time = time.perf_counter() - started
+
+        models = {
+            "xgb": XGBRegressor(n_estimators=n_estimators, max_depth=5, learning_rate=0.05,
+                                tree_method="hist", enable_categorical=True,
+                                random_state=seed, verbosity=0),
+        }
+        if encoding != "categorical":
+            models["rf"] = RandomForestRegressor(n_estimators=n_estimators, max_depth=10,
+                                                 n_jobs=-1, random_state=seed)
+
+        for name, model in models.items():
+            started = time.perf_counter()
+            model.fit(X_train, y_train)
+            fit_time = time.perf_counter() - started
+            y_pred = model.predict(X_test)
+            results.append({
+                "encoding": encoding,
+                "model": name,
+                "n_features": len(pipeline.feature_names_),
+                "train_MB": matrix_bytes(X_train) / 1024 ** 2,
+                "features_s": feature_time,
+                "fit_s": fit_time,
+                "MAE": mean_absolute_error(y_test, y_pred),
+                "R2": r2_score(y_test, y_pred),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", help="Calibration CSV (default: synthetic history)")
+    parser.add_argument("--qubits", type=int, default=127)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    df = load_data(args)
+    print(f"{len(df)} rows, {df['qubit'].nunique()} qubits\n")
+    results = pd.DataFrame(run(df, args.n_estimators, args.seed))
+    with pd.option_context("display.width", 200, "display.float_format", "{:.4f}".format):
+        print(results.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
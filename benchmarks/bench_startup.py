@@ -0,0 +1,126 @@
+"""
+Cold-start import time of the CLI modules and the Streamlit app.
+
+Every entry point is imported in a fresh interpreter (so nothing is already
+in `sys.modules`) and timed, `--repeats` times; the median is compared with
+its budget in `BUDGETS`. Each entry point also lists heavy modules that must
+not be loaded by the import alone (qiskit for `functions`, pydeck/altair for
+the app): they are only imported by the code paths that use them.
+
+For the app, the top-level imports of `streamlit_app/app.py` are read from
+the file and run in the app directory, so the budget follows the file.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --check --repeats 7
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+APP_DIR = os.path.join(ROOT, "streamlit_app")
+
+HEAVY = ["qiskit", "qiskit_ibm_provider", "xgboost", "sklearn", "scipy", "pydeck", "altair", "matplotlib"]
+
+# Median import seconds allowed per entry point, and modules it must not load
+BUDGETS = {
+    "functions": {"seconds": 1.0, "forbidden": ["qiskit", "qiskit_ibm_provider", "xgboost", "sklearn"]},
+    "fleet": {"seconds": 1.0, "forbidden": ["qiskit", "qiskit_ibm_provider", "xgboost", "sklearn"]},
+    "drift": {"seconds": 1.0, "forbidden": ["qiskit", "xgboost", "sklearn", "scipy"]},
+    "quality": {"seconds": 1.0, "forbidden": ["qiskit", "xgboost", "sklearn"]},
+    "synthetic": {"seconds": 1.0, "forbidden": ["qiskit", "xgboost", "sklearn", "scipy"]},
+    "serve": {"seconds": 2.5, "forbidden": ["qiskit", "xgboost"]},
+    "app": {"seconds": 1.0, "forbidden": ["qiskit", "pydeck", "altair", "xgboost", "sklearn"]},
+}
+
+# Runs in the child interpreter: time the import, then list the heavy modules loaded
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {path!r})
+started = time.perf_counter()
+{code}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def app_imports(path=os.path.join(APP_DIR, "app.py")):
+    """Source of the top-level import statements of the Streamlit app."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.get_source_segment(source, node) for node in nodes)
+
+
+def entry_points():
+    """(name, working directory, import code) of every entry point with a budget."""
+    points = [(name, SRC, f"import {name}") for name in BUDGETS if name != "app"]
+    points.append(("app", APP_DIR, app_imports()))
+    return points
+
+
+def measure(cwd, code, repeats):
+    """
+    Import `code` in `repeats` fresh interpreters.
+
+    Returns:
+    dict: Median import seconds, median process seconds and heavy modules loaded.
+    """
+    import time
+
+    script = CHILD.format(path=cwd, code=code, heavy=HEAVY)
+    imports, processes, loaded = [], [], set()
+    for _ in range(repeats):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, "-W", "ignore", "-c", script], cwd=cwd,
+                             capture_output=True, text=True, check=True)
+        processes.append(time.perf_counter() - started)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return {"seconds": statistics.median(imports), "process_seconds": statistics.median(processes),
+            "loaded": sorted(loaded)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(BUDGETS), help="Entry points to measure")
+    parser.add_argument("--check", action="store_true", help="Exit with code 1 if a budget is exceeded")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<12} {'import s':>9} {'budget':>7} {'process s':>10}  heavy modules loaded")
+    for name, cwd, code in entry_points():
+        if args.only and name not in args.only:
+            continue
+        budget = BUDGETS[name]
+        result = measure(cwd, code, args.repeats)
+        forbidden = [m for m in result["loaded"] if m in budget["forbidden"]]
+        over = result["seconds"] > budget["seconds"]
+        flag = "!" if over or forbidden else " "
+        print(f"{name:<12} {result['seconds']:>9.3f} {budget['seconds']:>7.2f} "
+              f"{result['process_seconds']:>10.3f}{flag} {', '.join(result['loaded']) or '-'}", flush=True)
+        if over:
+            failures.append(f"{name}: {result['seconds']:.3f} s > {budget['seconds']:.2f} s budget")
+        if forbidden:
+            failures.append(f"{name}: imports {', '.join(forbidden)} at startup")
+
+    if failures:
+        print("\nOver budget:")
+        for failure in failures:
+            print(f"  {failure}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
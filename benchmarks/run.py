@@ -0,0 +1,237 @@
+"""
+Benchmark suite of the calibration pipeline.
+
+Runs every stage on synthetic data and records its time and memory:
+    ingest            load_calibration_history against a FakeProvider with API latency
+    profile           data_overview (without printing)
+    features          CalibrationFeatures fit + transform
+    train             stacking model (XGBoost + RandomForest) fit
+    predict_batch     prediction of the whole history
+    predict_snapshot  prediction of one calibration day (every qubit)
+
+Time is the median over `--repeats` runs; memory is the peak traced by
+tracemalloc (Python objects and NumPy buffers, not native allocations of
+XGBoost) in one extra run. Results are written as JSON and compared with
+`benchmarks/baseline.json`: a stage slower or heavier than the baseline by
+more than `--tolerance` is reported as a regression (exit code 1 with
+`--check`). Baselines are machine-specific; record one on the machine that
+runs the comparison with `--save-baseline`.
+
+Usage (from the repository root):
+    python benchmarks/run.py
+    python benchmarks/run.py --qubits 127 --days 90 --gates 8 --latency 0.1 --check
+    python benchmarks/run.py --save-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+# Absolute changes below these are treated as noise, whatever the ratio
+MIN_DELTA = {"seconds": 0.01, "peak_mb": 1.0}
+
+
+def measure(func, repeats=1, memory=True):
+    """
+    Time a function and trace its peak memory.
+
+    Parameters:
+    func (callable): Function without arguments.
+    repeats (int): Timed runs.
+    memory (bool): Run once more under tracemalloc to record the peak memory.
+
+    Returns:
+    tuple: (result of the last run, dict with seconds, min_seconds and peak_mb).
+    """
+    times = []
+    result = None
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+
+    stats = {"seconds": statistics.median(times), "min_seconds": min(times)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            stats["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return result, stats
+
+
+def gate_names(n):
+    """`n` single-qubit gate names: the real ones first, then synthetic ones."""
+    from fake_provider import SINGLE_QUBIT_GATES
+
+    return (list(SINGLE_QUBIT_GATES) + [f"g{i}" for i in range(n)])[:n]
+
+
+def run_suite(args):
+    """Run every stage and return the results dict."""
+    from fake_provider import FakeProvider
+    from features import CalibrationFeatures
+    from functions import data_overview, load_calibration_history
+    from model import ReadoutErrorModel, build_stacking_model
+
+    start = date(2024, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    stages = {}
+
+    def ingest():
+        provider = FakeProvider(num_qubits=args.qubits, latency=args.latency, gates=gate_names(args.gates))
+        return load_calibration_history(None, "fake_sherbrooke", str(start), str(end), provider=provider,
+                                        max_workers=args.workers, requests_per_second=None)
+
+    df, stages["ingest"] = measure(ingest, 1, not args.no_memory)
+    rows = len(df)
+    stages["ingest"]["rows"] = rows
+
+    _, stages["profile"] = measure(lambda: data_overview(df, show=False), args.repeats, not args.no_memory)
+    _, stages["features"] = measure(lambda: CalibrationFeatures().fit(df).transform(df), args.repeats,
+                                    not args.no_memory)
+
+    def train():
+        estimator = build_stacking_model({"n_estimators": args.n_estimators, "max_depth": 5,
+                                          "learning_rate": 0.03},
+                                         {"n_estimators": args.n_estimators, "max_depth": 10})
+        return ReadoutErrorModel(estimator=estimator).fit(df)
+
+    model, stages["train"] = measure(train, 1, not args.no_memory)
+    _, stages["predict_batch"] = measure(lambda: model.predict(df), args.repeats, not args.no_memory)
+    snapshot = df[df["date"] == df["date"].max()]
+    _, stages["predict_snapshot"] = measure(lambda: model.predict(snapshot), max(args.repeats, 20),
+                                            not args.no_memory)
+
+    for name in ("profile", "features", "train", "predict_batch"):
+        stages[name]["rows"] = rows
+    stages["predict_snapshot"]["rows"] = len(snapshot)
+    for stage in stages.values():
+        stage["rows_per_second"] = stage["rows"] / stage["seconds"] if stage["seconds"] else None
+
+    return {
+        "params": {k: getattr(args, k) for k in ("qubits", "days", "gates", "latency", "workers",
+                                                  "n_estimators")},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": stages,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Parameters:
+    results (dict): Output of `run_suite`.
+    baseline (dict): Previously saved results.
+    tolerance (float): Allowed relative increase of time and memory.
+
+    Returns:
+    tuple: (list of report lines, list of regressions).
+    """
+    lines = []
+    regressions = []
+    if results["params"] != baseline.get("params"):
+        lines.append(f"warning: baseline params {baseline.get('params')} differ from {results['params']}")
+    lines.append(f"{'stage':<18}{'seconds':>10}{'baseline':>10}{'ratio':>8}{'peak MB':>10}{'baseline':>10}{'ratio':>8}")
+    for name, stage in results["stages"].items():
+        ref = baseline.get("stages", {}).get(name)
+        if ref is None:
+            lines.append(f"{name:<18}{stage['seconds']:>10.4f}{'-':>10}")
+            continue
+        row = f"{name:<18}"
+        for metric in ("seconds", "peak_mb"):
+            value, base = stage.get(metric), ref.get(metric)
+            if value is None or not base:
+                row += f"{'-':>10}{'-':>10}{'-':>8}"
+                continue
+            ratio = value / base
+            regressed = ratio > 1 + tolerance and value - base > MIN_DELTA[metric]
+            row += f"{value:>10.4f}{base:>10.4f}{ratio:>7.2f}{'!' if regressed else ' '}"
+            if regressed:
+                regressions.append(f"{name}.{metric}: {value:.4f} vs {base:.4f} (x{ratio:.2f})")
+        lines.append(row)
+    return lines, regressions
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--qubits", type=int, default=127)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--gates", type=int, default=4, help="Single-qubit gates per qubit")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API latency per call (s)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent API calls")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--check", action="store_true", help="Exit with code 1 on regressions")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    args = parser.parse_args()
+
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    results = run_suite(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}\n")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if not os.path.exists(args.baseline):
+        for name, stage in results["stages"].items():
+            print(f"{name:<18}{stage['seconds']:>10.4f} s{stage.get('peak_mb', float('nan')):>10.1f} MB")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Walk-forward backtest of the readout assignment error model.
+
+Instead of a random train/test split (which trains on calibrations that come
+after the ones it is tested on), every window trains on the days before a
+cutoff and is scored on the days right after it:
+
+    expanding:  [start .......... cutoff) [test)
+    sliding:         [cutoff - train_days, cutoff) [test)
+
+Two training modes:
+    - "refit": an independent XGBoost model per window. Windows do not depend
+      on each other, so they run in parallel over a process pool.
+    - "warm":  daily retraining as it would run in production. The first
+      window is fitted from scratch; every later window continues the
+      previous booster with `update_rounds` extra trees on its training
+      window (`xgb_model=`), and the model is refitted from scratch once it
+      exceeds `max_trees`. The feature pipeline is fitted on the first
+      training window and kept, so that all boosters see the same features.
+
+Usage (from the `src` directory):
+    python backtest.py --store ../data/store --backend ibm_sherbrooke --mode warm
+    python backtest.py --data ../data/raw/df_sherbrooke.csv --mode refit --train-days 90
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from features import INPUT_COLUMNS, TARGET, CalibrationFeatures
+from model import BEST_XGB_PARAMS
+
+Window = namedtuple("Window", ["train_start", "cutoff", "test_end"])
+
+# Data of the current worker process (set once by `_init_worker`)
+_DATA = {}
+
+
+def walk_forward_windows(dates, min_train_days=30, train_days=None, test_days=1, step_days=1):
+    """
+    Build the walk-forward windows over a set of dates.
+
+    Parameters:
+    dates (array-like): Dates of the data (any order, repeated values allowed).
+    min_train_days (int): Days of history before the first cutoff.
+    train_days (int): Length of the sliding training window, or None for an
+        expanding window starting at the first date.
+    test_days (int): Days scored after each cutoff.
+    step_days (int): Days between consecutive cutoffs.
+
+    Returns:
+    list[Window]: Windows [train_start, cutoff) for training and
+    [cutoff, test_end) for testing.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(pd.Series(dates).dropna().unique())).normalize()
+    if dates.empty:
+        return []
+    first, last = dates.min(), dates.max()
+    windows = []
+    cutoff = first + pd.Timedelta(days=min_train_days)
+    while cutoff <= last:
+        train_start = first if train_days is None else max(first, cutoff - pd.Timedelta(days=train_days))
+        windows.append(Window(train_start, cutoff, cutoff + pd.Timedelta(days=test_days)))
+        cutoff += pd.Timedelta(days=step_days)
+    return windows
+
+
+def _bounds(dates, window):
+    """Row ranges (train, test) of a window in date-sorted data."""
+    starts = np.searchsorted(dates, np.array([window.train_start, window.cutoff, window.test_end],
+                                             dtype="datetime64[ns]"))
+    return (starts[0], starts[1]), (starts[1], starts[2])
+
+
+def _score(model, pipeline, test):
+    """MAE and R² of a model on the test rows (NaN when the window has none)."""
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    if test.empty:
+        return {"mae": float("nan"), "r2": float("nan")}
+    y_true = test[TARGET].to_numpy()
+    y_pred = model.predict(pipeline.transform(test))
+    return {
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "r2": float(r2_score(y_true, y_pred)) if len(y_true) > 1 else float("nan"),
+    }
+
+
+def _make_xgb(params, n_estimators, n_jobs):
+    from xgboost import XGBRegressor
+
+    params = {k: v for k, v in params.items() if k != "n_estimators"}
+    return XGBRegressor(n_estimators=n_estimators, tree_method="hist", n_jobs=n_jobs, verbosity=0, **params)
+
+
+def _init_worker(df, dates):
+    _DATA.update(df=df, dates=dates)
+
+
+def _refit_window(window, params, n_jobs):
+    (a, b), (c, d) = _bounds(_DATA["dates"], window)
+    train, test = _DATA["df"].iloc[a:b], _DATA["df"].iloc[c:d]
+
+    started = time.perf_counter()
+    pipeline = CalibrationFeatures().fit(train)
+    model = _make_xgb(params, params.get("n_estimators", 400), n_jobs)
+    model.fit(pipeline.transform(train), train[TARGET].to_numpy())
+    train_seconds = time.perf_counter() - started
+
+    return {"n_train": b - a, "n_test": d - c, "train_seconds": train_seconds,
+            "n_trees": model.get_booster().num_boosted_rounds(), "refit": True,
+            **_score(model, pipeline, test)}
+
+
+def _prepare(df):
+    df = df.dropna(subset=INPUT_COLUMNS + [TARGET]).copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    return df, df["date"].dt.normalize().to_numpy(dtype="datetime64[ns]")
+
+
+def backtest(df, mode="warm", min_train_days=30, train_days=None, test_days=1, step_days=1,
+             params=None, update_rounds=25, max_trees=2000, max_workers=None, n_jobs=None):
+    """
+    Walk-forward backtest of an XGBoost model on calibration records.
+
+    Parameters:
+    df (pd.DataFrame): Calibration records (one backend) with the target column.
+    mode (str): 'warm' (continue the previous booster) or 'refit' (independent
+        model per window, run in parallel).
+    min_train_days (int): Days of history before the first cutoff.
+    train_days (int): Sliding window length, or None for an expanding window.
+    test_days (int): Days scored after each cutoff.
+    step_days (int): Days between cutoffs.
+    params (dict): XGBRegressor parameters (default: `model.BEST_XGB_PARAMS`);
+        `n_estimators` is the size of the from-scratch fits.
+    update_rounds (int): Trees added per window in 'warm' mode.
+    max_trees (int): In 'warm' mode, refit from scratch once the booster has more trees.
+    max_workers (int): Worker processes in 'refit' mode (default: CPU count).
+    n_jobs (int): Threads per model (default: 1 in 'refit' mode, all cores in 'warm' mode).
+
+    Returns:
+    pd.DataFrame: One row per window with its dates, row counts, MAE, R²,
+    training time and number of trees.
+    """
+    params = dict(params or BEST_XGB_PARAMS)
+    df, dates = _prepare(df)
+    windows = walk_forward_windows(dates, min_train_days, train_days, test_days, step_days)
+
+    if mode == "refit":
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(df, dates)) as pool:
+            results = list(pool.map(_refit_window, windows, [params] * len(windows),
+                                    [n_jobs or 1] * len(windows)))
+    elif mode == "warm":
+        results = _warm_backtest(df, dates, windows, params, update_rounds, max_trees, n_jobs or -1)
+    else:
+        raise ValueError(f"Unknown mode '{mode}' (expected 'warm' or 'refit')")
+
+    frame = pd.DataFrame(results)
+    frame.insert(0, "train_start", [w.train_start for w in windows])
+    frame.insert(1, "cutoff", [w.cutoff for w in windows])
+    frame.insert(2, "test_end", [w.test_end for w in windows])
+    return frame
+
+
+def _warm_backtest(df, dates, windows, params, update_rounds, max_trees, n_jobs):
+    results = []
+    pipeline = None
+    booster = None
+    for window in windows:
+        (a, b), (c, d) = _bounds(dates, window)
+        train, test = df.iloc[a:b], df.iloc[c:d]
+
+        started = time.perf_counter()
+        if pipeline is None:
+            pipeline = CalibrationFeatures().fit(train)
+        X_train = pipeline.transform(train)
+        y_train = train[TARGET].to_numpy()
+
+        refit = booster is None or booster.num_boosted_rounds() + update_rounds > max_trees
+        if refit:
+            model = _make_xgb(params, params.get("n_estimators", 400), n_jobs)
+            model.fit(X_train, y_train)
+        else:
+            model = _make_xgb(params, update_rounds, n_jobs)
+            model.fit(X_train, y_train, xgb_model=booster)
+        booster = model.get_booster()
+        train_seconds = time.perf_counter() - started
+
+        results.append({"n_train": b - a, "n_test": d - c, "train_seconds": train_seconds,
+                        "n_trees": booster.num_boosted_rounds(), "refit": refit,
+                        **_score(model, pipeline, test)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", help="Calibration CSV or Parquet")
+    source.add_argument("--store", help="Calibration store directory")
+    parser.add_argument("--backend", help="Backend to read from the store")
+    parser.add_argument("--mode", choices=["warm", "refit"], default="warm")
+    parser.add_argument("--min-train-days", type=int, default=30)
+    parser.add_argument("--train-days", type=int, help="Sliding window length (default: expanding)")
+    parser.add_argument("--test-days", type=int, default=1)
+    parser.add_argument("--step-days", type=int, default=1)
+    parser.add_argument("--update-rounds", type=int, default=25)
+    parser.add_argument("--max-trees", type=int, default=2000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", help="CSV with the per-window results")
+    args = parser.parse_args(argv)
+
+    if args.store:
+        from store import CalibrationStore
+
+        df = CalibrationStore(args.store).read(args.backend)
+    elif args.data.endswith(".parquet"):
+        df = pd.read_parquet(args.data)
+    else:
+        df = pd.read_csv(args.data)
+
+    results = backtest(df, args.mode, args.min_train_days, args.train_days, args.test_days, args.step_days,
+                       update_rounds=args.update_rounds, max_trees=args.max_trees, max_workers=args.workers)
+    if args.output:
+        results.to_csv(args.output, index=False)
+    with pd.option_context("display.width", 200, "display.max_rows", 40):
+        print(results.to_string(index=False))
+    print(f"\n{len(results)} windows | mean MAE {results['mae'].mean():.5f} | mean R² {results['r2'].mean():.4f}"
+          f" | training {results['train_seconds'].sum():.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+from instrumentation import count
+
+# Connection reuse and response cache for the IBM Quantum API.
+#
+# Creating an `IBMProvider` authenticates against the API and `get_backend`
+# is another round trip, so providers and backends are pooled per process:
+# every loader called with the same token shares one session.
+#
+# `backend.properties(datetime=t)` returns the calibration in force at `t`,
+# which cannot change once `t` is in the past, so responses are cached on
+# disk, content-addressed:
+#
+#   <root>/objects/<sha[:2]>/<sha>.json.gz        snapshot JSON, named by its SHA-256
+#   <root>/refs/<backend>/<requested>.json        {"sha": ..., "fetched_at": ..., "requested": ...}
+#
+# Refs are keyed by the exact requested datetime in UTC (naive datetimes are
+# taken as local time, as `IBMBackend.properties` does), or "latest" for
+# `datetime=None`. Requests without a new
+# calibration return the previous snapshot, so they point at the same object.
+# A ref is permanent only if it was fetched after the requested datetime;
+# "latest" and requests for a time still in the future when fetched expire
+# after `today_ttl` seconds.
+
+# Repository-level .cache/, wherever the caller runs from (src/, notebooks/, root)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "properties")
+DEFAULT_TODAY_TTL = 3600.0
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of providers (per token) and backends (per provider and name).
+
+    Parameters:
+    provider_factory (callable): `f(token)` creating a provider (default: `IBMProvider(token=token)`).
+    """
+
+    def __init__(self, provider_factory=None):
+        self.provider_factory = provider_factory
+        self._providers = {}  # sha256(token) -> provider
+        self._backends = {}  # (sha256(token), name) -> backend
+        self._lock = threading.Lock()
+
+    def provider(self, token):
+        """
+        Provider for `token`, created (and authenticated) on first use only.
+
+        Parameters:
+        token (str): IBM Quantum API token.
+
+        Returns:
+        IBMProvider: Shared provider.
+        """
+        # Tokens are not kept in memory as dictionary keys, only their hash
+        key = hashlib.sha256(str(token).encode()).hexdigest()
+        with self._lock:
+            if key not in self._providers:
+                factory = self.provider_factory
+                if factory is None:
+                    from qiskit_ibm_provider import IBMProvider
+
+                    factory = lambda token: IBMProvider(token=token)  # noqa: E731
+                self._providers[key] = factory(token)
+            return self._providers[key]
+
+    def backend(self, backend_name, token=None, provider=None):
+        """
+        Backend object of the pooled provider for `token`, looked up once per name.
+
+        A `provider` passed explicitly (e.g. a `fake_provider.FakeProvider`) is
+        not pooled: its `get_backend` is called directly and its lifetime stays
+        with the caller.
+
+        Parameters:
+        backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
+        token (str): Token of the pooled provider (ignored if `provider` is given).
+        provider (IBMProvider): Provider to use instead of the pooled one.
+
+        Returns:
+        IBMBackend: Backend object.
+        """
+        if provider is not None:
+            return provider.get_backend(backend_name)
+        provider = self.provider(token)
+        key = (hashlib.sha256(str(token).encode()).hexdigest(), backend_name)
+        with self._lock:
+            if key not in self._backends:
+                self._backends[key] = provider.get_backend(backend_name)
+            return self._backends[key]
+
+    def clear(self):
+        """Forget every pooled provider and backend."""
+        with self._lock:
+            self._providers.clear()
+            self._backends.clear()
+
+
+_POOL = ConnectionPool()
+
+
+def get_provider(token):
+    """Shared provider for `token` (see `ConnectionPool.provider`)."""
+    return _POOL.provider(token)
+
+
+def get_backend(backend_name, token=None, provider=None):
+    """Shared backend object (see `ConnectionPool.backend`)."""
+    return _POOL.backend(backend_name, token=token, provider=provider)
+
+
+def clear_pool():
+    """Drop the pooled providers and backends (e.g. after a token change)."""
+    _POOL.clear()
+
+
+def _json_default(value):
+    if isinstance(value, (dt.datetime, dt.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class PropertiesCache:
+    """
+    Content-addressed on-disk cache of `backend.properties(datetime=day)` responses.
+
+    Parameters:
+    root (str): Cache directory (created if missing).
+    today_ttl (float): Seconds a snapshot requested for "now" (datetime None) or for
+        a time not yet passed when it was fetched stays valid.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, today_ttl=DEFAULT_TODAY_TTL):
+        self.root = root
+        self.today_ttl = today_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def _requested(day):
+        """Requested datetime as an aware UTC datetime (None for the latest snapshot)."""
+        if day is None:
+            return None
+        # Naive datetimes are local time, like the provider's `local_to_utc`
+        return day.astimezone(dt.timezone.utc)
+
+    def _ref_path(self, backend_name, day):
+        requested = self._requested(day)
+        key = "latest" if requested is None else requested.strftime("%Y-%m-%dT%H%M%S.%fZ")
+        return os.path.join(self.root, "refs", backend_name, f"{key}.json")
+
+    def _object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], f"{sha}.json.gz")
+
+    @staticmethod
+    def _write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _expired(self, day, fetched_at):
+        requested = self._requested(day)
+        if requested is not None and fetched_at > requested.timestamp():
+            return False  # Fetched after the requested time: immutable history
+        return dt.datetime.now(dt.timezone.utc).timestamp() - fetched_at > self.today_ttl
+
+    def get_dict(self, backend_name, day):
+        """
+        Cached snapshot dict of (backend, requested datetime), or None if missing or expired.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+        day (datetime): Requested datetime (None for the latest snapshot).
+
+        Returns:
+        dict: Snapshot as returned by `BackendProperties.to_dict` (dates as ISO strings).
+        """
+        try:
+            with open(self._ref_path(backend_name, day)) as f:
+                ref = json.load(f)
+            if self._expired(day, ref["fetched_at"]):
+                return None
+            with gzip.open(self._object_path(ref["sha"]), "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError, KeyError):
+            # Missing, partially written or corrupted entries are fetched again
+            return None
+
+    def put_dict(self, backend_name, day, data):
+        """
+        Store a snapshot dict and point the (backend, requested datetime) ref at it.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+        day (datetime): Requested datetime (None for the latest snapshot).
+        data (dict): Snapshot as returned by `BackendProperties.to_dict`.
+
+        Returns:
+        str: SHA-256 of the stored object.
+        """
+        payload = json.dumps(data, default=_json_default, sort_keys=True, separators=(",", ":")).encode()
+        sha = hashlib.sha256(payload).hexdigest()
+        object_path = self._object_path(sha)
+        if not os.path.exists(object_path):
+            # mtime=0: the same snapshot always gives the same compressed bytes
+            self._write_atomic(object_path, gzip.compress(payload, mtime=0))
+        requested = self._requested(day)
+        ref = json.dumps({
+            "sha": sha,
+            "fetched_at": dt.datetime.now(dt.timezone.utc).timestamp(),
+            "requested": None if requested is None else requested.isoformat(),
+        }).encode()
+        self._write_atomic(self._ref_path(backend_name, day), ref)
+        return sha
+
+    def properties(self, backend, day=None):
+        """
+        `backend.properties(datetime=day)`, served from the cache when possible.
+
+        Parameters:
+        backend (IBMBackend): Backend to query on a cache miss (its `name` is the key).
+        day (datetime): Requested datetime, local time if naive (None: the latest snapshot).
+
+        Returns:
+        BackendProperties: Calibration snapshot, or None if the backend has none
+        for `day` (nothing is cached then).
+        """
+        from qiskit.providers.models import BackendProperties
+
+        name = backend.name() if callable(backend.name) else backend.name
+        data = self.get_dict(name, day)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        count("properties_cache.misses" if data is None else "properties_cache.hits")
+        if data is not None:
+            return BackendProperties.from_dict(data)
+
+        properties = backend.properties(datetime=day)
+        if properties is None:
+            return None
+        self.put_dict(name, day, properties.to_dict())
+        return properties
+
+    def stats(self):
+        """
+        Hit and miss counts since this cache object was created.
+
+        Returns:
+        dict: 'hits', 'misses' and 'hit_rate'.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
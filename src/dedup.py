@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+
+# Hash-based deduplication.
+#
+# Rows (or their key columns) are reduced to 64-bit hashes, so deduplicating
+# a stream of chunks only needs a sorted array of 8-byte hashes of the keys
+# seen so far, never the rows themselves. Keep policies:
+#   - "first":  keep the first occurrence of every key (single pass),
+#   - "last":   keep the last occurrence in stream order,
+#   - "latest": keep the row with the largest `order_by` value per key
+#               (ties resolved by stream order, like "last").
+# "last" and "latest" need two passes over the chunks: the first one finds the
+# winning row of every key, the second one emits those rows.
+
+KEEP_POLICIES = ("first", "last", "latest")
+
+
+class DedupReport:
+    """
+    Counters of a deduplication run.
+
+    Attributes:
+    rows_in (int): Rows read.
+    rows_out (int): Rows kept.
+    """
+
+    def __init__(self):
+        self.rows_in = 0
+        self.rows_out = 0
+
+    @property
+    def removed(self):
+        """Number of rows dropped as duplicates."""
+        return self.rows_in - self.rows_out
+
+    def __repr__(self):
+        return f"DedupReport(rows_in={self.rows_in}, rows_out={self.rows_out}, removed={self.removed})"
+
+
+def row_hashes(df, subset=None):
+    """
+    Hash every row (or its `subset` columns) to a 64-bit integer.
+
+    Parameters:
+    df (pd.DataFrame): Frame to hash.
+    subset (list[str]): Key columns, or None to hash whole rows.
+
+    Returns:
+    np.ndarray: uint64 hash per row.
+    """
+    data = df if subset is None else df[list(subset)]
+    return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+
+def _check_policy(keep, order_by):
+    if keep not in KEEP_POLICIES:
+        raise ValueError(f"keep must be one of {KEEP_POLICIES}, got {keep!r}")
+    if keep == "latest" and order_by is None:
+        raise ValueError("keep='latest' requires an order_by column")
+
+
+def _order_values(df, order_by):
+    values = df[order_by]
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.to_numpy(dtype="datetime64[ns]").view(np.int64).astype(np.float64)
+    return values.to_numpy(dtype=np.float64, na_value=-np.inf)
+
+
+def _winners(hashes, order, positions):
+    """Positions of the winning row per hash: highest order, then latest position."""
+    idx = np.lexsort((positions, order, hashes))
+    hashes, order, positions = hashes[idx], order[idx], positions[idx]
+    last = np.ones(len(hashes), dtype=bool)
+    last[:-1] = hashes[1:] != hashes[:-1]
+    return hashes[last], order[last], positions[last]
+
+
+def keep_mask(df, subset=None, keep="first", order_by=None):
+    """
+    Boolean mask of the rows to keep when deduplicating one frame.
+
+    Parameters:
+    df (pd.DataFrame): Frame to deduplicate.
+    subset (list[str]): Key columns, or None for whole rows.
+    keep (str): 'first', 'last' or 'latest'.
+    order_by (str): Column deciding the winner for keep='latest'.
+
+    Returns:
+    np.ndarray: True for the rows to keep.
+    """
+    _check_policy(keep, order_by)
+    hashes = row_hashes(df, subset)
+    mask = np.zeros(len(df), dtype=bool)
+    if keep == "first":
+        _, first = np.unique(hashes, return_index=True)
+        mask[first] = True
+        return mask
+
+    positions = np.arange(len(df))
+    order = _order_values(df, order_by) if keep == "latest" else np.zeros(len(df))
+    _, _, winners = _winners(hashes, order, positions)
+    mask[winners] = True
+    return mask
+
+
+def dedupe_frame(df, subset=None, keep="first", order_by=None):
+    """
+    Deduplicate one in-memory frame by key columns.
+
+    Parameters:
+    df (pd.DataFrame): Frame to deduplicate.
+    subset (list[str]): Key columns, or None for whole rows.
+    keep (str): 'first', 'last' or 'latest'.
+    order_by (str): Column deciding the winner for keep='latest'.
+
+    Returns:
+    tuple[pd.DataFrame, int]: Deduplicated frame (always a new frame with a
+    fresh RangeIndex) and the number of rows removed.
+    """
+    mask = keep_mask(df, subset, keep, order_by)
+    removed = int(len(df) - mask.sum())
+    if removed == 0:
+        return df.reset_index(drop=True), 0
+    return df[mask].reset_index(drop=True), removed
+
+
+def iter_dedupe(chunks, subset=None, keep="first", order_by=None, report=None):
+    """
+    Deduplicate a stream of chunks in bounded memory.
+
+    Only the hashes of the keys are kept between chunks. For keep='first'
+    `chunks` may be any iterable; for 'last' and 'latest' it is read twice,
+    so it must be a callable returning a fresh iterable of the same chunks
+    (e.g. `lambda: store.iter_batches(...)`).
+
+    Parameters:
+    chunks (iterable or callable): DataFrame chunks, or a factory of them.
+    subset (list[str]): Key columns, or None for whole rows.
+    keep (str): 'first', 'last' or 'latest'.
+    order_by (str): Column deciding the winner for keep='latest'.
+    report (DedupReport): Optional report updated with row counts.
+
+    Yields:
+    pd.DataFrame: Deduplicated chunks, in stream order.
+    """
+    _check_policy(keep, order_by)
+    report = report if report is not None else DedupReport()
+
+    if keep == "first":
+        seen = np.empty(0, dtype=np.uint64)
+        for chunk in (chunks() if callable(chunks) else chunks):
+            hashes = row_hashes(chunk, subset)
+            uniq, first = np.unique(hashes, return_index=True)
+            new = np.ones(len(uniq), dtype=bool)
+            if len(seen):
+                pos = np.minimum(np.searchsorted(seen, uniq), len(seen) - 1)
+                new = seen[pos] != uniq
+            mask = np.zeros(len(chunk), dtype=bool)
+            mask[first[new]] = True
+            seen = np.union1d(seen, uniq)
+            report.rows_in += len(chunk)
+            report.rows_out += int(mask.sum())
+            yield chunk[mask]
+        return
+
+    if not callable(chunks):
+        raise TypeError("keep='last'/'latest' needs a callable returning the chunks (two passes)")
+
+    # Pass 1: winning global row position of every key
+    hashes = np.empty(0, dtype=np.uint64)
+    order = np.empty(0, dtype=np.float64)
+    winners = np.empty(0, dtype=np.int64)
+    offset = 0
+    for chunk in chunks():
+        chunk_order = _order_values(chunk, order_by) if keep == "latest" else np.zeros(len(chunk))
+        positions = np.arange(offset, offset + len(chunk), dtype=np.int64)
+        hashes, order, winners = _winners(
+            np.concatenate([hashes, row_hashes(chunk, subset)]),
+            np.concatenate([order, chunk_order]),
+            np.concatenate([winners, positions]),
+        )
+        offset += len(chunk)
+    winners = np.sort(winners)
+    del hashes, order
+
+    # Pass 2: emit the winning rows
+    offset = 0
+    for chunk in chunks():
+        positions = np.arange(offset, offset + len(chunk), dtype=np.int64)
+        pos = np.minimum(np.searchsorted(winners, positions), max(len(winners) - 1, 0))
+        mask = winners[pos] == positions if len(winners) else np.zeros(len(chunk), dtype=bool)
+        offset += len(chunk)
+        report.rows_in += len(chunk)
+        report.rows_out += int(mask.sum())
+        yield chunk[mask]
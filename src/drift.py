@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+
+# Per-qubit time-series index for drift queries and degradation alerts.
+#
+# The calibration history is split once into one chronological series per
+# (backend, qubit), stored as NumPy arrays: a date range query is a binary
+# search in one series instead of a filter over the whole DataFrame.
+#
+# Every row also carries the rolling baseline of each metric: mean and
+# standard deviation of the `window` calibrations *before* it. New days are
+# appended with their baseline computed from the tail of the series only,
+# and the latest calibration of every qubit is kept in (qubits x metrics)
+# arrays, so that alerts are a vectorized z-score over the whole fleet.
+
+DEFAULT_METRICS = ["T1 (us)", "T2 (us)", "Readout assignment error"]
+
+# +1: high values are bad (errors), -1: low values are bad (coherence times)
+DEFAULT_DIRECTIONS = {
+    "T1 (us)": -1,
+    "T2 (us)": -1,
+    "Readout assignment error": 1,
+}
+
+
+def baseline_stats(values, window=30, min_periods=5, group_starts=None):
+    """
+    Mean and standard deviation of the `window` observations before every row.
+
+    Parameters:
+    values (np.ndarray): (rows, metrics) chronological values; NaN are skipped.
+    window (int): Number of previous observations in the baseline.
+    min_periods (int): Minimum non-missing observations for a baseline (NaN otherwise).
+    group_starts (np.ndarray): For several series stacked one after another,
+        the index of the first row of each row's series (default: one series).
+
+    Returns:
+    tuple: (mean, std) arrays shaped like `values` (std with ddof=1).
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    zero = np.zeros((1, values.shape[1]))
+    s1 = np.concatenate([zero, np.cumsum(x, axis=0)])
+    s2 = np.concatenate([zero, np.cumsum(x * x, axis=0)])
+    cnt = np.concatenate([zero, np.cumsum(valid, axis=0)])
+
+    rows = np.arange(n)
+    lo = rows - window
+    lo = np.maximum(lo, 0 if group_starts is None else group_starts)
+    total = s1[rows] - s1[lo]
+    squares = s2[rows] - s2[lo]
+    count = cnt[rows] - cnt[lo]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        var = (squares - total * mean) / (count - 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    enough = count >= max(min_periods, 2)
+    return np.where(enough, mean, np.nan), np.where(enough, std, np.nan)
+
+
+class DriftIndex:
+    """
+    Calibration history indexed by (backend, qubit) and date, with rolling baselines.
+
+    Parameters:
+    metrics (list[str]): Columns indexed (default: T1, T2 and readout assignment error).
+    window (int): Calibrations in the rolling baseline of every row.
+    min_periods (int): Minimum calibrations for a baseline.
+    """
+
+    def __init__(self, metrics=None, window=30, min_periods=5):
+        self.metrics = list(metrics or DEFAULT_METRICS)
+        self.window = window
+        self.min_periods = min_periods
+        self.keys = []  # (backend, qubit), in insertion order
+        self._positions = {}  # (backend, qubit) -> position in `keys`
+        self._series = []  # per key: dict of dates, values, mean, std arrays
+        m = len(self.metrics)
+        self._latest_date = np.empty(0, dtype="datetime64[D]")
+        self._latest = np.empty((0, m))
+        self._latest_mean = np.empty((0, m))
+        self._latest_std = np.empty((0, m))
+        self.skipped_rows = 0
+
+    def __len__(self):
+        return sum(len(s["dates"]) for s in self._series)
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        """
+        Build the index from calibration records.
+
+        Parameters:
+        df (pd.DataFrame): Records with backend, date, qubit and the metrics.
+        **kwargs: Options of DriftIndex.
+
+        Returns:
+        DriftIndex: The index.
+        """
+        index = cls(**kwargs)
+        index.append(df)
+        return index
+
+    @classmethod
+    def from_store(cls, store, backend_name=None, start_date=None, end_date=None, batch_size=500_000, **kwargs):
+        """
+        Build the index from a CalibrationStore, reading it in batches.
+
+        Parameters:
+        store (CalibrationStore): Source store.
+        backend_name (str): Backend to index, or None for all backends.
+        start_date (str): First date ('YYYY-MM-DD'), inclusive.
+        end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+        batch_size (int): Maximum rows per batch.
+        **kwargs: Options of DriftIndex.
+
+        Returns:
+        DriftIndex: The index.
+        """
+        index = cls(**kwargs)
+        columns = ["backend", "date", "qubit"] + index.metrics
+        for batch in store.iter_batches(backend_name, start_date, end_date, columns=columns, batch_size=batch_size):
+            index.append(batch)
+        return index
+
+    def append(self, df):
+        """
+        Add new calibrations, computing their baselines from the tail of each series.
+
+        Rows dated on or before the last indexed day of their qubit are
+        ignored (counted in `skipped_rows`): backfilling needs a rebuild.
+
+        Parameters:
+        df (pd.DataFrame): Records with backend, date, qubit and the metrics.
+
+        Returns:
+        int: Number of rows added.
+        """
+        if df.empty:
+            return 0
+        frame = pd.DataFrame({
+            "backend": df["backend"].astype(str).to_numpy(),
+            "qubit": df["qubit"].to_numpy(dtype=np.int64),
+            "date": pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[D]"),
+        })
+        values = df[self.metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+        order = np.lexsort((frame["date"].to_numpy(), frame["qubit"].to_numpy(), frame["backend"].to_numpy()))
+        frame = frame.iloc[order].reset_index(drop=True)
+        values = values[order]
+
+        keys = frame[["backend", "qubit"]]
+        starts = np.flatnonzero((keys != keys.shift()).any(axis=1).to_numpy())
+        ends = np.append(starts[1:], len(frame))
+
+        added = 0
+        touched = []
+        backends = frame["backend"].to_numpy()
+        qubits = frame["qubit"].to_numpy()
+        dates = frame["date"].to_numpy()
+        for a, b in zip(starts, ends):
+            key = (backends[a], int(qubits[a]))
+            pos = self._positions.get(key)
+            if pos is None:
+                pos = self._add_key(key)
+            added += self._extend(pos, dates[a:b], values[a:b])
+            touched.append(pos)
+        self._refresh_latest(touched)
+        return added
+
+    def _add_key(self, key):
+        m = len(self.metrics)
+        pos = len(self.keys)
+        self.keys.append(key)
+        self._positions[key] = pos
+        self._series.append({
+            "dates": np.empty(0, dtype="datetime64[D]"),
+            "values": np.empty((0, m)),
+            "mean": np.empty((0, m)),
+            "std": np.empty((0, m)),
+        })
+        self._latest_date = np.append(self._latest_date, np.datetime64("NaT", "D"))
+        self._latest = np.vstack([self._latest, np.full((1, m), np.nan)])
+        self._latest_mean = np.vstack([self._latest_mean, np.full((1, m), np.nan)])
+        self._latest_std = np.vstack([self._latest_std, np.full((1, m), np.nan)])
+        return pos
+
+    def _extend(self, pos, dates, values):
+        series = self._series[pos]
+        # Repeated dates in the input: keep the last row of each day
+        last_of_day = np.append(dates[1:] != dates[:-1], True)
+        keep = last_of_day
+        if len(series["dates"]):
+            keep = keep & (dates > series["dates"][-1])
+        self.skipped_rows += int(len(dates) - keep.sum())
+        dates, values = dates[keep], values[keep]
+        if not len(dates):
+            return 0
+
+        # Baselines of the new rows only need the last `window` indexed values
+        tail = series["values"][-self.window:]
+        mean, std = baseline_stats(np.vstack([tail, values]), self.window, self.min_periods)
+        series["dates"] = np.concatenate([series["dates"], dates])
+        series["values"] = np.vstack([series["values"], values])
+        series["mean"] = np.vstack([series["mean"], mean[len(tail):]])
+        series["std"] = np.vstack([series["std"], std[len(tail):]])
+        return len(dates)
+
+    def _refresh_latest(self, positions):
+        for pos in positions:
+            series = self._series[pos]
+            if len(series["dates"]):
+                self._latest_date[pos] = series["dates"][-1]
+                self._latest[pos] = series["values"][-1]
+                self._latest_mean[pos] = series["mean"][-1]
+                self._latest_std[pos] = series["std"][-1]
+
+    def query(self, backend_name, qubit, start_date=None, end_date=None):
+        """
+        Calibrations of one qubit in a date range (binary search).
+
+        Parameters:
+        backend_name (str): Backend name.
+        qubit (int): Qubit index.
+        start_date (str or datetime): First date, inclusive (None: from the start).
+        end_date (str or datetime): Last date, inclusive (None: up to the latest).
+
+        Returns:
+        pd.DataFrame: date, the metrics and their baseline '<metric> mean' / '<metric> std'.
+        """
+        pos = self._positions.get((str(backend_name), int(qubit)))
+        if pos is None:
+            raise KeyError(f"No calibrations indexed for qubit {qubit} of {backend_name}")
+        series = self._series[pos]
+        a, b = self._range(series["dates"], start_date, end_date)
+
+        out = {"date": series["dates"][a:b].astype("datetime64[ns]")}
+        for j, metric in enumerate(self.metrics):
+            out[metric] = series["values"][a:b, j]
+        for j, metric in enumerate(self.metrics):
+            out[f"{metric} mean"] = series["mean"][a:b, j]
+            out[f"{metric} std"] = series["std"][a:b, j]
+        return pd.DataFrame(out)
+
+    @staticmethod
+    def _range(dates, start_date, end_date):
+        a = 0 if start_date is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date), "D"), "left")
+        b = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date), "D"), "right")
+        return a, b
+
+    def latest(self):
+        """
+        Latest calibration of every indexed qubit with its baseline.
+
+        Returns:
+        pd.DataFrame: backend, qubit, date, metrics, '<metric> mean' and '<metric> std'.
+        """
+        out = {
+            "backend": [k[0] for k in self.keys],
+            "qubit": np.array([k[1] for k in self.keys], dtype=np.int64),
+            "date": self._latest_date.astype("datetime64[ns]"),
+        }
+        for j, metric in enumerate(self.metrics):
+            out[metric] = self._latest[:, j]
+        for j, metric in enumerate(self.metrics):
+            out[f"{metric} mean"] = self._latest_mean[:, j]
+            out[f"{metric} std"] = self._latest_std[:, j]
+        return pd.DataFrame(out)
+
+    def alerts(self, threshold=3.0, metrics=None, directions=None, two_sided=False, as_of=None):
+        """
+        Qubits whose latest calibration deviates from its rolling baseline.
+
+        Parameters:
+        threshold (float): Minimum |z-score| ((value - baseline mean) / baseline std).
+        metrics (list[str]): Metrics to check (default: all indexed metrics).
+        directions (dict): Metric -> +1 (high is bad) or -1 (low is bad)
+            (default: `DEFAULT_DIRECTIONS`, +1 for unknown metrics).
+        two_sided (bool): Flag deviations in both directions.
+        as_of (str or datetime): Use each qubit's last calibration on or before
+            this date instead of the latest one.
+
+        Returns:
+        pd.DataFrame: One row per (qubit, metric) alert with backend, qubit, date,
+        metric, value, baseline_mean, baseline_std and z, sorted by |z|.
+        """
+        metrics = self.metrics if metrics is None else list(metrics)
+        directions = {**DEFAULT_DIRECTIONS, **(directions or {})}
+        j = [self.metrics.index(m) for m in metrics]
+
+        if as_of is None:
+            dates, values, mean, std = self._latest_date, self._latest, self._latest_mean, self._latest_std
+        else:
+            dates, values, mean, std = self._snapshot(as_of)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (values[:, j] - mean[:, j]) / std[:, j]
+        signs = np.array([directions.get(m, 1) for m in metrics], dtype=np.float64)
+        score = np.abs(z) if two_sided else z * signs
+        hit_rows, hit_cols = np.nonzero(np.nan_to_num(score, nan=-np.inf) > threshold)
+
+        alerts = pd.DataFrame({
+            "backend": [self.keys[r][0] for r in hit_rows],
+            "qubit": np.array([self.keys[r][1] for r in hit_rows], dtype=np.int64),
+            "date": dates[hit_rows].astype("datetime64[ns]"),
+            "metric": [metrics[c] for c in hit_cols],
+            "value": values[hit_rows, np.array(j, dtype=np.intp)[hit_cols]],
+            "baseline_mean": mean[hit_rows, np.array(j, dtype=np.intp)[hit_cols]],
+            "baseline_std": std[hit_rows, np.array(j, dtype=np.intp)[hit_cols]],
+            "z": z[hit_rows, hit_cols],
+        })
+        return alerts.reindex(alerts["z"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+    def _snapshot(self, as_of):
+        """Last calibration on or before `as_of` of every qubit."""
+        m = len(self.metrics)
+        n = len(self.keys)
+        target = np.datetime64(pd.Timestamp(as_of), "D")
+        dates = np.full(n, np.datetime64("NaT", "D"))
+        values, mean, std = (np.full((n, m), np.nan) for _ in range(3))
+        for pos, series in enumerate(self._series):
+            i = np.searchsorted(series["dates"], target, "right") - 1
+            if i >= 0:
+                dates[pos] = series["dates"][i]
+                values[pos] = series["values"][i]
+                mean[pos] = series["mean"][i]
+                std[pos] = series["std"][i]
+        return dates, values, mean, std
+
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import count, timed
+from schema import (
+    CALIBRATION_COLUMNS,
+    CALIBRATION_SCHEMA,
+    GATE_ERROR_FIELDS,
+    GATE_TIME_COLUMN,
+    OPERATIONAL_COLUMN,
+    QUBIT_FIELDS,
+    enforce_schema,
+)
+
+# Columnar extraction of BackendProperties snapshots.
+#
+# Each snapshot is converted into a handful of preallocated NumPy arrays
+# indexed by (qubit, field) and (qubit, gate type); snapshots are then
+# concatenated column by column into a single DataFrame, without building a
+# Python dict per qubit. Column names and dtypes come from schema.py.
+
+# Mappings resolved once at import time instead of per qubit and parameter
+_QUBIT_INDEX = {name: j for j, name in enumerate(QUBIT_FIELDS)}
+_GATE_INDEX = {gate: j for j, gate in enumerate(GATE_ERROR_FIELDS)}
+
+
+@timed("parse")
+def properties_to_arrays(properties, backend_name, date_str):
+    """
+    Convert one BackendProperties snapshot into column arrays.
+
+    Qubit properties are matched by Nduv name (not by position) and gate
+    errors by gate type. When several gates of the same type act on a qubit
+    (e.g. two ECR pairs), the last one listed wins, as does the gate length.
+
+    Parameters:
+    properties (BackendProperties): Calibration snapshot of the backend.
+    backend_name (str): Name of the backend the snapshot belongs to.
+    date_str (str): Date of the snapshot in 'YYYY-MM-DD' format.
+
+    Returns:
+    dict[str, np.ndarray]: One array per column of `CALIBRATION_COLUMNS`.
+    Raises ValueError if `properties` is None (no calibration for the date).
+    """
+    if properties is None:
+        raise ValueError(f"No calibration snapshot for {backend_name} on {date_str}")
+    num_qubits = len(properties.qubits)
+    count("parse.rows", num_qubits)
+    qubit_values = np.full((num_qubits, len(_QUBIT_INDEX)), np.nan, dtype=np.float32)
+    gate_errors = np.full((num_qubits, len(_GATE_INDEX)), np.nan, dtype=np.float32)
+    gate_time = np.full(num_qubits, np.nan, dtype=np.float32)
+    operational = np.ones(num_qubits, dtype=bool)  # Qubit listed => operational
+
+    for q, nduvs in enumerate(properties.qubits):
+        for nduv in nduvs:
+            j = _QUBIT_INDEX.get(nduv.name)
+            if j is not None:
+                qubit_values[q, j] = nduv.value
+            elif nduv.name == "operational":
+                operational[q] = bool(nduv.value)
+
+    for gate in properties.gates:
+        j = _GATE_INDEX.get(gate.gate)
+        for param in gate.parameters:
+            if param.name == "gate_error" and j is not None:
+                gate_errors[gate.qubits, j] = param.value
+            elif param.name == "gate_length":
+                gate_time[gate.qubits] = param.value
+
+    columns = {
+        "backend": np.full(num_qubits, backend_name, dtype=object),
+        "date": np.full(num_qubits, np.datetime64(date_str, "ns")),
+        "qubit": np.arange(num_qubits, dtype=np.int16),
+    }
+    for j, name in enumerate(QUBIT_FIELDS.values()):
+        columns[name] = qubit_values[:, j]
+    for j, name in enumerate(GATE_ERROR_FIELDS.values()):
+        columns[name] = gate_errors[:, j]
+    columns[GATE_TIME_COLUMN] = gate_time
+    columns[OPERATIONAL_COLUMN] = operational
+    return columns
+
+
+def arrays_to_frame(snapshots):
+    """
+    Concatenate snapshot arrays into a single DataFrame.
+
+    Parameters:
+    snapshots (list[dict]): Outputs of `properties_to_arrays`.
+
+    Returns:
+    pd.DataFrame: One row per (date, qubit) with `CALIBRATION_COLUMNS`,
+    typed according to `CALIBRATION_SCHEMA`.
+    """
+    if not snapshots:
+        empty = {col: pd.Series(dtype=CALIBRATION_SCHEMA[col]) for col in CALIBRATION_COLUMNS}
+        return pd.DataFrame(empty, columns=CALIBRATION_COLUMNS)
+    if len(snapshots) == 1:
+        data = snapshots[0]
+    else:
+        data = {col: np.concatenate([snap[col] for snap in snapshots]) for col in CALIBRATION_COLUMNS}
+    return enforce_schema(pd.DataFrame(data, columns=CALIBRATION_COLUMNS))
@@ -0,0 +1,284 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Offline stand-in for IBMProvider / IBMBackend: serves qiskit BackendProperties
+# built locally, with configurable latency and failures, so that the ingestion
+# code can be exercised (and timed) without network access or a token.
+
+SINGLE_QUBIT_GATES = ["id", "rz", "sx", "x"]
+
+
+class FakeProviderError(Exception):
+    """Error raised by the fake backend to simulate a failed API call."""
+
+
+def make_properties_dict(backend_name, day, num_qubits=127, seed=0, gates=SINGLE_QUBIT_GATES):
+    """
+    Build a BackendProperties-compatible dict for one calibration day.
+
+    Values are deterministic for a given (seed, day), so repeated requests for
+    the same date return the same snapshot, like the real API does.
+
+    Parameters:
+    backend_name (str): Name reported by the snapshot.
+    day (datetime): Calibration date.
+    num_qubits (int): Number of qubits of the fake device.
+    seed (int): Seed for the random values.
+    gates (list[str]): Single-qubit gates calibrated on every qubit (an 'ecr'
+        gate is always added between neighbouring qubits).
+
+    Returns:
+    dict: Dictionary accepted by `BackendProperties.from_dict`.
+    """
+    rng = random.Random(seed * 1_000_003 + day.toordinal())
+    stamp = day.strftime("%Y-%m-%dT00:00:00+00:00")
+
+    def nduv(name, unit, value):
+        return {"date": stamp, "name": name, "unit": unit, "value": value}
+
+    qubits = []
+    for _ in range(num_qubits):
+        t1 = rng.uniform(80, 400)
+        p01 = rng.uniform(0.002, 0.05)
+        p10 = rng.uniform(0.002, 0.05)
+        qubits.append([
+            nduv("T1", "us", t1),
+            nduv("T2", "us", rng.uniform(0.3, 1.5) * t1),
+            nduv("frequency", "GHz", rng.uniform(4.5, 5.2)),
+            nduv("anharmonicity", "GHz", rng.uniform(-0.32, -0.30)),
+            nduv("readout_error", "", (p01 + p10) / 2),
+            nduv("prob_meas0_prep1", "", p01),
+            nduv("prob_meas1_prep0", "", p10),
+            nduv("readout_length", "ns", 1244.4),
+        ])
+
+    gate_list = []
+    for q in range(num_qubits):
+        for gate in gates:
+            error = 0.0 if gate == "rz" else rng.uniform(1e-4, 1e-3)
+            length = 0.0 if gate == "rz" else 56.9
+            gate_list.append({
+                "qubits": [q],
+                "gate": gate,
+                "name": f"{gate}{q}",
+                "parameters": [nduv("gate_error", "", error), nduv("gate_length", "ns", length)],
+            })
+    for q in range(num_qubits - 1):
+        gate_list.append({
+            "qubits": [q, q + 1],
+            "gate": "ecr",
+            "name": f"ecr{q}_{q + 1}",
+            "parameters": [
+                nduv("gate_error", "", rng.uniform(3e-3, 2e-2)),
+                nduv("gate_length", "ns", 533.3),
+            ],
+        })
+
+    return {
+        "backend_name": backend_name,
+        "backend_version": "1.0.0",
+        "last_update_date": stamp,
+        "qubits": qubits,
+        "gates": gate_list,
+        "general": [],
+    }
+
+
+class FakeBackend:
+    """
+    Fake backend serving `BackendProperties` with injected latency and failures.
+
+    Parameters:
+    name (str): Backend name.
+    num_qubits (int): Number of qubits of each snapshot.
+    latency (float or tuple): Seconds slept per call, or a (low, high) range.
+    failure_rate (float): Probability that a call raises `FakeProviderError`.
+    fail_dates (iterable): Dates ('YYYY-MM-DD') that always fail.
+    seed (int): Seed for both the snapshot values and the injected failures.
+    properties_factory (callable): Optional `f(backend_name, day)` returning a
+        properties dict, replacing `make_properties_dict`.
+    gates (list[str]): Single-qubit gates of each snapshot (see `make_properties_dict`).
+    """
+
+    def __init__(self, name="fake_sherbrooke", num_qubits=127, latency=0.0, failure_rate=0.0,
+                 fail_dates=(), seed=0, properties_factory=None, gates=SINGLE_QUBIT_GATES):
+        self.name = name
+        self.num_qubits = num_qubits
+        self.gates = list(gates)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_dates = set(fail_dates)
+        self.seed = seed
+        self.properties_factory = properties_factory
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                delay = self._rng.uniform(*self.latency)
+        else:
+            delay = self.latency
+        if delay:
+            time.sleep(delay)
+
+    def properties(self, refresh=False, datetime=None):
+        """
+        Return the calibration snapshot for `datetime` (today if None).
+
+        Parameters:
+        refresh (bool): Ignored, kept for API compatibility.
+        datetime (datetime): Date of the snapshot.
+
+        Returns:
+        BackendProperties: Calibration snapshot.
+        """
+        from qiskit.providers.models import BackendProperties
+
+        day = datetime or _now()
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.failure_rate
+        self._sleep()
+        if fail or day.strftime("%Y-%m-%d") in self.fail_dates:
+            raise FakeProviderError(f"Simulated API failure for {self.name} on {day:%Y-%m-%d}")
+
+        if self.properties_factory is not None:
+            data = self.properties_factory(self.name, day)
+        else:
+            data = make_properties_dict(self.name, day, self.num_qubits, self.seed, self.gates)
+        return BackendProperties.from_dict(data)
+
+
+class FakeJobStatus:
+    """Minimal stand-in for qiskit's JobStatus enum members."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"<JobStatus.{self.name}>"
+
+
+class FakeJob:
+    """
+    Fake job whose `result()` has injected latency and failures.
+
+    Parameters:
+    backend (FakeBackend): Backend the job ran on.
+    index (int): Position of the job in the listing (used for its id and date).
+    status (str): Final status name ('DONE', 'ERROR', 'CANCELLED', ...).
+    num_experiments (int): Number of circuits in the job result.
+    latency (float or tuple): Seconds slept by `result()`, or a (low, high) range.
+    failure_rate (float): Probability that `result()` raises `FakeProviderError`.
+    seed (int): Seed for the job values and injected failures.
+    """
+
+    def __init__(self, backend, index, status="DONE", num_experiments=2, latency=0.0,
+                 failure_rate=0.0, seed=0):
+        self._backend = backend
+        self._index = index
+        self._status = FakeJobStatus(status)
+        self._num_experiments = num_experiments
+        self._latency = latency
+        self._failure_rate = failure_rate
+        self._rng = random.Random(seed * 1_000_003 + index)
+        self.result_calls = 0
+
+    def job_id(self):
+        return f"fake-{self._backend.name}-{self._index:06d}"
+
+    def creation_date(self):
+        return datetime(2025, 6, 1) - timedelta(minutes=self._index)
+
+    def backend(self):
+        return self._backend
+
+    def status(self):
+        return self._status
+
+    def result(self):
+        from qiskit.result import Result
+
+        self.result_calls += 1
+        delay = self._rng.uniform(*self._latency) if isinstance(self._latency, (tuple, list)) else self._latency
+        if delay:
+            time.sleep(delay)
+        if self._rng.random() < self._failure_rate:
+            raise FakeProviderError(f"Simulated result failure for job {self.job_id()}")
+
+        experiments = []
+        for i in range(self._num_experiments):
+            experiments.append({
+                "shots": 4000,
+                "success": True,
+                "status": "DONE",
+                "data": {},
+                "header": {"name": f"circuit-{i}", "n_qubits": self._rng.randint(1, 127)},
+            })
+        return Result.from_dict({
+            "backend_name": self._backend.name,
+            "backend_version": "1.0.0",
+            "qobj_id": self.job_id(),
+            "job_id": self.job_id(),
+            "success": True,
+            "results": experiments,
+        })
+
+
+class FakeProvider:
+    """
+    Drop-in replacement for `IBMProvider` returning `FakeBackend` and `FakeJob` objects.
+
+    Parameters:
+    job_latency (float or tuple): Seconds slept by each `FakeJob.result()`.
+    job_failure_rate (float): Probability that a job result request fails.
+    job_statuses (dict): Relative weights of the final job statuses.
+    **backend_kwargs: Options forwarded to every `FakeBackend` created.
+    """
+
+    def __init__(self, job_latency=0.0, job_failure_rate=0.0, job_statuses=None, **backend_kwargs):
+        self.backend_kwargs = backend_kwargs
+        self.job_latency = job_latency
+        self.job_failure_rate = job_failure_rate
+        self.job_statuses = job_statuses or {"DONE": 1.0}
+        self._backends = {}
+
+    def jobs(self, limit=10, skip=0, backend_name=None, **kwargs):
+        """
+        List fake jobs of a backend, newest first.
+
+        Parameters:
+        limit (int): Number of jobs to return.
+        skip (int): Number of jobs to skip.
+        backend_name (str): Backend the jobs ran on.
+
+        Returns:
+        list[FakeJob]: Jobs with their final status already set.
+        """
+        backend = self.get_backend(backend_name or "fake_sherbrooke")
+        seed = self.backend_kwargs.get("seed", 0)
+        rng = random.Random(seed)
+        statuses = list(self.job_statuses)
+        weights = list(self.job_statuses.values())
+        jobs = []
+        for index in range(skip, skip + limit):
+            jobs.append(FakeJob(backend, index, status=rng.choices(statuses, weights)[0],
+                                latency=self.job_latency, failure_rate=self.job_failure_rate,
+                                seed=seed))
+        return jobs
+
+    def get_backend(self, name):
+        if name not in self._backends:
+            self._backends[name] = FakeBackend(name=name, **self.backend_kwargs)
+        return self._backends[name]
+
+    def backends(self):
+        return list(self._backends.values())
+
+
+def _now():
+    return datetime.now()
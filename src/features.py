@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from instrumentation import timed
+
+# Feature engineering of the readout-error model, as a fitted transformer.
+#
+# Reproduces the notebook feature cells in a single pass over the input:
+# winsorized T1 / frequency, inv_T1, ratio_T1_T2, time features, a qubit
+# encoding and the degree-2 polynomial of (log T1, log T2), optionally
+# min-max scaled. Every feature is written straight into one preallocated
+# float32 matrix instead of building a DataFrame copy per step.
+#
+# Qubit encodings (`qubit_encoding`):
+#   - "onehot":      dense 0/1 columns, one per qubit (the notebook's get_dummies),
+#   - "sparse":      the same one-hot columns, returned as a scipy CSR matrix,
+#   - "categorical": a single pandas categorical column, for XGBoost with
+#                    enable_categorical=True (the output is a DataFrame),
+#   - "ordinal":     a single column with the qubit's index in the vocabulary,
+#   - "target":      a single column with the smoothed mean target of the qubit.
+
+TARGET = "Readout assignment error"
+
+INPUT_COLUMNS = ["date", "qubit", "T1 (us)", "T2 (us)", "Frequency (GHz)", "Anharmonicity (GHz)"]
+
+CALIB_FEATURES = ["inv_T1", "ratio_T1_T2", "Frequency (GHz)", "Anharmonicity (GHz)"]
+TIME_FEATURES = ["days_since_start", "day_of_week", "month", "hour"]
+POLY_FEATURES = ["T1 (us)", "T2 (us)", "T1 (us)^2", "T1 (us) T2 (us)", "T2 (us)^2"]
+
+QUBIT_ENCODINGS = ("onehot", "sparse", "categorical", "ordinal", "target")
+
+EPS = 1e-6
+
+_N_LEFT = len(CALIB_FEATURES) + len(TIME_FEATURES)
+_N_CORE = _N_LEFT + len(POLY_FEATURES)
+
+
+def data_hash(df, columns=None):
+    """
+    SHA-256 of the content of a DataFrame (or of some of its columns).
+
+    Parameters:
+    df (pd.DataFrame): Data to hash.
+    columns (list[str]): Columns to include, or None for all of them.
+
+    Returns:
+    str: Hex digest, stable across processes.
+    """
+    data = df if columns is None else df[columns]
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in data.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class CalibrationFeatures(BaseEstimator, TransformerMixin):
+    """
+    Fitted feature pipeline for the readout assignment error model.
+
+    Parameters:
+    winsor_quantiles (tuple): Lower and upper quantiles used to clip T1 and
+        frequency (fitted on the training data).
+    scale (bool): Min-max scale the calibration, time and polynomial features
+        with bounds fitted on the training data (as the notebook's
+        MinMaxScaler; one-hot columns are already in [0, 1]).
+    qubit_encoding (str): One of `QUBIT_ENCODINGS`.
+    target_smoothing (float): Weight of the global mean in the "target"
+        encoding (equivalent number of rows).
+    """
+
+    def __init__(self, winsor_quantiles=(0.01, 0.99), scale=True, qubit_encoding="onehot",
+                 target_smoothing=10.0):
+        self.winsor_quantiles = winsor_quantiles
+        self.scale = scale
+        self.qubit_encoding = qubit_encoding
+        self.target_smoothing = target_smoothing
+
+    @timed("features.fit")
+    def fit(self, df, y=None):
+        """
+        Learn winsorization bounds, start date, qubit vocabulary and scaling bounds.
+
+        Parameters:
+        df (pd.DataFrame): Training calibration records with `INPUT_COLUMNS`.
+        y (array-like): Target, only needed by the "target" qubit encoding
+            (defaults to the `TARGET` column of `df`).
+
+        Returns:
+        CalibrationFeatures: The fitted pipeline.
+        """
+        if self.qubit_encoding not in QUBIT_ENCODINGS:
+            raise ValueError(f"qubit_encoding must be one of {QUBIT_ENCODINGS}, got {self.qubit_encoding!r}")
+
+        lower, upper = self.winsor_quantiles
+        bounds = df[["T1 (us)", "Frequency (GHz)"]].quantile([lower, upper])
+        self.t1_bounds_ = bounds["T1 (us)"].tolist()
+        self.freq_bounds_ = bounds["Frequency (GHz)"].tolist()
+        self.start_date_ = pd.to_datetime(df["date"]).min()
+        self.qubits_ = sorted(int(q) for q in pd.unique(df["qubit"]))
+        self._set_feature_names()
+
+        self.target_means_ = None
+        self.target_prior_ = None
+        if self.qubit_encoding == "target":
+            target = np.asarray(df[TARGET] if y is None else y, dtype=np.float64)
+            codes, known = self._qubit_codes(df)
+            sums = np.bincount(codes[known], weights=target[known], minlength=len(self.qubits_))
+            counts = np.bincount(codes[known], minlength=len(self.qubits_))
+            self.target_prior_ = float(np.nanmean(target))
+            m = self.target_smoothing
+            self.target_means_ = ((sums + m * self.target_prior_) / (counts + m)).tolist()
+
+        self.min_ = None
+        self.scale_ = None
+        if self.scale:
+            core = np.empty((len(df), _N_CORE), dtype=np.float32)
+            self._fill_core(df, core[:, :_N_LEFT], core[:, _N_LEFT:])
+            # NaN are ignored, as MinMaxScaler does: a missing T2 must not turn
+            # the bounds (and thus the whole column) into NaN
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN columns
+                data_min = np.nanmin(core, axis=0)
+                data_range = np.nanmax(core, axis=0) - data_min
+            data_min[np.isnan(data_min)] = 0.0
+            # Constant (or all-NaN) columns map to 0, as MinMaxScaler
+            data_range[~(data_range > 0)] = 1.0
+            self.min_ = data_min
+            self.scale_ = (1.0 / data_range).astype(np.float32)
+        return self
+
+    @timed("features.transform")
+    def transform(self, df):
+        """
+        Build the feature matrix.
+
+        Parameters:
+        df (pd.DataFrame): Calibration records with `INPUT_COLUMNS`.
+
+        Returns:
+        np.ndarray, scipy.sparse.csr_matrix or pd.DataFrame: float32 features
+        with `feature_names_` columns ("sparse" returns CSR, "categorical" a
+        DataFrame whose qubit column is categorical).
+        """
+        n = len(df)
+        codes, known = self._qubit_codes(df)
+
+        if self.qubit_encoding in ("onehot", "ordinal", "target"):
+            width = len(self.feature_names_)
+            X = np.zeros((n, width), dtype=np.float32)
+            self._fill_core(df, X[:, :_N_LEFT], X[:, width - len(POLY_FEATURES):])
+            self._scale(X[:, :_N_LEFT], X[:, width - len(POLY_FEATURES):])
+            if self.qubit_encoding == "onehot":
+                # Qubits unseen during fit get an all-zero row
+                X[np.flatnonzero(known), _N_LEFT + codes[known]] = 1.0
+            elif self.qubit_encoding == "ordinal":
+                X[:, _N_LEFT] = np.where(known, codes, -1)
+            else:
+                means = np.asarray(self.target_means_, dtype=np.float32)
+                X[:, _N_LEFT] = np.where(known, means[codes], self.target_prior_)
+            return X
+
+        core = np.empty((n, _N_CORE), dtype=np.float32)
+        self._fill_core(df, core[:, :_N_LEFT], core[:, _N_LEFT:])
+        self._scale(core[:, :_N_LEFT], core[:, _N_LEFT:])
+
+        if self.qubit_encoding == "sparse":
+            from scipy import sparse
+
+            rows = np.flatnonzero(known)
+            onehot = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, codes[known])),
+                shape=(n, len(self.qubits_)),
+            )
+            return sparse.hstack(
+                [sparse.csr_matrix(core[:, :_N_LEFT]), onehot, sparse.csr_matrix(core[:, _N_LEFT:])],
+                format="csr",
+            )
+
+        # categorical
+        frame = pd.DataFrame(core[:, :_N_LEFT], columns=CALIB_FEATURES + TIME_FEATURES)
+        frame["qubit"] = pd.Categorical(df["qubit"].to_numpy(), categories=self.qubits_)
+        for j, name in enumerate(POLY_FEATURES):
+            frame[name] = core[:, _N_LEFT + j]
+        return frame
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_, dtype=object)
+
+    def _set_feature_names(self):
+        if self.qubit_encoding in ("onehot", "sparse"):
+            qubit_features = [f"qubit_{q}" for q in self.qubits_]
+        else:
+            qubit_features = ["qubit"]
+        self.feature_names_ = CALIB_FEATURES + TIME_FEATURES + qubit_features + POLY_FEATURES
+
+    def _qubit_codes(self, df):
+        """Index of every row's qubit in the fitted vocabulary, and whether it is known."""
+        qubits = df["qubit"].to_numpy()
+        vocab = np.asarray(self.qubits_)
+        codes = np.minimum(np.searchsorted(vocab, qubits), len(vocab) - 1)
+        return codes, vocab[codes] == qubits
+
+    def _fill_core(self, df, left, right):
+        """Write the calibration + time features into `left` and the polynomial into `right`."""
+        t1 = np.clip(df["T1 (us)"].to_numpy(dtype=np.float64), *self.t1_bounds_)
+        t2 = df["T2 (us)"].to_numpy(dtype=np.float64)
+        freq = np.clip(df["Frequency (GHz)"].to_numpy(dtype=np.float64), *self.freq_bounds_)
+
+        # Calibration features
+        left[:, 0] = 1.0 / (t1 + EPS)
+        left[:, 1] = t1 / (t2 + EPS)
+        left[:, 2] = freq
+        left[:, 3] = df["Anharmonicity (GHz)"].to_numpy(dtype=np.float64)
+
+        # Time features
+        dates = pd.DatetimeIndex(pd.to_datetime(df["date"]))
+        left[:, 4] = (dates - self.start_date_).days
+        left[:, 5] = dates.dayofweek
+        left[:, 6] = dates.month
+        left[:, 7] = dates.hour
+
+        # Degree-2 polynomial of (log T1, log T2)
+        log_t1 = np.log1p(t1)
+        log_t2 = np.log1p(t2)
+        right[:, 0] = log_t1
+        right[:, 1] = log_t2
+        right[:, 2] = log_t1 * log_t1
+        right[:, 3] = log_t1 * log_t2
+        right[:, 4] = log_t2 * log_t2
+
+    def _scale(self, left, right):
+        if self.min_ is None:
+            return
+        left -= self.min_[:_N_LEFT]
+        left *= self.scale_[:_N_LEFT]
+        right -= self.min_[_N_LEFT:]
+        right *= self.scale_[_N_LEFT:]
+
+    def state_dict(self):
+        """
+        Fitted state as a JSON-serialisable dict.
+
+        Returns:
+        dict: Parameters and fitted attributes of the pipeline.
+        """
+        return {
+            "params": {
+                "winsor_quantiles": list(self.winsor_quantiles),
+                "scale": self.scale,
+                "qubit_encoding": self.qubit_encoding,
+                "target_smoothing": self.target_smoothing,
+            },
+            "t1_bounds": self.t1_bounds_,
+            "freq_bounds": self.freq_bounds_,
+            "start_date": self.start_date_.isoformat(),
+            "qubits": self.qubits_,
+            "target_means": self.target_means_,
+            "target_prior": self.target_prior_,
+            "min": None if self.min_ is None else self.min_.tolist(),
+            "scale": None if self.scale_ is None else self.scale_.tolist(),
+        }
+
+    @classmethod
+    def from_state_dict(cls, state):
+        """
+        Rebuild a fitted pipeline from `state_dict` output.
+
+        Parameters:
+        state (dict): Output of `state_dict`.
+
+        Returns:
+        CalibrationFeatures: Fitted pipeline.
+        """
+        params = dict(state["params"])
+        params["winsor_quantiles"] = tuple(params["winsor_quantiles"])
+        pipeline = cls(**params)
+        pipeline.t1_bounds_ = state["t1_bounds"]
+        pipeline.freq_bounds_ = state["freq_bounds"]
+        pipeline.start_date_ = pd.Timestamp(state["start_date"])
+        pipeline.qubits_ = state["qubits"]
+        pipeline.target_means_ = state.get("target_means")
+        pipeline.target_prior_ = state.get("target_prior")
+        pipeline.min_ = None if state["min"] is None else np.asarray(state["min"], dtype=np.float32)
+        pipeline.scale_ = None if state["scale"] is None else np.asarray(state["scale"], dtype=np.float32)
+        pipeline._set_feature_names()
+        return pipeline
+
+    def save(self, path):
+        """Write the fitted state to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.state_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Load a fitted pipeline saved with `save`."""
+        with open(path) as f:
+            return cls.from_state_dict(json.load(f))
+
+    def fingerprint(self):
+        """Hash of the fitted state, part of the feature cache key."""
+        return hashlib.sha256(json.dumps(self.state_dict(), sort_keys=True).encode()).hexdigest()
+
+    def transform_cached(self, df, cache_dir):
+        """
+        `transform` with an on-disk cache keyed by the input data and fitted state.
+
+        Only dense encodings ("onehot", "ordinal", "target") are cached; the
+        other encodings fall back to `transform`.
+
+        Parameters:
+        df (pd.DataFrame): Calibration records with `INPUT_COLUMNS`.
+        cache_dir (str): Directory holding the cached matrices (.npy files).
+
+        Returns:
+        np.ndarray: float32 feature matrix.
+        """
+        if self.qubit_encoding in ("sparse", "categorical"):
+            return self.transform(df)
+
+        key = hashlib.sha256(
+            (data_hash(df, INPUT_COLUMNS) + self.fingerprint()).encode()
+        ).hexdigest()
+        path = os.path.join(cache_dir, f"features-{key[:32]}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+
+        X = self.transform(df)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, X)
+        os.replace(tmp_path, path)
+        return X
@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+from instrumentation import count, observe, span
+
+# Outcome of one fetched item: the value on success, the last exception on failure
+FetchResult = namedtuple("FetchResult", ["key", "value", "error", "attempts"])
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; every
+    request takes one token and blocks while the bucket is empty.
+
+    Parameters:
+    rate (float): Sustained number of requests allowed per second.
+    capacity (int): Maximum burst size (tokens the bucket can hold).
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be a positive number of requests per second")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Block until `tokens` tokens are available and take them.
+
+        Parameters:
+        tokens (int): Number of tokens to consume.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    if waited:
+                        observe("rate_limit.wait_seconds", waited)
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+def backoff_delay(attempt, base=0.5, maximum=30.0):
+    """
+    Exponential backoff with full jitter.
+
+    Parameters:
+    attempt (int): Zero-based retry number.
+    base (float): Delay in seconds for the first retry.
+    maximum (float): Upper bound for the delay in seconds.
+
+    Returns:
+    float: Random delay in [0, min(maximum, base * 2**attempt)].
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def call_with_retries(func, key, limiter=None, max_retries=3, backoff_base=0.5, backoff_max=30.0,
+                      span_name="fetch"):
+    """
+    Call `func(key)` retrying failures with exponential backoff and jitter.
+
+    Parameters:
+    func (callable): Function receiving a single argument.
+    key: Argument passed to `func`.
+    limiter (TokenBucket): Optional rate limiter, consulted before every attempt.
+    max_retries (int): Number of retries after the first attempt.
+    backoff_base (float): Base delay in seconds for the backoff.
+    backoff_max (float): Maximum delay in seconds between attempts.
+    span_name (str): Instrumentation span timing every attempt; retries and
+        final failures are counted as '<span_name>.retries' / '<span_name>.failures'.
+
+    Returns:
+    FetchResult: Value (or last error) together with the number of attempts.
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with span(span_name):
+                value = func(key)
+            return FetchResult(key, value, None, attempt + 1)
+        except Exception as exc:
+            if attempt >= max_retries:
+                count(f"{span_name}.failures", error=type(exc).__name__)
+                return FetchResult(key, None, exc, attempt + 1)
+            count(f"{span_name}.retries", error=type(exc).__name__)
+            time.sleep(backoff_delay(attempt, backoff_base, backoff_max))
+            attempt += 1
+
+
+def iter_fetch(func, keys, max_workers=4, requests_per_second=None, burst=1,
+               max_retries=3, backoff_base=0.5, backoff_max=30.0, ordered=True):
+    """
+    Fetch `func(key)` for every key with a bounded worker pool.
+
+    At most `2 * max_workers` calls are in flight at any time, so results are
+    streamed back without materialising the whole range first. With
+    `ordered=False` results are yielded as they complete, so one slow key
+    does not hold back the others.
+
+    Parameters:
+    func (callable): Function receiving a single key (e.g. a datetime).
+    keys (iterable): Keys to fetch, in the order results should be returned.
+    max_workers (int): Number of concurrent worker threads.
+    requests_per_second (float): Global rate limit, or None for no limit.
+    burst (int): Maximum burst size allowed by the rate limiter.
+    max_retries (int): Retries per key after the first failed attempt.
+    backoff_base (float): Base delay in seconds for the exponential backoff.
+    backoff_max (float): Maximum delay in seconds between attempts.
+    ordered (bool): Yield in the order of `keys` (True) or of completion (False).
+
+    Yields:
+    FetchResult: One result per key (its `key` identifies it when unordered).
+    """
+    limiter = TokenBucket(requests_per_second, burst) if requests_per_second else None
+    max_workers = max(1, int(max_workers))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit(key):
+            return executor.submit(call_with_retries, func, key, limiter, max_retries, backoff_base, backoff_max)
+
+        if ordered:
+            pending = deque()
+            for key in keys:
+                pending.append(submit(key))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            in_flight = set()
+            for key in keys:
+                in_flight.add(submit(key))
+                if len(in_flight) >= 2 * max_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(in_flight):
+                yield future.result()
+
+
+def fetch_concurrently(func, keys, **kwargs):
+    """
+    Eager version of `iter_fetch`.
+
+    Parameters:
+    func (callable): Function receiving a single key.
+    keys (iterable): Keys to fetch.
+    **kwargs: Options forwarded to `iter_fetch`.
+
+    Returns:
+    list[FetchResult]: Results in the same order as `keys`.
+    """
+    return list(iter_fetch(func, keys, **kwargs))
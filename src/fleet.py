@@ -0,0 +1,290 @@
+"""
+Calibration ingestion for a whole fleet of backends into one store.
+
+`functions.load_calibration_history` pulls one backend with its own
+provider session. Here a single pooled provider (one authentication, see
+`connections`) and one `get_backend` per backend serve every request; the
+(backend, date) pairs still missing from the store are fanned out over one
+worker pool under one global token bucket (`fetcher.iter_fetch`), so the
+API rate budget holds for the fleet as a whole and not per backend. Dates
+go round-robin over the backends, so they all advance together, and every
+snapshot is written to its `backend=<name>/date=<day>` partition as soon as
+it arrives. Dates that fail to download or to parse are counted per backend
+and skipped.
+
+Usage (from the `src` directory):
+    IBM_TOKEN=... python fleet.py --store ../data/store --start 2024-01-01 --end 2024-06-30 \\
+        --backends ibm_sherbrooke ibm_brisbane ibm_kyoto
+    python fleet.py --store /tmp/store --start 2024-01-01 --end 2024-01-31 --fake \\
+        --backends fake_a fake_b --latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import pandas as pd
+
+from connections import PropertiesCache, get_backend
+from extraction import arrays_to_frame, properties_to_arrays
+from fetcher import iter_fetch
+from functions import date_range
+
+
+class BackendProgress:
+    """
+    Counters of one backend in a fleet ingestion run.
+
+    Attributes:
+    backend (str): Backend name.
+    dates_total (int): Dates requested.
+    dates_stored (int): Dates already in the store before the run (not fetched).
+    dates_fetched (int): Dates downloaded and written during the run.
+    failures (Counter): Dates lost after all retries or with an unusable
+        snapshot, by exception type.
+    rows (int): Rows written during the run.
+    attempts (int): API calls made, retries included.
+    api_seconds (float): Time spent inside successful API calls.
+    elapsed (float): Seconds from the start of the run to the last finished date.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.dates_total = 0
+        self.dates_stored = 0
+        self.dates_fetched = 0
+        self.failures = Counter()
+        self.rows = 0
+        self.attempts = 0
+        self.api_seconds = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def dates_done(self):
+        return self.dates_stored + self.dates_fetched + sum(self.failures.values())
+
+    def to_dict(self):
+        fetched = max(self.dates_fetched, 1)
+        return {
+            "backend": self.backend,
+            "dates_total": self.dates_total,
+            "dates_done": self.dates_done,
+            "dates_stored": self.dates_stored,
+            "dates_fetched": self.dates_fetched,
+            "dates_failed": sum(self.failures.values()),
+            "rows": self.rows,
+            "attempts": self.attempts,
+            "rows_per_second": self.rows / self.elapsed if self.elapsed else 0.0,
+            "dates_per_second": self.dates_fetched / self.elapsed if self.elapsed else 0.0,
+            "mean_api_ms": 1000 * self.api_seconds / fetched if self.dates_fetched else 0.0,
+            "failures": dict(self.failures),
+        }
+
+    def __repr__(self):
+        return f"BackendProgress({self.to_dict()})"
+
+
+class FleetReport:
+    """
+    Per-backend progress of a fleet ingestion run.
+
+    Attributes:
+    backends (dict): Backend name -> BackendProgress.
+    elapsed (float): Wall-clock seconds of the run.
+    """
+
+    def __init__(self, backend_names=()):
+        self.backends = {name: BackendProgress(name) for name in backend_names}
+        self.elapsed = 0.0
+
+    @property
+    def rows(self):
+        return sum(p.rows for p in self.backends.values())
+
+    def to_frame(self):
+        """
+        One row per backend with the counters of `BackendProgress.to_dict`.
+
+        Returns:
+        pd.DataFrame: Progress table.
+        """
+        return pd.DataFrame([p.to_dict() for p in self.backends.values()])
+
+    def to_dict(self):
+        return {
+            "elapsed": self.elapsed,
+            "rows": self.rows,
+            "rows_per_second": self.rows / self.elapsed if self.elapsed else 0.0,
+            "backends": {name: p.to_dict() for name, p in self.backends.items()},
+        }
+
+    def __repr__(self):
+        return f"FleetReport({self.to_dict()})"
+
+
+def fleet_keys(backend_names, start_date, end_date, step_days=1, store=None, report=None):
+    """
+    (backend, day) pairs to download, dates outermost so backends advance together.
+
+    Parameters:
+    backend_names (list[str]): Backends to ingest.
+    start_date (str): Start date in 'YYYY-MM-DD' format.
+    end_date (str): End date in 'YYYY-MM-DD' format, inclusive.
+    step_days (int): Interval in days between snapshots.
+    store (CalibrationStore): Dates already stored are skipped.
+    report (FleetReport): Report whose totals are filled in.
+
+    Returns:
+    list[tuple]: (backend name, datetime) pairs not in the store yet.
+    """
+    days = date_range(start_date, end_date, step_days)
+    date_strs = [d.strftime("%Y-%m-%d") for d in days]
+    missing = {}
+    for name in backend_names:
+        todo = set(store.missing(name, date_strs)) if store is not None else set(date_strs)
+        missing[name] = todo
+        if report is not None:
+            report.backends[name].dates_total = len(date_strs)
+            report.backends[name].dates_stored = len(date_strs) - len(todo)
+    return [(name, day) for day, date_str in zip(days, date_strs)
+            for name in backend_names if date_str in missing[name]]
+
+
+def ingest_fleet(token, backend_names, start_date, end_date, store, step_days=1, max_workers=8,
+                 requests_per_second=2.0, burst=1, max_retries=3, provider=None, report=None,
+                 progress=None, progress_interval=5.0, cache=None):
+    """
+    Download the calibration history of several backends into one store.
+
+    Parameters:
+    token (str): IBM Quantum API token.
+    backend_names (list[str]): Backends to ingest.
+    start_date (str): Start date in 'YYYY-MM-DD' format.
+    end_date (str): End date in 'YYYY-MM-DD' format, inclusive.
+    store (CalibrationStore): Destination store; stored days are not fetched again.
+    step_days (int): Interval in days between snapshots.
+    max_workers (int): Concurrent requests, shared by all backends.
+    requests_per_second (float): Global rate limit for the fleet, or None for no limit.
+    burst (int): Maximum burst size allowed by the rate limiter.
+    max_retries (int): Retries per (backend, date) after the first failed request.
+    provider (IBMProvider): Optional provider to use instead of the pooled one
+        for `token` (e.g. a `fake_provider.FakeProvider` for offline runs).
+    report (FleetReport): Optional report to fill in (a new one is used if None).
+    progress (callable): Optional `f(report)` called every `progress_interval`
+        seconds and once at the end.
+    progress_interval (float): Seconds between `progress` calls.
+    cache (PropertiesCache): Optional on-disk cache of raw API responses
+        (see `connections.PropertiesCache`).
+
+    Returns:
+    FleetReport: Per-backend counts, throughput and failures.
+    """
+    backend_names = list(dict.fromkeys(backend_names))
+    report = report if report is not None else FleetReport(backend_names)
+    for name in backend_names:
+        report.backends.setdefault(name, BackendProgress(name))
+    keys = fleet_keys(backend_names, start_date, end_date, step_days, store, report)
+    started = time.perf_counter()
+
+    if keys:
+        # One backend object per name for the whole run, shared by all workers
+        backends = {name: get_backend(name, token=token, provider=provider) for name in {name for name, _ in keys}}
+
+        def fetch(key):
+            name, day = key
+            call_started = time.perf_counter()
+            if cache is not None:
+                properties = cache.properties(backends[name], day)
+            else:
+                properties = backends[name].properties(datetime=day)
+            return properties, time.perf_counter() - call_started
+
+        def handle(outcome):
+            name, day = outcome.key
+            backend = report.backends[name]
+            backend.attempts += outcome.attempts
+            error = outcome.error
+            if error is None:
+                properties, seconds = outcome.value
+                date_str = day.strftime("%Y-%m-%d")
+                try:
+                    frame = arrays_to_frame([properties_to_arrays(properties, name, date_str)])
+                except Exception as exc:
+                    # Missing (None) or malformed snapshot: recorded like a failed request
+                    error = exc
+            if error is not None:
+                backend.failures[type(error).__name__] += 1
+            else:
+                store.write(name, date_str, frame)
+                backend.dates_fetched += 1
+                backend.rows += len(frame)
+                backend.api_seconds += seconds
+            backend.elapsed = time.perf_counter() - started
+
+        last_progress = started
+        for outcome in iter_fetch(fetch, keys, max_workers=max_workers, requests_per_second=requests_per_second,
+                                  burst=burst, max_retries=max_retries, ordered=False):
+            handle(outcome)
+            if progress is not None and time.perf_counter() - last_progress >= progress_interval:
+                report.elapsed = time.perf_counter() - started
+                progress(report)
+                last_progress = time.perf_counter()
+
+    report.elapsed = time.perf_counter() - started
+    if progress is not None:
+        progress(report)
+    return report
+
+
+def print_progress(report, stream=sys.stdout):
+    """Print one line per backend: dates done, rows and throughput."""
+    for p in report.backends.values():
+        d = p.to_dict()
+        print(f"{p.backend:>20}  {d['dates_done']:>5}/{d['dates_total']:<5} "
+              f"fetched={d['dates_fetched']:<5} failed={d['dates_failed']:<4} rows={d['rows']:<9} "
+              f"{d['rows_per_second']:>9.0f} rows/s  api={d['mean_api_ms']:.0f} ms", file=stream)
+    print(f"{'fleet':>20}  {report.rows} rows in {report.elapsed:.1f} s", file=stream, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", required=True, help="CalibrationStore directory")
+    parser.add_argument("--backends", nargs="+", required=True)
+    parser.add_argument("--start", required=True, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Last date (YYYY-MM-DD), inclusive")
+    parser.add_argument("--step-days", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=2.0, help="Global requests per second (0 = no limit)")
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--token-env", default="IBM_TOKEN", help="Environment variable holding the API token")
+    parser.add_argument("--cache", help="PropertiesCache directory for raw API responses")
+    parser.add_argument("--fake", action="store_true", help="Use fake_provider.FakeProvider (offline)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-call latency of the fake provider")
+    args = parser.parse_args()
+
+    from store import CalibrationStore
+
+    provider = None
+    if args.fake:
+        from fake_provider import FakeProvider
+
+        provider = FakeProvider(latency=args.latency)
+    token = os.environ.get(args.token_env)
+    if provider is None and not token:
+        parser.error(f"set {args.token_env} or use --fake")
+
+    report = ingest_fleet(token, args.backends, args.start, args.end, CalibrationStore(args.store),
+                          step_days=args.step_days, max_workers=args.workers,
+                          requests_per_second=args.rps or None, burst=args.burst,
+                          max_retries=args.retries, provider=provider, progress=print_progress,
+                          cache=PropertiesCache(args.cache) if args.cache else None)
+    with pd.option_context("display.width", 200):
+        print()
+        print(report.to_frame().drop(columns="failures").to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
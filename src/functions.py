@@ -1,197 +1,304 @@
 import pandas as pd
-from qiskit_ibm_provider import IBMProvider
 from datetime import datetime, timedelta
-import time
 
-def load_csv(file_path):
+from connections import get_backend, get_provider
+from dedup import dedupe_frame
+from extraction import arrays_to_frame, properties_to_arrays
+from fetcher import iter_fetch
+from harvest import JOB_COLUMNS, iter_job_rows
+from instrumentation import count
+from profiling import profile_frame
+from schema import enforce_schema, read_csv_typed
+
+def load_csv(file_path, schema=None):
     """
     Load a CSV file into a pandas DataFrame.
 
     Parameters:
     file_path (str): Path to the CSV file.
+    schema (dict): Optional column name -> dtype mapping enforced while
+        loading (e.g. `schema.CALIBRATION_SCHEMA` for calibration histories).
 
     Returns:
     pd.DataFrame: Loaded DataFrame.
     """
+    if schema is not None:
+        return read_csv_typed(file_path, schema)
     df = pd.read_csv(file_path)
     return df
 
-def load_api_data(token, backend_name, limit=500):
+def iter_api_batches(token, backend_name, limit=500, batch_size=1000, max_in_flight=16,
+                     requests_per_second=None, max_retries=2, provider=None, report=None):
+    """
+    Stream job metadata for a backend as fixed-size DataFrame batches.
+
+    Rows are produced as job results arrive (see `harvest.iter_job_rows`), so
+    only one batch is held in memory at a time.
+
+    Parameters:
+    token (str): IBM Quantum API token.
+    backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
+    limit (int): Maximum number of jobs to retrieve.
+    batch_size (int): Number of rows per batch (the last one may be shorter).
+    max_in_flight (int): Maximum number of concurrent result requests.
+    requests_per_second (float): Rate limit for result requests, or None.
+    max_retries (int): Retries per job after the first failed request.
+    provider (IBMProvider): Optional provider to use instead of the pooled one
+        for `token` (e.g. a `fake_provider.FakeProvider` for offline runs).
+    report (HarvestReport): Optional report filled with counts and failures.
+
+    Yields:
+    pd.DataFrame: Batches of job metadata with `harvest.JOB_COLUMNS`.
+    """
+    if provider is None:
+        provider = get_provider(token)
+    jobs = provider.jobs(limit=limit, backend_name=backend_name)
+
+    rows = []
+    for row in iter_job_rows(jobs, max_in_flight=max_in_flight, requests_per_second=requests_per_second,
+                             max_retries=max_retries, report=report):
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield pd.DataFrame(rows, columns=JOB_COLUMNS)
+            rows = []
+    if rows:
+        yield pd.DataFrame(rows, columns=JOB_COLUMNS)
+
+def load_api_data(token, backend_name, limit=500, max_in_flight=16, requests_per_second=None,
+                  max_retries=2, provider=None, report=None):
     """
     Connect to IBM Quantum API and retrieve job metadata for a given backend.
 
+    Job results are retrieved concurrently (see `harvest.iter_job_rows`).
+    Jobs or experiments that cannot be read are counted by reason in
+    `report` instead of being dropped silently.
+
     Parameters:
     token (str): IBM Quantum API token.
     backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
     limit (int): Maximum number of jobs to retrieve.
+    max_in_flight (int): Maximum number of concurrent result requests.
+    requests_per_second (float): Rate limit for result requests, or None.
+    max_retries (int): Retries per job after the first failed request.
+    provider (IBMProvider): Optional provider to use instead of the pooled one
+        for `token` (e.g. a `fake_provider.FakeProvider` for offline runs).
+    report (HarvestReport): Optional report filled with counts and failures.
 
     Returns:
     pd.DataFrame: DataFrame containing job metadata.
     """
-    provider = IBMProvider(token=token)
-    backend = provider.get_backend(backend_name)
-    jobs = backend.jobs(limit=limit, retrieve=True)
-
-    records = []
-    for job in jobs:
-        try:
-            job_id = job.job_id()
-            creation_date = job.creation_date()
-            backend_name = job.backend().name
-            result = job.result()
-
-            for exp in result.results:
-                try:
-                    qubit_count = exp.header.get("n_qubits", None)
-                    duration = exp.header.get("duration", None)
-                    shots = exp.shots
-                    success = exp.status.name if hasattr(exp, 'status') else None
-
-                    records.append({
-                        "job_id": job_id,
-                        "creation_date": creation_date,
-                        "backend": backend_name,
-                        "qubit_count": qubit_count,
-                        "duration": duration,
-                        "shots": shots,
-                        "success": success
-                    })
-                except Exception:
-                    continue
-        except Exception:
-            continue
-
-    df = pd.DataFrame(records)
+    batches = list(iter_api_batches(token, backend_name, limit=limit, max_in_flight=max_in_flight,
+                                    requests_per_second=requests_per_second, max_retries=max_retries,
+                                    provider=provider, report=report))
+    if not batches:
+        return pd.DataFrame(columns=JOB_COLUMNS)
+    df = pd.concat(batches, ignore_index=True)
     return df
 
-def load_calibration_history(token, backend_name, start_date, end_date, step_days=1):
+def date_range(start_date, end_date, step_days=1):
     """
-    Retrieve calibration data (T1, T2, frequencies, errors) for a backend over time.
+    List the dates between two 'YYYY-MM-DD' strings, both inclusive.
 
     Parameters:
-    token (str): IBM Quantum API token.
-    backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
     start_date (str): Start date in 'YYYY-MM-DD' format.
     end_date (str): End date in 'YYYY-MM-DD' format.
-    step_days (int): Interval in days between requests.
+    step_days (int): Interval in days between dates.
 
     Returns:
-    pd.DataFrame: DataFrame with calibration parameters for each qubit and date.
+    list[datetime]: Dates from start to end.
     """
-    provider = IBMProvider(token=token)
-    backend = provider.get_backend(backend_name)
-
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
     delta = timedelta(days=step_days)
 
-    records = []
+    dates = []
     current = start
     while current <= end:
-        try:
-            properties = backend.properties(datetime=current)
-            date_str = current.strftime("%Y-%m-%d")
-            num_qubits = len(properties.qubits)
-
-            # Initialize one record per qubit with calibration fields
-            for i, qubit_props in enumerate(properties.qubits):
-                record = {
-                    "date": date_str,
-                    "qubit": i,
-                    "T1 (us)": qubit_props[1].value if len(qubit_props) > 1 else None,
-                    "T2 (us)": qubit_props[2].value if len(qubit_props) > 2 else None,
-                    "Frequency (GHz)": qubit_props[0].value if len(qubit_props) > 0 else None,
-                    "Anharmonicity (GHz)": qubit_props[3].value if len(qubit_props) > 3 else None,
-                    "Readout assignment error": qubit_props[4].value if len(qubit_props) > 4 else None,
-                    "Prob meas0 prep1": qubit_props[5].value if len(qubit_props) > 5 else None,
-                    "Prob meas1 prep0": qubit_props[6].value if len(qubit_props) > 6 else None,
-                    "Readout length (ns)": qubit_props[7].value if len(qubit_props) > 7 else None,
-                    "ID error": None,
-                    "Z-axis rotation (rz) error": None,
-                    "√x (sx) error": None,
-                    "Pauli-X error": None,
-                    "ECR error": None,
-                    "Gate time (ns)": None,
-                    "Operational": None
-                }
-                records.append(record)
-
-            # Extract gate errors and lengths
-            for gate in properties.gates:
-                for param in gate.parameters:
-                    if param.name == "gate_error":
-                        for q in gate.qubits:
-                            idx = (date_str, q)
-                            records[q]["ID error"] = param.value if "id" in gate.name else records[q]["ID error"]
-                            records[q]["Z-axis rotation (rz) error"] = param.value if "rz" in gate.name else records[q]["Z-axis rotation (rz) error"]
-                            records[q]["√x (sx) error"] = param.value if "sx" in gate.name else records[q]["√x (sx) error"]
-                            records[q]["Pauli-X error"] = param.value if "x" == gate.name else records[q]["Pauli-X error"]
-                            records[q]["ECR error"] = param.value if "ecr" in gate.name else records[q]["ECR error"]
-                    if param.name == "gate_length":
-                        for q in gate.qubits:
-                            records[q]["Gate time (ns)"] = param.value
-
-            # Extract readout error and operational status
-            for i, ro in enumerate(properties.readout_error):
-                records[i]["Readout assignment error"] = ro.value
-            for i, op in enumerate(properties.qubits):
-                records[i]["Operational"] = 1  # Qubit exists => operational
-
-        except Exception:
-            pass
-
+        dates.append(current)
         current += delta
-        time.sleep(1)
+    return dates
+
+def iter_calibration_batches(token, backend_name, start_date, end_date, step_days=1,
+                             batch_size=50_000, max_workers=4, requests_per_second=2.0,
+                             max_retries=3, provider=None, store=None, cache=None):
+    """
+    Stream calibration data for a backend as typed DataFrame batches, in date order.
+
+    Each batch holds whole daily snapshots and at most `batch_size` rows
+    (a single snapshot larger than `batch_size` forms its own batch), so
+    batches can be handed straight to `CalibrationStore.write_frame` or to
+    feature code while memory stays bounded by one batch.
 
-    df = pd.DataFrame(records)
+    When a `store` is given, stored days are read back from disk and only
+    the missing ones are downloaded; each downloaded snapshot is persisted
+    as soon as it arrives, so an interrupted pull resumes where it stopped.
+
+    Parameters:
+    token (str): IBM Quantum API token.
+    backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
+    start_date (str): Start date in 'YYYY-MM-DD' format.
+    end_date (str): End date in 'YYYY-MM-DD' format.
+    step_days (int): Interval in days between requests.
+    batch_size (int): Maximum number of rows per batch.
+    max_workers (int): Number of concurrent requests (1 = sequential).
+    requests_per_second (float): Rate limit for the API, or None for no limit.
+    max_retries (int): Retries per date after the first failed request.
+    provider (IBMProvider): Optional provider to use instead of the pooled one
+        for `token` (e.g. a `fake_provider.FakeProvider` for offline runs).
+    store (CalibrationStore): Optional on-disk store used as a local cache.
+    cache (PropertiesCache): Optional on-disk cache of raw API responses
+        (see `connections.PropertiesCache`), used for the dates not in `store`.
+
+    Yields:
+    pd.DataFrame: Batches with the columns of `extraction.CALIBRATION_COLUMNS`.
+    """
+    dates = date_range(start_date, end_date, step_days)
+    date_strs = [d.strftime("%Y-%m-%d") for d in dates]
+
+    missing = set(date_strs)
+    if store is not None:
+        missing = set(store.missing(backend_name, date_strs))
+
+    fetched = iter(())
+    to_fetch = [d for d, date_str in zip(dates, date_strs) if date_str in missing]
+    if to_fetch:
+        backend = get_backend(backend_name, token=token, provider=provider)
+
+        def fetch(day):
+            if cache is not None:
+                return cache.properties(backend, day)
+            return backend.properties(datetime=day)
+
+        fetched = iter_fetch(fetch, to_fetch, max_workers=max_workers,
+                             requests_per_second=requests_per_second, max_retries=max_retries)
+
+    buffer = []
+    buffered_rows = 0
+    for date_str in date_strs:
+        if date_str in missing:
+            result = next(fetched)  # iter_fetch yields one result per date, in order
+            error = result.error
+            if error is None:
+                try:
+                    arrays = properties_to_arrays(result.value, backend_name, date_str)
+                except Exception as exc:
+                    # Missing (None) or malformed snapshot: skipped like a failed request
+                    error = exc
+            if error is not None:
+                # Date still failing after all retries, or without a usable snapshot
+                count("ingest.dates_failed", backend=backend_name, error=type(error).__name__)
+                continue
+            if store is not None:
+                store.write(backend_name, date_str, arrays_to_frame([arrays]))
+        else:
+            stored = store.read_partition(backend_name, date_str)
+            arrays = {col: stored[col].to_numpy() for col in stored.columns}
+            count("ingest.dates_from_store", backend=backend_name)
+
+        rows = len(arrays["qubit"])
+        count("ingest.rows", rows, backend=backend_name)
+        if buffer and buffered_rows + rows > batch_size:
+            yield arrays_to_frame(buffer)
+            buffer = []
+            buffered_rows = 0
+        buffer.append(arrays)
+        buffered_rows += rows
+
+    if buffer:
+        yield arrays_to_frame(buffer)
+
+def load_calibration_history(token, backend_name, start_date, end_date, step_days=1,
+                             max_workers=4, requests_per_second=2.0, max_retries=3,
+                             provider=None, store=None, cache=None):
+    """
+    Retrieve calibration data (T1, T2, frequencies, errors) for a backend over time.
+
+    Snapshots are requested concurrently by a bounded worker pool under a
+    token-bucket rate limit; failed requests are retried with exponential
+    backoff and jitter. Records are returned in date order. For long ranges,
+    `iter_calibration_batches` yields the same data in bounded-size batches.
+
+    When a `store` is given, only the dates it does not hold yet are
+    downloaded, and every snapshot is persisted as soon as it arrives, so an
+    interrupted pull resumes where it stopped.
+
+    Parameters:
+    token (str): IBM Quantum API token.
+    backend_name (str): Name of the backend (e.g., 'ibm_sherbrooke').
+    start_date (str): Start date in 'YYYY-MM-DD' format.
+    end_date (str): End date in 'YYYY-MM-DD' format.
+    step_days (int): Interval in days between requests.
+    max_workers (int): Number of concurrent requests (1 = sequential).
+    requests_per_second (float): Rate limit for the API, or None for no limit.
+    max_retries (int): Retries per date after the first failed request.
+    provider (IBMProvider): Optional provider to use instead of the pooled one
+        for `token` (e.g. a `fake_provider.FakeProvider` for offline runs).
+    store (CalibrationStore): Optional on-disk store used as a local cache.
+    cache (PropertiesCache): Optional on-disk cache of raw API responses
+        (see `connections.PropertiesCache`).
+
+    Returns:
+    pd.DataFrame: DataFrame with calibration parameters for each qubit and date.
+    """
+    batches = list(iter_calibration_batches(token, backend_name, start_date, end_date, step_days,
+                                            max_workers=max_workers, requests_per_second=requests_per_second,
+                                            max_retries=max_retries, provider=provider, store=store, cache=cache))
+    if not batches:
+        return arrays_to_frame([])
+    # Batches may carry different category sets: cast the union back to the schema
+    df = enforce_schema(pd.concat(batches, ignore_index=True))
     return df
 
-def data_overview(df):
+def data_overview(df, sample=None, show=True):
     """
     Display a general overview of a DataFrame.
 
     Parameters:
     df (pd.DataFrame): DataFrame to inspect.
+    sample (int or float): Optional number (int) or fraction (float) of rows
+        to profile instead of the whole frame.
+    show (bool): Whether to print the overview.
 
     This function prints:
     - First 5 rows (head)
-    - Shape (rows, columns)
-    - Column names
-    - Data types
-    - Missing values per column
+    - Shape (rows, columns) and memory usage
     - Number of duplicated rows
-    - DataFrame info (non-null counts)
-    """
-    print("DataFrame Head")
-    print(df.head(), "\n")
-
-    print("Shape")
-    print(df.shape, "\n")
+    - Per column: data type, missing values, cardinality, min/max and quantiles
 
-    print("Columns")
-    print(df.columns.tolist(), "\n")
-
-    print("Data Types")
-    print(df.dtypes, "\n")
-
-    print("Missing Values")
-    print(df.isnull().sum(), "\n")
-
-    print("Duplicated Rows")
-    print(df.duplicated().sum(), "\n")
+    Returns:
+    ProfileReport: Structured report (see `profiling.profile_frame`), which
+    can be cached, merged with the reports of other chunks or rendered in the
+    Streamlit app.
+    """
+    report = profile_frame(df, sample=sample)
+    if show:
+        print("DataFrame Head")
+        print(df.head(), "\n")
 
-    print("DataFrame Info")
-    print(df.info(), "\n")
+        print(report.render(), "\n")
+    return report
 
-def remove_duplicates(df):
+def remove_duplicates(df, subset=None, keep="first", order_by=None, return_count=False):
     """
     Remove duplicated rows from a DataFrame.
 
+    Rows are compared through 64-bit hashes of the whole row or of the key
+    columns in `subset` (e.g. `schema.CALIBRATION_KEY`). For data that does
+    not fit in memory, see `dedup.iter_dedupe`.
+
     Parameters:
     df (pd.DataFrame): DataFrame to process.
+    subset (list[str]): Key columns identifying a row, or None for all columns.
+    keep (str): Which duplicate survives: 'first', 'last' or 'latest'
+        (largest value of `order_by`).
+    order_by (str): Column used by keep='latest'.
+    return_count (bool): Also return the number of removed rows.
 
     Returns:
-    pd.DataFrame: DataFrame without duplicate rows.
+    pd.DataFrame: New DataFrame without duplicate rows and with a fresh
+    RangeIndex, and the number of removed rows if `return_count` is True.
     """
-    df_clean = df.drop_duplicates().reset_index(drop=True)
+    df_clean, removed = dedupe_frame(df, subset=subset, keep=keep, order_by=order_by)
+    if return_count:
+        return df_clean, removed
     return df_clean
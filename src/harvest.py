@@ -0,0 +1,172 @@
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from fetcher import TokenBucket, call_with_retries
+from instrumentation import count
+
+# Job-result harvesting for load_api_data.
+#
+# Job metadata (id, creation date, backend, status) comes from the job list
+# itself; results are only requested for finished jobs, concurrently and with
+# a bounded number of requests in flight. Rows are yielded as soon as their
+# job result arrives, and every job or experiment that cannot be turned into
+# rows is counted in a HarvestReport under a short reason instead of being
+# dropped silently.
+
+JOB_COLUMNS = ["job_id", "creation_date", "backend", "qubit_count", "duration", "shots", "success"]
+
+FINAL_OK_STATUS = "DONE"
+
+
+class HarvestReport:
+    """
+    Counters describing one harvesting run.
+
+    Attributes:
+    jobs_listed (int): Jobs returned by the job listing.
+    jobs_harvested (int): Jobs whose result was retrieved and parsed.
+    rows (int): Rows (experiments) produced.
+    failures (Counter): Number of jobs/experiments lost, by reason.
+    elapsed (float): Wall-clock seconds of the run.
+    """
+
+    def __init__(self):
+        self.jobs_listed = 0
+        self.jobs_harvested = 0
+        self.rows = 0
+        self.failures = Counter()
+        self.elapsed = 0.0
+
+    def to_dict(self):
+        return {
+            "jobs_listed": self.jobs_listed,
+            "jobs_harvested": self.jobs_harvested,
+            "rows": self.rows,
+            "failures": dict(self.failures),
+            "elapsed": self.elapsed,
+        }
+
+    def __repr__(self):
+        return f"HarvestReport({self.to_dict()})"
+
+
+def _fail(report, reason):
+    report.failures[reason] += 1
+    count("harvest.failures", reason=reason.split(":")[0])
+
+
+def _status_name(status):
+    return getattr(status, "name", status)
+
+
+def job_metadata(job):
+    """
+    Read the metadata of a job without retrieving its result.
+
+    Parameters:
+    job (IBMJob): Job returned by the provider.
+
+    Returns:
+    dict: job_id, creation_date, backend and status of the job.
+    """
+    backend = job.backend()
+    return {
+        "job_id": job.job_id(),
+        "creation_date": job.creation_date(),
+        "backend": getattr(backend, "name", backend),
+        "status": _status_name(job.status()),
+    }
+
+
+def experiment_rows(meta, result, report):
+    """
+    Turn the experiments of a job result into rows.
+
+    Parameters:
+    meta (dict): Output of `job_metadata` for the job.
+    result (Result): Result of the job.
+    report (HarvestReport): Report where malformed experiments are counted.
+
+    Returns:
+    list[dict]: One row per experiment, with `JOB_COLUMNS` keys.
+    """
+    rows = []
+    for exp in result.results:
+        try:
+            header = exp.header
+            rows.append({
+                "job_id": meta["job_id"],
+                "creation_date": meta["creation_date"],
+                "backend": meta["backend"],
+                "qubit_count": getattr(header, "n_qubits", None),
+                "duration": getattr(header, "duration", None),
+                "shots": exp.shots,
+                "success": _status_name(getattr(exp, "status", None)),
+            })
+        except Exception as exc:
+            _fail(report, f"experiment:{type(exc).__name__}")
+    return rows
+
+
+def iter_job_rows(jobs, max_in_flight=16, requests_per_second=None, max_retries=2, report=None):
+    """
+    Retrieve job results concurrently and yield their rows as they arrive.
+
+    Parameters:
+    jobs (iterable): Jobs returned by the provider.
+    max_in_flight (int): Maximum number of result requests running at once.
+    requests_per_second (float): Rate limit for result requests, or None.
+    max_retries (int): Retries per job after the first failed request.
+    report (HarvestReport): Report to fill in (a new one is used if None).
+
+    Yields:
+    dict: One row per experiment, with `JOB_COLUMNS` keys, in completion order.
+    """
+    report = report if report is not None else HarvestReport()
+    limiter = TokenBucket(requests_per_second, max_in_flight) if requests_per_second else None
+    max_in_flight = max(1, int(max_in_flight))
+    started = time.perf_counter()
+
+    def fetch_result(job):
+        return job.result()
+
+    def handle(future, meta):
+        outcome = future.result()
+        if outcome.error is not None:
+            _fail(report, f"result:{type(outcome.error).__name__}")
+            return []
+        report.jobs_harvested += 1
+        rows = experiment_rows(meta, outcome.value, report)
+        report.rows += len(rows)
+        count("harvest.rows", len(rows))
+        return rows
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for job in jobs:
+            report.jobs_listed += 1
+            try:
+                meta = job_metadata(job)
+            except Exception as exc:
+                _fail(report, f"metadata:{type(exc).__name__}")
+                continue
+            if meta["status"] != FINAL_OK_STATUS:
+                # Calling result() on an unfinished job would block until it ends
+                _fail(report, f"status:{meta['status']}")
+                continue
+
+            future = executor.submit(call_with_retries, fetch_result, job, limiter, max_retries,
+                                     span_name="fetch.job_result")
+            in_flight[future] = meta
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from handle(future, in_flight.pop(future))
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from handle(future, in_flight.pop(future))
+
+    report.elapsed = time.perf_counter() - started
@@ -0,0 +1,376 @@
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+from functools import wraps
+
+# Lightweight instrumentation: spans, counters and histograms.
+#
+# Disabled by default. Every entry point checks one module-level flag first,
+# so instrumented code costs a function call and a branch when it is off.
+# When enabled (`enable()`, or the QUBIT_METRICS_LOG environment variable):
+#   - every span is appended to a JSON-lines log as it ends, with its parent
+#     span, so a slow run can be broken down afterwards;
+#   - span durations go into `<name>_seconds` histograms, and counters and
+#     histograms are kept in memory, exported as Prometheus text by
+#     `prometheus_text()` / `serve_metrics()`, and written to the log as a
+#     final "metrics" line when the process exits.
+#
+#   with span("train", rows=len(df)):
+#       ...
+#   @timed("features.transform")
+#   def transform(self, df): ...
+#   count("fetch.failures", error="TimeoutError")
+
+ENV_LOG = "QUBIT_METRICS_LOG"
+
+# Histogram bucket upper bounds (seconds for spans)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0)
+
+_ENABLED = False
+_LOCK = threading.Lock()
+_COUNTERS = {}  # (name, labels) -> float
+_HISTOGRAMS = {}  # (name, labels) -> Histogram
+_LOG = None
+_LOCAL = threading.local()
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with sum, min and max (buckets are exported cumulatively by `prometheus_text`).
+
+    Parameters:
+    buckets (tuple[float]): Increasing bucket upper bounds (+Inf is implicit).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class _NoopSpan:
+    """Span returned while instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **labels):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    Timed block: its duration goes to the `<name>_seconds` histogram and the log.
+
+    Parameters:
+    name (str): Span name (e.g. 'fetch', 'features.transform').
+    **labels: Values attached to the log record (e.g. backend, rows).
+    """
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.parent = None
+        self.started = None
+
+    def set(self, **labels):
+        """Attach values known only inside the block (e.g. rows produced)."""
+        self.labels.update(labels)
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, "stack", None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        _LOCAL.stack.pop()
+        observe(f"{self.name}_seconds", seconds)
+        if exc_type is not None:
+            count(f"{self.name}.errors", error=exc_type.__name__)
+        _write({
+            "type": "span",
+            "name": self.name,
+            "parent": self.parent,
+            "ts": time.time() - seconds,
+            "seconds": seconds,
+            "error": exc_type.__name__ if exc_type is not None else None,
+            **({"labels": self.labels} if self.labels else {}),
+        })
+        return False
+
+
+def enable(log_path=None):
+    """
+    Turn instrumentation on.
+
+    Parameters:
+    log_path (str): JSON-lines file appended with spans and a final metrics
+        snapshot (None: keep the metrics in memory only).
+    """
+    global _ENABLED, _LOG
+    with _LOCK:
+        if log_path is not None and _LOG is None:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            _LOG = open(log_path, "a", buffering=1)
+            atexit.register(flush)
+        _ENABLED = True
+
+
+def disable():
+    """Turn instrumentation off and close the log (metrics gathered so far are kept)."""
+    global _ENABLED, _LOG
+    flush()
+    with _LOCK:
+        _ENABLED = False
+        if _LOG is not None:
+            _LOG.close()
+            _LOG = None
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def reset():
+    """Forget every counter and histogram."""
+    with _LOCK:
+        _COUNTERS.clear()
+        _HISTOGRAMS.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _write(record):
+    if _LOG is None:
+        return
+    line = json.dumps(record, default=str)
+    with _LOCK:
+        if _LOG is not None:
+            _LOG.write(line + "\n")
+
+
+def span(name, **labels):
+    """
+    Context manager timing a block (a shared no-op object when disabled).
+
+    Parameters:
+    name (str): Span name.
+    **labels: Values attached to the log record.
+
+    Returns:
+    Span: Context manager; `set(**labels)` adds values from inside the block.
+    """
+    if not _ENABLED:
+        return _NOOP_SPAN
+    return Span(name, **labels)
+
+
+def timed(name=None):
+    """
+    Decorator running the function inside a span.
+
+    Parameters:
+    name (str): Span name (default: the function's qualified name).
+
+    Returns:
+    callable: Decorator.
+    """
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            with Span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name, value=1, **labels):
+    """
+    Add `value` to a counter.
+
+    Parameters:
+    name (str): Counter name (e.g. 'ingest.rows').
+    value (float): Increment.
+    **labels: Label values distinguishing series (e.g. backend, error).
+    """
+    if not _ENABLED:
+        return
+    key = _key(name, labels)
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+
+def observe(name, value, buckets=None, **labels):
+    """
+    Record a value in a histogram.
+
+    Parameters:
+    name (str): Histogram name (e.g. 'api.latency_seconds').
+    value (float): Observed value.
+    buckets (tuple[float]): Bucket bounds, used when the histogram is created.
+    **labels: Label values distinguishing series.
+    """
+    if not _ENABLED:
+        return
+    key = _key(name, labels)
+    with _LOCK:
+        histogram = _HISTOGRAMS.get(key)
+        if histogram is None:
+            histogram = _HISTOGRAMS[key] = Histogram(buckets or DEFAULT_BUCKETS)
+        histogram.observe(value)
+
+
+def _series_name(name, labels):
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+def snapshot():
+    """
+    Current counters and histograms.
+
+    Returns:
+    dict: {'counters': {series: value}, 'histograms': {series: summary}}, where a
+    series is 'name' or 'name{label=value,...}'.
+    """
+    with _LOCK:
+        return {
+            "counters": {_series_name(n, l): v for (n, l), v in sorted(_COUNTERS.items())},
+            "histograms": {_series_name(n, l): h.to_dict() for (n, l), h in sorted(_HISTOGRAMS.items())},
+        }
+
+
+def flush():
+    """Append the current metrics snapshot to the log, if there is one."""
+    if _LOG is not None:
+        _write({"type": "metrics", "ts": time.time(), **snapshot()})
+
+
+def _prom_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _prom_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{_prom_name(k)}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def prometheus_text():
+    """
+    Counters and histograms in the Prometheus text exposition format.
+
+    Returns:
+    str: Exposition text (counters get a `_total` suffix).
+    """
+    with _LOCK:
+        counters = sorted(_COUNTERS.items())
+        histograms = sorted((key, h.to_dict(), h.buckets, list(h.counts)) for key, h in _HISTOGRAMS.items())
+
+    lines = []
+    typed = set()
+    for (name, labels), value in counters:
+        metric = _prom_name(name) + "_total"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_prom_labels(labels)} {value}")
+    for (name, labels), summary, buckets, counts in histograms:
+        metric = _prom_name(name)
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} histogram")
+            typed.add(metric)
+        cumulative = 0
+        for bound, n in zip([*map(str, buckets), "+Inf"], counts):
+            cumulative += n
+            lines.append(f"{metric}_bucket{_prom_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{metric}_sum{_prom_labels(labels)} {summary['sum']}")
+        lines.append(f"{metric}_count{_prom_labels(labels)} {summary['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(host="127.0.0.1", port=9100):
+    """
+    Expose `prometheus_text()` on http://host:port/metrics from a daemon thread.
+
+    Parameters:
+    host (str): Interface to bind.
+    port (int): Port to bind.
+
+    Returns:
+    ThreadingHTTPServer: The running server (call `shutdown()` to stop it).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            data = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if os.environ.get(ENV_LOG):
+    enable(os.environ[ENV_LOG])
@@ -0,0 +1,150 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import INPUT_COLUMNS, TARGET, CalibrationFeatures
+from instrumentation import count, span, timed
+
+# Readout assignment error model: the notebook's final stacking of XGBoost and
+# RandomForest, bundled with its fitted feature pipeline so that it can be
+# persisted once and loaded by the prediction service.
+
+# Best parameters found by the notebook's RandomizedSearchCV
+BEST_XGB_PARAMS = {
+    "n_estimators": 400,
+    "max_depth": 5,
+    "learning_rate": 0.03,
+    "subsample": 0.7,
+    "colsample_bytree": 0.7,
+    "gamma": 0,
+    "reg_alpha": 0.01,
+    "reg_lambda": 1,
+}
+
+RF_PARAMS = {"n_estimators": 300, "max_depth": 10}
+
+PIPELINE_FILE = "features.json"
+ESTIMATOR_FILE = "estimator.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def build_stacking_model(xgb_params=None, rf_params=None, random_state=42, n_jobs=-1):
+    """
+    Build the (unfitted) XGBoost + RandomForest stacking regressor of the notebook.
+
+    Parameters:
+    xgb_params (dict): XGBRegressor parameters (default: `BEST_XGB_PARAMS`).
+    rf_params (dict): RandomForestRegressor parameters (default: `RF_PARAMS`).
+    random_state (int): Seed of both base models.
+    n_jobs (int): Parallel jobs of the stacking cross-validation.
+
+    Returns:
+    StackingRegressor: Unfitted model.
+    """
+    from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+    from sklearn.linear_model import LinearRegression
+    from xgboost import XGBRegressor
+
+    xgb = XGBRegressor(**(xgb_params or BEST_XGB_PARAMS), random_state=random_state, verbosity=0)
+    rf = RandomForestRegressor(**(rf_params or RF_PARAMS), random_state=random_state)
+    return StackingRegressor(
+        estimators=[("xgb", xgb), ("rf", rf)],
+        final_estimator=LinearRegression(),
+        cv=3,
+        n_jobs=n_jobs,
+        passthrough=False,
+    )
+
+
+class ReadoutErrorModel:
+    """
+    Feature pipeline + fitted estimator predicting the readout assignment error.
+
+    Parameters:
+    pipeline (CalibrationFeatures): Feature pipeline (fitted by `fit`).
+    estimator: Regressor with fit/predict (default: `build_stacking_model()`).
+    """
+
+    def __init__(self, pipeline=None, estimator=None):
+        self.pipeline = pipeline if pipeline is not None else CalibrationFeatures()
+        self.estimator = estimator if estimator is not None else build_stacking_model()
+        self.metadata = {}
+
+    def fit(self, df):
+        """
+        Fit the feature pipeline and the estimator on calibration records.
+
+        Parameters:
+        df (pd.DataFrame): Records with `features.INPUT_COLUMNS` and the target.
+
+        Returns:
+        ReadoutErrorModel: The fitted model.
+        """
+        df = df.dropna(subset=INPUT_COLUMNS + [TARGET])
+        started = time.perf_counter()
+        with span("train", rows=len(df)):
+            X = self.pipeline.fit(df).transform(df)
+            self.estimator.fit(X, df[TARGET].to_numpy())
+        self.metadata = {
+            "trained_at": pd.Timestamp.now().isoformat(),
+            "train_rows": int(len(df)),
+            "train_seconds": time.perf_counter() - started,
+            "backends": sorted(str(b) for b in df["backend"].unique()) if "backend" in df else [],
+            "date_range": [str(pd.to_datetime(df["date"]).min().date()),
+                           str(pd.to_datetime(df["date"]).max().date())],
+            "n_features": len(self.pipeline.feature_names_),
+        }
+        return self
+
+    @timed("predict")
+    def predict(self, df):
+        """
+        Predict the readout assignment error of calibration records.
+
+        Parameters:
+        df (pd.DataFrame): Records with `features.INPUT_COLUMNS`.
+
+        Returns:
+        np.ndarray: Predicted readout assignment error per row.
+        """
+        count("predict.rows", len(df))
+        return np.asarray(self.estimator.predict(self.pipeline.transform(df)), dtype=np.float64)
+
+    def save(self, directory):
+        """
+        Persist the model in a directory (feature state as JSON, estimator with joblib).
+
+        Parameters:
+        directory (str): Target directory (created if missing).
+        """
+        import joblib
+
+        os.makedirs(directory, exist_ok=True)
+        self.pipeline.save(os.path.join(directory, PIPELINE_FILE))
+        joblib.dump(self.estimator, os.path.join(directory, ESTIMATOR_FILE))
+        with open(os.path.join(directory, METADATA_FILE), "w") as f:
+            json.dump(self.metadata, f, indent=2)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Load a model saved with `save`.
+
+        Parameters:
+        directory (str): Directory written by `save`.
+
+        Returns:
+        ReadoutErrorModel: The loaded model.
+        """
+        import joblib
+
+        pipeline = CalibrationFeatures.load(os.path.join(directory, PIPELINE_FILE))
+        model = cls(pipeline, joblib.load(os.path.join(directory, ESTIMATOR_FILE)))
+        metadata_path = os.path.join(directory, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                model.metadata = json.load(f)
+        return model
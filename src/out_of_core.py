@@ -0,0 +1,220 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from features import INPUT_COLUMNS, TARGET, CalibrationFeatures
+from instrumentation import timed
+from model import BEST_XGB_PARAMS
+
+# Out-of-core training on the calibration store.
+#
+# The feature matrix is never materialised: an XGBoost DataIter reads the
+# store in batches of whole partitions, runs them through an already fitted
+# feature pipeline and hands each batch to XGBoost, which only keeps its
+# quantised (binned) copy of the data:
+#   - "quantile": QuantileDMatrix, the binned data lives in memory
+#                 (about 1 byte per feature value instead of 4 or 8),
+#   - "external": ExtMemQuantileDMatrix, the binned pages are cached on disk
+#                 and streamed at every boosting round, so peak memory is
+#                 bounded by the batch size rather than by the history.
+# The feature pipeline itself is fitted on a sample of partitions (every
+# backend's first day plus days spread evenly over the history).
+
+TRAIN_COLUMNS = INPUT_COLUMNS + [TARGET]
+
+
+class StoreBatchIter(xgb.DataIter):
+    """
+    XGBoost DataIter streaming feature batches from the store.
+
+    Parameters:
+    store (CalibrationStore): Source store.
+    pipeline (CalibrationFeatures): Fitted feature pipeline.
+    backend_name (str): Backend to read, or None for all backends.
+    start_date (str): First date ('YYYY-MM-DD'), inclusive.
+    end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+    batch_size (int): Maximum rows per batch.
+    cache_prefix (str): Path prefix of the on-disk pages ("external" mode only).
+    """
+
+    def __init__(self, store, pipeline, backend_name=None, start_date=None, end_date=None,
+                 batch_size=200_000, cache_prefix=None):
+        self.store = store
+        self.pipeline = pipeline
+        self.backend_name = backend_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.batch_size = batch_size
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix, release_data=True)
+
+    def next(self, input_data):
+        if self._batches is None:
+            self._batches = self.store.iter_batches(self.backend_name, self.start_date, self.end_date,
+                                                    columns=TRAIN_COLUMNS, batch_size=self.batch_size)
+        for batch in self._batches:
+            batch = batch.dropna(subset=TRAIN_COLUMNS)
+            if batch.empty:
+                continue
+            input_data(data=self.pipeline.transform(batch), label=batch[TARGET].to_numpy(np.float32))
+            return True
+        return False
+
+    def reset(self):
+        self._batches = None
+
+
+def fit_pipeline_sample(store, backend_name=None, start_date=None, end_date=None, max_partitions=200,
+                        **pipeline_kwargs):
+    """
+    Fit the feature pipeline on a sample of stored partitions.
+
+    Parameters:
+    store (CalibrationStore): Source store.
+    backend_name (str): Backend to read, or None for all backends.
+    start_date (str): First date ('YYYY-MM-DD'), inclusive.
+    end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+    max_partitions (int): Partitions spread evenly over the history (the first
+        partition of every backend is always included).
+    **pipeline_kwargs: Parameters of CalibrationFeatures.
+
+    Returns:
+    CalibrationFeatures: The fitted pipeline.
+    """
+    paths = store.partition_paths(backend_name, start_date, end_date)
+    if not paths:
+        raise ValueError("No stored partitions match the requested backend and dates")
+    chosen = set(np.linspace(0, len(paths) - 1, min(max_partitions, len(paths))).round().astype(int).tolist())
+    backends = [backend_name] if backend_name is not None else store.backends()
+    for backend in backends:
+        first = store.partition_paths(backend, start_date, end_date)[:1]
+        if first:
+            chosen.add(paths.index(first[0]))
+    sample = pd.concat([pd.read_parquet(paths[i], columns=TRAIN_COLUMNS) for i in sorted(chosen)],
+                       ignore_index=True)
+    return CalibrationFeatures(**pipeline_kwargs).fit(sample.dropna(subset=TRAIN_COLUMNS))
+
+
+def build_dmatrix(store, pipeline, backend_name=None, start_date=None, end_date=None, mode="external",
+                  batch_size=200_000, max_bin=256, cache_dir=None, ref=None):
+    """
+    Build an XGBoost matrix from the store without materialising the features.
+
+    Parameters:
+    store (CalibrationStore): Source store.
+    pipeline (CalibrationFeatures): Fitted feature pipeline (dense encodings only).
+    backend_name (str): Backend to read, or None for all backends.
+    start_date (str): First date ('YYYY-MM-DD'), inclusive.
+    end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+    mode (str): 'quantile' (binned data in memory) or 'external' (binned pages on disk).
+    batch_size (int): Maximum rows per batch.
+    max_bin (int): Histogram bins per feature.
+    cache_dir (str): Directory of the external-memory pages (default: a temporary directory).
+    ref (xgboost.DMatrix): Training matrix whose bins are reused (for validation data).
+
+    Returns:
+    xgboost.DMatrix: QuantileDMatrix or ExtMemQuantileDMatrix.
+    """
+    if mode == "quantile":
+        it = StoreBatchIter(store, pipeline, backend_name, start_date, end_date, batch_size)
+        return xgb.QuantileDMatrix(it, max_bin=max_bin, ref=ref)
+    if mode == "external":
+        cache_dir = cache_dir or tempfile.mkdtemp(prefix="xgb-extmem-")
+        it = StoreBatchIter(store, pipeline, backend_name, start_date, end_date, batch_size,
+                            cache_prefix=os.path.join(cache_dir, "cache"))
+        return xgb.ExtMemQuantileDMatrix(it, max_bin=max_bin, ref=ref)
+    raise ValueError(f"Unknown mode '{mode}' (expected 'quantile' or 'external')")
+
+
+@timed("train.out_of_core")
+def train_out_of_core(store, backend_name=None, start_date=None, end_date=None, mode="external",
+                      params=None, num_boost_round=None, batch_size=200_000, max_bin=256, cache_dir=None,
+                      pipeline=None, n_jobs=-1):
+    """
+    Train an XGBoost model on the stored history with bounded memory.
+
+    Parameters:
+    store (CalibrationStore): Source store.
+    backend_name (str): Backend to train on, or None for all backends.
+    start_date (str): First date ('YYYY-MM-DD'), inclusive.
+    end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+    mode (str): 'quantile' or 'external' (see `build_dmatrix`).
+    params (dict): XGBRegressor-style parameters (default: `model.BEST_XGB_PARAMS`).
+    num_boost_round (int): Boosting rounds (default: params['n_estimators']).
+    batch_size (int): Maximum rows per batch.
+    max_bin (int): Histogram bins per feature.
+    cache_dir (str): Parent directory of the external-memory pages (removed after
+        training; default: the system temporary directory).
+    pipeline (CalibrationFeatures): Fitted pipeline (default: `fit_pipeline_sample`).
+    n_jobs (int): Training threads.
+
+    Returns:
+    tuple: (xgboost.Booster, CalibrationFeatures, dict of timings and row count).
+    """
+    params = dict(params or BEST_XGB_PARAMS)
+    rounds = num_boost_round or params.pop("n_estimators", 400)
+    params.pop("n_estimators", None)
+    params.update(tree_method="hist", max_bin=max_bin, nthread=n_jobs, verbosity=0)
+
+    started = time.perf_counter()
+    if pipeline is None:
+        pipeline = fit_pipeline_sample(store, backend_name, start_date, end_date)
+    with tempfile.TemporaryDirectory(prefix="xgb-extmem-", dir=cache_dir) as pages_dir:
+        # The on-disk pages are only needed while training
+        dtrain = build_dmatrix(store, pipeline, backend_name, start_date, end_date, mode, batch_size,
+                               max_bin, pages_dir)
+        built = time.perf_counter()
+        booster = xgb.train(params, dtrain, num_boost_round=rounds)
+        finished = time.perf_counter()
+        rows = int(dtrain.num_row())
+
+    stats = {
+        "rows": rows,
+        "build_seconds": built - started,
+        "train_seconds": finished - built,
+        "rows_per_second": rows * rounds / (finished - built),
+    }
+    return booster, pipeline, stats
+
+
+@timed("predict.streaming")
+def evaluate_streaming(booster, pipeline, store, backend_name=None, start_date=None, end_date=None,
+                       batch_size=200_000):
+    """
+    MAE and R² of a booster over stored data, computed batch by batch.
+
+    Parameters:
+    booster (xgboost.Booster): Trained model.
+    pipeline (CalibrationFeatures): Its feature pipeline.
+    store (CalibrationStore): Source store.
+    backend_name (str): Backend to score, or None for all backends.
+    start_date (str): First date ('YYYY-MM-DD'), inclusive.
+    end_date (str): Last date ('YYYY-MM-DD'), inclusive.
+    batch_size (int): Maximum rows per batch.
+
+    Returns:
+    dict: rows, mae and r2.
+    """
+    n = 0
+    abs_err = sq_err = y_sum = y_sq_sum = 0.0
+    for batch in store.iter_batches(backend_name, start_date, end_date, columns=TRAIN_COLUMNS,
+                                    batch_size=batch_size):
+        batch = batch.dropna(subset=TRAIN_COLUMNS)
+        if batch.empty:
+            continue
+        y = batch[TARGET].to_numpy(np.float64)
+        err = booster.predict(xgb.DMatrix(pipeline.transform(batch))) - y
+        n += len(y)
+        abs_err += np.abs(err).sum()
+        sq_err += np.square(err).sum()
+        y_sum += y.sum()
+        y_sq_sum += np.square(y).sum()
+
+    if not n:
+        return {"rows": 0, "mae": float("nan"), "r2": float("nan")}
+    total = y_sq_sum - y_sum ** 2 / n
+    return {"rows": n, "mae": abs_err / n, "r2": 1 - sq_err / total if total > 0 else float("nan")}
@@ -0,0 +1,304 @@
+import numpy as np
+import pandas as pd
+
+# Profiling engine behind data_overview.
+#
+# A frame (or each chunk of a larger one) is profiled in one call into a
+# ProfileReport holding mergeable sketches:
+#   - null and row counts,
+#   - min / max,
+#   - a uniform sample per numeric column, used for approximate quantiles,
+#   - a KMV (k minimum values) sketch of value hashes for cardinality,
+#   - the number of distinct rows and a KMV sketch of the 64-bit row hashes,
+#     used for the duplicate count.
+# Reports of several chunks are combined with `merge`, so a history that does
+# not fit in memory can be profiled chunk by chunk in bounded memory.
+# Duplicates within a chunk are counted exactly; across chunks they are exact
+# while the table has at most `sketch_size` distinct rows and estimated from
+# the overlap of the row sketches beyond that.
+
+DEFAULT_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+_HASH_SPACE = float(2 ** 64)
+
+
+def _kmv_sketch(series, k):
+    hashes = pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy()
+    return np.unique(hashes)[:k]
+
+
+def _merge_samples(a, n_a, b, n_b, size, rng):
+    """Combine two uniform samples into one, proportionally to the rows they represent."""
+    if n_a + n_b == 0:
+        return a[:0]
+    take_a = min(len(a), int(round(size * n_a / (n_a + n_b))))
+    take_b = min(len(b), size - take_a)
+    parts = [rng.choice(a, take_a, replace=False) if take_a < len(a) else a,
+             rng.choice(b, take_b, replace=False) if take_b < len(b) else b]
+    return np.concatenate(parts)
+
+
+class ColumnProfile:
+    """
+    Mergeable statistics of one column.
+
+    Attributes:
+    dtype (str): Data type of the column.
+    count (int): Rows seen.
+    nulls (int): Missing values seen.
+    min, max: Smallest and largest non-null values (None if not orderable).
+    sample (np.ndarray): Uniform sample of the non-null numeric values.
+    kmv (np.ndarray): Smallest distinct value hashes (cardinality sketch).
+    """
+
+    def __init__(self, dtype, count=0, nulls=0, min=None, max=None, sample=None, kmv=None):
+        self.dtype = dtype
+        self.count = count
+        self.nulls = nulls
+        self.min = min
+        self.max = max
+        self.sample = sample
+        self.kmv = kmv if kmv is not None else np.empty(0, dtype=np.uint64)
+
+    @classmethod
+    def from_series(cls, series, sketch_size, rng):
+        profile = cls(str(series.dtype), count=len(series), nulls=int(series.isna().sum()))
+        profile.kmv = _kmv_sketch(series, sketch_size)
+
+        if pd.api.types.is_bool_dtype(series.dtype):
+            return profile
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if len(values):
+                profile.min = float(values.min())
+                profile.max = float(values.max())
+                if len(values) > sketch_size:
+                    values = rng.choice(values, sketch_size, replace=False)
+                profile.sample = values
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype) and profile.nulls < len(series):
+            profile.min = series.min()
+            profile.max = series.max()
+        return profile
+
+    def merge(self, other, sketch_size, rng):
+        merged = ColumnProfile(self.dtype, self.count + other.count, self.nulls + other.nulls)
+        mins = [v for v in (self.min, other.min) if v is not None]
+        maxs = [v for v in (self.max, other.max) if v is not None]
+        merged.min = min(mins) if mins else None
+        merged.max = max(maxs) if maxs else None
+        if self.sample is not None and other.sample is not None:
+            merged.sample = _merge_samples(self.sample, self.count - self.nulls, other.sample,
+                                           other.count - other.nulls, sketch_size, rng)
+        else:
+            merged.sample = self.sample if self.sample is not None else other.sample
+        merged.kmv = np.union1d(self.kmv, other.kmv)[:sketch_size]
+        return merged
+
+    def cardinality(self, sketch_size):
+        """Estimated number of distinct non-null values (exact below `sketch_size`)."""
+        if len(self.kmv) < sketch_size:
+            return len(self.kmv)
+        return int(round((sketch_size - 1) * _HASH_SPACE / float(self.kmv[sketch_size - 1])))
+
+    def quantiles(self, qs):
+        if self.sample is None or not len(self.sample):
+            return {q: None for q in qs}
+        return dict(zip(qs, np.quantile(self.sample, qs).tolist()))
+
+
+class ProfileReport:
+    """
+    Structured profile of a DataFrame, mergeable across chunks.
+
+    Use `profile_frame` / `profile_chunks` to build it; `to_frame` gives one
+    row per column, `to_dict` a JSON-serialisable summary (for caching) and
+    `render` the text printed by `data_overview`.
+
+    Attributes:
+    n_rows (int): Rows of the profiled data.
+    sampled_rows (int): Rows actually profiled (lower than n_rows if sampled).
+    memory_bytes (int): Memory usage of the profiled data.
+    columns (dict[str, ColumnProfile]): Per-column statistics.
+    distinct_rows (float): Distinct rows among the profiled ones (exact for a
+        single frame, estimated after merging large chunks).
+    """
+
+    def __init__(self, n_rows, sampled_rows, memory_bytes, columns, row_kmv, distinct_rows,
+                 quantile_levels=DEFAULT_QUANTILES, sketch_size=4096, seed=0):
+        self.n_rows = n_rows
+        self.sampled_rows = sampled_rows
+        self.memory_bytes = memory_bytes
+        self.columns = columns
+        self.quantile_levels = tuple(quantile_levels)
+        self.sketch_size = sketch_size
+        self.seed = seed
+        self.distinct_rows = distinct_rows
+        self._row_kmv = row_kmv
+
+    @property
+    def duplicated_rows(self):
+        """Rows whose full content hash was already seen (as `df.duplicated().sum()`)."""
+        return max(0, self.sampled_rows - int(round(self.distinct_rows)))
+
+    def _merge_rows(self, other):
+        """Row sketch and distinct rows of two disjoint chunks together."""
+        union = np.union1d(self._row_kmv, other._row_kmv)
+        if len(self._row_kmv) == self.distinct_rows and len(other._row_kmv) == other.distinct_rows:
+            # Both sketches still hold every distinct row hash: exact
+            return union[:self.sketch_size], len(union)
+        # Rows of both chunks, from the share of shared hashes among the k smallest of the union
+        union = union[:self.sketch_size]
+        shared = np.isin(union, self._row_kmv) & np.isin(union, other._row_kmv)
+        union_rows = (len(union) - 1) * _HASH_SPACE / float(union[-1])
+        return union, self.distinct_rows + other.distinct_rows - shared.mean() * union_rows
+
+    def merge(self, other):
+        """
+        Combine the reports of two disjoint chunks of the same table.
+
+        Parameters:
+        other (ProfileReport): Report of another chunk.
+
+        Returns:
+        ProfileReport: Report of both chunks together.
+        """
+        rng = np.random.default_rng(self.seed)
+        columns = dict(self.columns)
+        for name, profile in other.columns.items():
+            if name in columns:
+                columns[name] = columns[name].merge(profile, self.sketch_size, rng)
+            else:
+                columns[name] = profile
+        row_kmv, distinct_rows = self._merge_rows(other)
+        return ProfileReport(
+            self.n_rows + other.n_rows,
+            self.sampled_rows + other.sampled_rows,
+            self.memory_bytes + other.memory_bytes,
+            columns,
+            row_kmv,
+            distinct_rows,
+            self.quantile_levels,
+            self.sketch_size,
+            self.seed,
+        )
+
+    def to_frame(self):
+        """
+        Summarise the report with one row per column.
+
+        Returns:
+        pd.DataFrame: dtype, nulls, null %, cardinality, min, max and quantiles.
+        """
+        rows = {}
+        for name, profile in self.columns.items():
+            row = {
+                "dtype": profile.dtype,
+                "nulls": profile.nulls,
+                "null %": 100.0 * profile.nulls / profile.count if profile.count else 0.0,
+                "cardinality": profile.cardinality(self.sketch_size),
+                "min": profile.min,
+                "max": profile.max,
+            }
+            for q, value in profile.quantiles(self.quantile_levels).items():
+                row[f"q{q:g}"] = value
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def to_dict(self):
+        """
+        JSON-serialisable summary of the report (sketches are not included).
+
+        Returns:
+        dict: Table-level counts and per-column statistics.
+        """
+        summary = self.to_frame().astype(object).where(lambda f: f.notna(), None)
+        columns = {
+            name: {key: (str(value) if isinstance(value, pd.Timestamp) else value)
+                   for key, value in row.items()}
+            for name, row in summary.to_dict(orient="index").items()
+        }
+        return {
+            "n_rows": self.n_rows,
+            "sampled_rows": self.sampled_rows,
+            "n_columns": len(self.columns),
+            "memory_bytes": self.memory_bytes,
+            "duplicated_rows": self.duplicated_rows,
+            "columns": columns,
+        }
+
+    def render(self):
+        """
+        Text rendering of the report.
+
+        Returns:
+        str: Shape, memory, duplicates and the per-column summary.
+        """
+        lines = [f"Shape: ({self.n_rows}, {len(self.columns)})"]
+        if self.sampled_rows != self.n_rows:
+            lines.append(f"Profiled on a sample of {self.sampled_rows} rows")
+        lines.append(f"Memory usage: {self.memory_bytes / 1024 ** 2:.2f} MB")
+        lines.append(f"Duplicated rows: {self.duplicated_rows}")
+        lines.append("")
+        with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 200):
+            lines.append(self.to_frame().to_string())
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"ProfileReport(n_rows={self.n_rows}, n_columns={len(self.columns)})"
+
+    def _repr_html_(self):
+        return self.to_frame()._repr_html_()
+
+
+def profile_frame(df, sample=None, quantiles=DEFAULT_QUANTILES, sketch_size=4096, seed=0):
+    """
+    Profile a DataFrame in one call.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame to profile.
+    sample (int or float): Optional number (int) or fraction (float) of rows
+        to profile instead of the whole frame.
+    quantiles (tuple): Quantile levels reported for numeric columns.
+    sketch_size (int): Size of the quantile samples and cardinality sketches.
+    seed (int): Seed for sampling.
+
+    Returns:
+    ProfileReport: Structured report of the frame.
+    """
+    n_rows = len(df)
+    if sample is not None:
+        size = int(sample * n_rows) if isinstance(sample, float) else int(sample)
+        if size < n_rows:
+            df = df.sample(n=size, random_state=seed)
+
+    rng = np.random.default_rng(seed)
+    columns = {name: ColumnProfile.from_series(df[name], sketch_size, rng) for name in df.columns}
+    row_hashes = np.unique(pd.util.hash_pandas_object(df, index=False).to_numpy())
+    memory = int(df.memory_usage(deep=True).sum())
+    if len(df) != n_rows and len(df):
+        memory = int(memory * n_rows / len(df))
+    return ProfileReport(n_rows, len(df), memory, columns, row_hashes[:sketch_size], len(row_hashes),
+                         quantiles, sketch_size, seed)
+
+
+def profile_chunks(chunks, **kwargs):
+    """
+    Profile an iterable of DataFrame chunks and merge the reports.
+
+    Duplicates are counted across chunks, so the result matches profiling
+    the concatenated frame. Memory is bounded by one chunk plus the sketches:
+    quantiles, cardinalities and, beyond `sketch_size` distinct rows, the
+    cross-chunk duplicate count are approximate.
+
+    Parameters:
+    chunks (iterable): DataFrames with the same columns.
+    **kwargs: Options forwarded to `profile_frame`.
+
+    Returns:
+    ProfileReport: Report of all chunks, or None if there were no chunks.
+    """
+    report = None
+    for chunk in chunks:
+        chunk_report = profile_frame(chunk, **kwargs)
+        report = chunk_report if report is None else report.merge(chunk_report)
+    return report
@@ -0,0 +1,350 @@
+import json
+import operator
+from collections import Counter, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from schema import QUBIT_FIELDS
+
+# Data-quality checks of calibration records.
+#
+# Outlier bounds (Q1 - k * IQR, Q3 + k * IQR) are computed for all columns in
+# one vectorized quantile pass, optionally per group (qubit, backend, ...),
+# and stored in a `QualityBounds` object that can be saved and reused: new
+# partitions are checked against the stored bounds without touching the
+# history again.
+#
+# Cleaning steps are declared as a list of `Rule`s and applied together: every
+# rule contributes a boolean column to one mask, the rows are filtered once
+# and the report counts how many rows each rule rejected.
+
+DEFAULT_BOUND_COLUMNS = list(QUBIT_FIELDS.values())
+
+Rule = namedtuple("Rule", ["name", "column", "op", "value"], defaults=[None])
+Rule.__doc__ = """
+Declarative row check; a row is kept when every rule passes.
+
+Fields:
+name (str): Name of the rule in the report.
+column (str or list[str]): Column(s) checked (every listed column must pass).
+op (str): 'notna', 'outlier' (outside the stored bounds fails), 'between'
+    (value=(low, high), inclusive), 'isin' (value=collection) or a comparison
+    ('==', '!=', '<', '<=', '>', '>=') against `value`.
+value: Operand of the comparison.
+"""
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Cleaning of the notebook: rows without readout information are dropped
+DEFAULT_RULES = [
+    Rule("missing_readout", ["Prob meas1 prep0", "Readout length (ns)"], "notna"),
+    Rule("zero_readout_length", "Readout length (ns)", "!=", 0),
+    Rule("missing_target", "Readout assignment error", "notna"),
+    Rule("non_positive_coherence", ["T1 (us)", "T2 (us)"], ">", 0),
+]
+
+
+class QualityBounds:
+    """
+    IQR outlier bounds of several columns, global or per group.
+
+    Parameters:
+    columns (list[str]): Columns with bounds.
+    by (list[str]): Grouping columns, or None for global bounds.
+    groups (pd.Index): Group keys (one row of bounds per group; None if global).
+    q1, q3 (np.ndarray): First and third quartiles, shape (groups, columns).
+    counts (np.ndarray): Non-missing values behind every quartile.
+    k (float): IQR multiplier of the bounds.
+    """
+
+    def __init__(self, columns, by, groups, q1, q3, counts, k=1.5):
+        self.columns = list(columns)
+        self.by = list(by) if by is not None else None
+        self.groups = groups
+        self.q1 = np.asarray(q1, dtype=np.float64)
+        self.q3 = np.asarray(q3, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.k = k
+
+    @property
+    def lower(self):
+        return self.q1 - self.k * (self.q3 - self.q1)
+
+    @property
+    def upper(self):
+        return self.q3 + self.k * (self.q3 - self.q1)
+
+    def to_frame(self):
+        """Bounds as a DataFrame indexed by group, with (column, stat) columns."""
+        stats = {"q1": self.q1, "q3": self.q3, "lower": self.lower, "upper": self.upper, "count": self.counts}
+        frame = pd.concat({name: pd.DataFrame(values, columns=self.columns) for name, values in stats.items()},
+                          axis=1).swaplevel(axis=1)
+        frame.index = self.groups if self.groups is not None else pd.Index(["all"])
+        return frame[self.columns]
+
+    def _row_groups(self, df):
+        """Position of every row's group in `groups` (-1 for groups without bounds)."""
+        if self.by is None:
+            return np.zeros(len(df), dtype=np.intp)
+        keys = pd.MultiIndex.from_frame(df[self.by]) if len(self.by) > 1 else pd.Index(df[self.by[0]])
+        return self.groups.get_indexer(keys)
+
+    def outlier_mask(self, df, columns=None):
+        """
+        Flag the values outside the bounds.
+
+        Parameters:
+        df (pd.DataFrame): Records with the bounded columns (and the grouping columns).
+        columns (list[str]): Subset of the bounded columns (default: all of them).
+
+        Returns:
+        pd.DataFrame: Boolean frame, True where a value is an outlier (missing
+        values and rows of unknown groups are never outliers).
+        """
+        columns = self.columns if columns is None else list(columns)
+        j = [self.columns.index(c) for c in columns]
+        rows = self._row_groups(df)
+        # An extra row of NaN bounds for unknown groups: comparisons with NaN are False
+        lower = np.vstack([self.lower[:, j], np.full(len(j), np.nan)])[rows]
+        upper = np.vstack([self.upper[:, j], np.full(len(j), np.nan)])[rows]
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.DataFrame((values < lower) | (values > upper), columns=columns, index=df.index)
+
+    def outlier_counts(self, df):
+        """Number of outliers per column (the notebook's IQR report)."""
+        return self.outlier_mask(df).sum()
+
+    def merge(self, other):
+        """
+        Combine with bounds computed on other data (e.g. new partitions).
+
+        Quartiles are averaged weighted by their counts, an approximation of
+        the quartiles of the union that does not need the older data.
+
+        Parameters:
+        other (QualityBounds): Bounds with the same columns and grouping.
+
+        Returns:
+        QualityBounds: Merged bounds (groups of both sides).
+        """
+        if other.columns != self.columns or other.by != self.by:
+            raise ValueError("Bounds must have the same columns and grouping to be merged")
+        if self.by is None:
+            groups = None
+            left, right = [0], [0]
+        else:
+            groups = self.groups.union(other.groups)
+            left, right = groups.get_indexer(self.groups), groups.get_indexer(other.groups)
+        shape = (len(groups) if groups is not None else 1, len(self.columns))
+        sums = {name: np.zeros(shape) for name in ("q1", "q3")}
+        counts = np.zeros(shape, dtype=np.int64)
+        for bounds, positions in ((self, left), (other, right)):
+            weights = bounds.counts
+            for name in sums:
+                sums[name][positions] += np.nan_to_num(getattr(bounds, name)) * weights
+            counts[positions] += weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            q1 = np.where(counts > 0, sums["q1"] / counts, np.nan)
+            q3 = np.where(counts > 0, sums["q3"] / counts, np.nan)
+        return QualityBounds(self.columns, self.by, groups, q1, q3, counts, self.k)
+
+    def state_dict(self):
+        """JSON-serializable state."""
+        return {
+            "columns": self.columns,
+            "by": self.by,
+            "groups": None if self.groups is None else [list(g) if isinstance(g, tuple) else g
+                                                         for g in self.groups.tolist()],
+            "q1": np.where(np.isnan(self.q1), None, self.q1).tolist(),
+            "q3": np.where(np.isnan(self.q3), None, self.q3).tolist(),
+            "counts": self.counts.tolist(),
+            "k": self.k,
+        }
+
+    @classmethod
+    def from_state_dict(cls, state):
+        groups = state["groups"]
+        if groups is not None:
+            if len(state["by"]) > 1:
+                groups = pd.MultiIndex.from_tuples([tuple(g) for g in groups], names=state["by"])
+            else:
+                groups = pd.Index(groups, name=state["by"][0])
+        q1 = np.array(state["q1"], dtype=np.float64)
+        q3 = np.array(state["q3"], dtype=np.float64)
+        return cls(state["columns"], state["by"], groups, q1, q3, state["counts"], state["k"])
+
+    def save(self, path):
+        """Save the bounds as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.state_dict(), f, default=_json_default)
+
+    @classmethod
+    def load(cls, path):
+        """Load bounds saved with `save`."""
+        with open(path) as f:
+            return cls.from_state_dict(json.load(f))
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def compute_bounds(df, columns=None, by=None, quantiles=(0.25, 0.75), k=1.5):
+    """
+    Compute IQR outlier bounds of several columns in one quantile pass.
+
+    Parameters:
+    df (pd.DataFrame): Calibration records.
+    columns (list[str]): Columns to bound (default: the qubit-level fields present in `df`).
+    by (str or list[str]): Grouping column(s), e.g. 'qubit' or ['backend', 'qubit'];
+        None for global bounds.
+    quantiles (tuple): Lower and upper quartiles.
+    k (float): IQR multiplier (1.5 as in the notebook).
+
+    Returns:
+    QualityBounds: The bounds.
+    """
+    if columns is None:
+        columns = [c for c in DEFAULT_BOUND_COLUMNS if c in df.columns]
+    columns = list(columns)
+    if by is None:
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if len(values):
+            q1, q3 = np.nanquantile(values, quantiles, axis=0)
+        else:
+            q1 = q3 = np.full(len(columns), np.nan)
+        counts = (~np.isnan(values)).sum(axis=0)
+        return QualityBounds(columns, None, None, q1[None, :], q3[None, :], counts[None, :], k)
+
+    by = [by] if isinstance(by, str) else list(by)
+    grouped = df.groupby(by, observed=True, sort=True)[columns]
+    quartiles = grouped.quantile(list(quantiles))  # index: (*by, quantile)
+    q1 = quartiles.xs(quantiles[0], level=-1)
+    q3 = quartiles.xs(quantiles[1], level=-1).reindex(q1.index)
+    counts = grouped.count().reindex(q1.index)
+    return QualityBounds(columns, by, q1.index, q1.to_numpy(np.float64), q3.to_numpy(np.float64),
+                         counts.to_numpy(np.int64), k)
+
+
+class QualityReport:
+    """
+    Counters of a data-quality run.
+
+    Attributes:
+    rows_in (int): Rows checked.
+    rows_out (int): Rows that passed every rule.
+    failures (Counter): Rule name -> rows rejected by that rule (a row may fail several rules).
+    """
+
+    def __init__(self):
+        self.rows_in = 0
+        self.rows_out = 0
+        self.failures = Counter()
+
+    @property
+    def removed(self):
+        """Number of rows dropped."""
+        return self.rows_in - self.rows_out
+
+    def to_dict(self):
+        return {"rows_in": self.rows_in, "rows_out": self.rows_out, "removed": self.removed,
+                "failures": dict(self.failures)}
+
+    def __repr__(self):
+        return f"QualityReport(rows_in={self.rows_in}, rows_out={self.rows_out}, failures={dict(self.failures)})"
+
+
+def rule_masks(df, rules=DEFAULT_RULES, bounds=None):
+    """
+    Evaluate rules on a DataFrame.
+
+    Parameters:
+    df (pd.DataFrame): Records to check.
+    rules (list[Rule]): Rules to evaluate.
+    bounds (QualityBounds): Bounds for the 'outlier' rules.
+
+    Returns:
+    np.ndarray: Boolean matrix (rows, rules), True where a row passes a rule.
+    """
+    passed = np.ones((len(df), len(rules)), dtype=bool)
+    outliers = None
+    for i, rule in enumerate(rules):
+        columns = [rule.column] if isinstance(rule.column, str) else list(rule.column)
+        if rule.op == "outlier":
+            if bounds is None:
+                raise ValueError(f"Rule '{rule.name}' needs outlier bounds")
+            if outliers is None:
+                outliers = bounds.outlier_mask(df)
+            passed[:, i] = ~outliers[columns].to_numpy().any(axis=1)
+            continue
+        for column in columns:
+            values = df[column]
+            if rule.op == "notna":
+                ok = values.notna().to_numpy()
+            elif rule.op == "between":
+                low, high = rule.value
+                ok = values.between(low, high).to_numpy(dtype=bool, na_value=False)
+            elif rule.op == "isin":
+                ok = values.isin(rule.value).to_numpy()
+            elif rule.op in _COMPARISONS:
+                # Missing values do not fail comparisons: that is what 'notna' rules are for
+                ok = _COMPARISONS[rule.op](values, rule.value).to_numpy(dtype=bool, na_value=True)
+            else:
+                raise ValueError(f"Unknown operator '{rule.op}' in rule '{rule.name}'")
+            passed[:, i] &= ok
+    return passed
+
+
+def apply_rules(df, rules=DEFAULT_RULES, bounds=None, report=None):
+    """
+    Filter a DataFrame with a list of rules in a single pass.
+
+    Parameters:
+    df (pd.DataFrame): Records to clean.
+    rules (list[Rule]): Rules every kept row must pass.
+    bounds (QualityBounds): Bounds for the 'outlier' rules.
+    report (QualityReport): Optional report updated with the counts.
+
+    Returns:
+    tuple: (pd.DataFrame of the rows that pass, QualityReport).
+    """
+    report = report if report is not None else QualityReport()
+    passed = rule_masks(df, rules, bounds)
+    keep = passed.all(axis=1)
+    report.rows_in += len(df)
+    report.rows_out += int(keep.sum())
+    for rule, fails in zip(rules, (~passed).sum(axis=0)):
+        if fails:
+            report.failures[rule.name] += int(fails)
+    return (df if keep.all() else df[keep]), report
+
+
+def iter_clean(chunks, rules=DEFAULT_RULES, bounds=None, report=None):
+    """
+    Clean a stream of chunks (e.g. new store partitions) against fixed bounds.
+
+    Parameters:
+    chunks (iterable): DataFrame chunks, e.g. `store.iter_batches(dates=new_dates)`.
+    rules (list[Rule]): Rules every kept row must pass.
+    bounds (QualityBounds): Stored bounds for the 'outlier' rules.
+    report (QualityReport): Optional report updated with the counts.
+
+    Yields:
+    pd.DataFrame: Cleaned chunks.
+    """
+    report = report if report is not None else QualityReport()
+    for chunk in chunks:
+        clean, _ = apply_rules(chunk, rules, bounds, report)
+        yield clean
@@ -0,0 +1,111 @@
+import pandas as pd
+
+# Declared schema of the calibration table.
+#
+# Physics values are stored as float32 (7 significant digits is well above
+# the precision of any calibration value), the backend name as a categorical,
+# the date as datetime64, the qubit index as int16 and flags as nullable
+# booleans. Compared with the float64/object columns produced by a plain
+# read_csv, this takes roughly a third of the memory.
+
+# Qubit-level Nduv name -> output column
+QUBIT_FIELDS = {
+    "T1": "T1 (us)",
+    "T2": "T2 (us)",
+    "frequency": "Frequency (GHz)",
+    "anharmonicity": "Anharmonicity (GHz)",
+    "readout_error": "Readout assignment error",
+    "prob_meas0_prep1": "Prob meas0 prep1",
+    "prob_meas1_prep0": "Prob meas1 prep0",
+    "readout_length": "Readout length (ns)",
+}
+
+# Gate type (GateProperties.gate) -> output column for its gate_error
+GATE_ERROR_FIELDS = {
+    "id": "ID error",
+    "rz": "Z-axis rotation (rz) error",
+    "sx": "√x (sx) error",
+    "x": "Pauli-X error",
+    "ecr": "ECR error",
+}
+
+GATE_TIME_COLUMN = "Gate time (ns)"
+OPERATIONAL_COLUMN = "Operational"
+
+CALIBRATION_COLUMNS = (
+    ["backend", "date", "qubit"]
+    + list(QUBIT_FIELDS.values())
+    + list(GATE_ERROR_FIELDS.values())
+    + [GATE_TIME_COLUMN, OPERATIONAL_COLUMN]
+)
+
+# Natural key of a calibration record
+CALIBRATION_KEY = ["backend", "date", "qubit"]
+
+FLOAT_DTYPE = "float32"
+
+CALIBRATION_SCHEMA = {
+    "backend": "category",
+    "date": "datetime64[ns]",
+    "qubit": "int16",
+    **{col: FLOAT_DTYPE for col in QUBIT_FIELDS.values()},
+    **{col: FLOAT_DTYPE for col in GATE_ERROR_FIELDS.values()},
+    GATE_TIME_COLUMN: FLOAT_DTYPE,
+    OPERATIONAL_COLUMN: "boolean",
+}
+
+
+def enforce_schema(df, schema=CALIBRATION_SCHEMA):
+    """
+    Cast the columns of a DataFrame to the dtypes declared in a schema.
+
+    Columns missing from the frame are ignored and columns not in the schema
+    are left untouched. Columns that already have the right dtype are not
+    copied.
+
+    Parameters:
+    df (pd.DataFrame): DataFrame to cast.
+    schema (dict): Column name -> dtype.
+
+    Returns:
+    pd.DataFrame: DataFrame with the declared dtypes.
+    """
+    casts = {}
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype.startswith("datetime64"):
+            casts[col] = pd.to_datetime(df[col])
+        elif dtype.startswith("int") and df[col].isna().any():
+            # Missing values cannot be held by a NumPy int: use the nullable type
+            casts[col] = df[col].astype(dtype.capitalize())
+        else:
+            casts[col] = df[col].astype(dtype)
+    if not casts:
+        return df
+    return df.assign(**casts)
+
+
+def read_csv_typed(file_path, schema=CALIBRATION_SCHEMA, **kwargs):
+    """
+    Read a CSV file enforcing a schema while parsing.
+
+    Float and categorical columns are parsed straight into their target
+    dtypes (no intermediate float64/object copy); the remaining columns are
+    cast afterwards by `enforce_schema`.
+
+    Parameters:
+    file_path (str): Path to the CSV file.
+    schema (dict): Column name -> dtype.
+    **kwargs: Extra options forwarded to `pd.read_csv`.
+
+    Returns:
+    pd.DataFrame: Loaded DataFrame with the declared dtypes.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    parse_dtypes = {
+        col: dtype for col, dtype in schema.items()
+        if col in header and (dtype.startswith("float") or dtype == "category")
+    }
+    df = pd.read_csv(file_path, dtype=parse_dtypes, **kwargs)
+    return enforce_schema(df, schema)
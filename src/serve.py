@@ -0,0 +1,361 @@
+"""
+Prediction service for the readout assignment error model.
+
+The model (feature pipeline + stacked estimator, see `model.py`) is loaded
+once at startup. Concurrent requests are queued and merged into micro-batches
+so that the estimator runs once per batch instead of once per request; the
+latency of every request is recorded and exposed as p50 / p99.
+
+Usage (from the `src` directory):
+    python serve.py train --data ../data/raw/df_sherbrooke.csv --model-dir ../models/readout_error
+    python serve.py score --model-dir ../models/readout_error --input calibrations.csv --output scores.csv
+    python serve.py serve --model-dir ../models/readout_error --port 8000
+
+HTTP endpoints:
+    POST /predict   {"rows": [{"backend": ..., "date": ..., "qubit": ..., "T1 (us)": ..., ...}, ...]}
+                    -> {"predictions": [...], "latency_ms": ...}
+    GET  /stats     latency percentiles and batching counters
+    GET  /health    model metadata
+    GET  /metrics   instrumentation counters and histograms, Prometheus text format
+                    (filled when started with --metrics)
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from features import INPUT_COLUMNS
+from model import ReadoutErrorModel
+
+DEFAULT_MAX_BATCH_ROWS = 16_384
+DEFAULT_MAX_WAIT_MS = 2.0
+LATENCY_WINDOW = 10_000
+
+
+class LatencyRecorder:
+    """
+    Sliding window of request latencies.
+
+    Parameters:
+    window (int): Number of most recent latencies kept.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.count += 1
+
+    def percentiles(self, quantiles=(50, 99)):
+        """
+        Latency percentiles over the window, in milliseconds.
+
+        Parameters:
+        quantiles (tuple): Percentiles to compute.
+
+        Returns:
+        dict: {'p50_ms': ..., 'p99_ms': ...} (None when nothing was recorded).
+        """
+        with self._lock:
+            values = np.fromiter(self._latencies, dtype=np.float64)
+        if not len(values):
+            return {f"p{q}_ms": None for q in quantiles}
+        return {f"p{q}_ms": float(v) * 1000 for q, v in zip(quantiles, np.percentile(values, quantiles))}
+
+
+class MicroBatcher:
+    """
+    Merge concurrent prediction requests into batches run by a single worker thread.
+
+    The worker takes the first queued request, then keeps collecting requests
+    until `max_batch_rows` rows are gathered or `max_wait_ms` has passed, runs
+    `predict` once on the concatenated rows and hands every request its slice.
+
+    Parameters:
+    predict (callable): Function DataFrame -> array of predictions.
+    max_batch_rows (int): Maximum rows per batch (a larger request runs alone).
+    max_wait_ms (float): Maximum time a request waits for others to join its batch.
+    latency_window (int): Number of latencies kept for the percentiles.
+    """
+
+    def __init__(self, predict, max_batch_rows=DEFAULT_MAX_BATCH_ROWS, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 latency_window=LATENCY_WINDOW):
+        self.predict_fn = predict
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.latency = LatencyRecorder(latency_window)
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, df):
+        """
+        Queue a DataFrame for prediction.
+
+        Parameters:
+        df (pd.DataFrame): Rows to score.
+
+        Returns:
+        concurrent.futures.Future: Resolves to the array of predictions of `df`.
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((df, future, time.perf_counter()))
+        return future
+
+    def predict(self, df, timeout=None):
+        """Blocking version of `submit`."""
+        return self.submit(df).result(timeout)
+
+    def close(self):
+        """Stop the worker once the queued requests are served."""
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        """Latency percentiles and batching counters."""
+        return {
+            "requests": self.latency.count,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else None,
+            **self.latency.percentiles(),
+        }
+
+    def _collect(self, first):
+        batch = [first]
+        rows = len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Re-queued so that the loop stops after this batch
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            frames = [df for df, _, _ in batch]
+            try:
+                y = self.predict_fn(frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True))
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    continue
+                # One bad request must not fail the others merged with it:
+                # score every request on its own, only the failing ones get the error
+                for item in batch:
+                    try:
+                        self._finish([item], self.predict_fn(item[0]))
+                    except Exception as item_exc:
+                        item[1].set_exception(item_exc)
+                continue
+            self._finish(batch, y)
+
+    def _finish(self, batch, y):
+        self.batches += 1
+        self.rows += len(y)
+        offset = 0
+        for df, future, submitted in batch:
+            future.set_result(y[offset:offset + len(df)])
+            offset += len(df)
+            self.latency.record(time.perf_counter() - submitted)
+
+
+def rows_to_frame(payload):
+    """
+    Build the input DataFrame of a /predict request.
+
+    Numeric inputs are coerced to numbers and dates parsed here, so that a
+    malformed request is rejected (ValueError -> 400) before it joins a
+    micro-batch.
+
+    Parameters:
+    payload (dict or list): {"rows": [...]} (list of records), {"columns": {...}}
+        (column -> list of values) or a bare list of records.
+
+    Returns:
+    pd.DataFrame: Input rows.
+    """
+    if isinstance(payload, dict) and "columns" in payload:
+        df = pd.DataFrame(payload["columns"])
+    else:
+        df = pd.DataFrame.from_records(payload["rows"] if isinstance(payload, dict) else payload)
+    missing = [c for c in INPUT_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    for column in INPUT_COLUMNS:
+        try:
+            if column == "date":
+                df[column] = pd.to_datetime(df[column], errors="raise")
+            else:
+                df[column] = pd.to_numeric(df[column], errors="raise")
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid values in column {column!r}: {exc}") from None
+    return df
+
+
+def make_handler(batcher, metadata):
+    """HTTP request handler class bound to a batcher."""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, batcher.stats())
+            elif self.path == "/health":
+                self._send_json(200, {"status": "ok", "model": metadata})
+            elif self.path == "/metrics":
+                data = instrumentation.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "not found"})
+                return
+            started = time.perf_counter()
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                df = rows_to_frame(json.loads(self.rfile.read(length)))
+            except (ValueError, KeyError, TypeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            try:
+                y = batcher.predict(df)
+            except Exception as exc:
+                self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+                return
+            self._send_json(200, {
+                "predictions": y.tolist(),
+                "latency_ms": (time.perf_counter() - started) * 1000,
+            })
+
+        def log_message(self, format, *args):
+            pass  # One line per request would dominate the cost of small requests
+
+    return PredictionHandler
+
+
+def serve(model, host="127.0.0.1", port=8000, max_batch_rows=DEFAULT_MAX_BATCH_ROWS,
+          max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    """
+    Serve a loaded model over HTTP until interrupted.
+
+    Parameters:
+    model (ReadoutErrorModel): Loaded model.
+    host (str): Interface to bind.
+    port (int): Port to bind.
+    max_batch_rows (int): Maximum rows per micro-batch.
+    max_wait_ms (float): Maximum wait of a request for its micro-batch.
+    """
+    batcher = MicroBatcher(model.predict, max_batch_rows, max_wait_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher, model.metadata))
+    print(f"Serving readout error predictions on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(json.dumps(batcher.stats()))
+
+
+def _read_table(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_cmd = commands.add_parser("train", help="Fit the stacking model and save it")
+    train_cmd.add_argument("--data", required=True, help="Calibration CSV or Parquet with the target column")
+    train_cmd.add_argument("--model-dir", required=True)
+
+    score_cmd = commands.add_parser("score", help="Score a file of calibrations")
+    score_cmd.add_argument("--model-dir", required=True)
+    score_cmd.add_argument("--input", required=True, help="Calibration CSV or Parquet")
+    score_cmd.add_argument("--output", help="CSV with the input and a 'predicted' column (default: stdout)")
+
+    serve_cmd = commands.add_parser("serve", help="Serve predictions over HTTP")
+    serve_cmd.add_argument("--model-dir", required=True)
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8000)
+    serve_cmd.add_argument("--max-batch-rows", type=int, default=DEFAULT_MAX_BATCH_ROWS)
+    serve_cmd.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    serve_cmd.add_argument("--metrics", action="store_true", help="Collect instrumentation for GET /metrics")
+    serve_cmd.add_argument("--metrics-log", help="Also append spans to this JSON-lines file")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        model = ReadoutErrorModel().fit(_read_table(args.data))
+        model.save(args.model_dir)
+        print(json.dumps(model.metadata, indent=2))
+        return
+
+    model = ReadoutErrorModel.load(args.model_dir)
+    if args.command == "serve":
+        if args.metrics or args.metrics_log:
+            instrumentation.enable(args.metrics_log)
+        serve(model, args.host, args.port, args.max_batch_rows, args.max_wait_ms)
+        return
+
+    df = _read_table(args.input)
+    started = time.perf_counter()
+    df["predicted"] = model.predict(df)
+    elapsed = time.perf_counter() - started
+    if args.output:
+        df.to_csv(args.output, index=False)
+    else:
+        print(df.to_csv(index=False), end="")
+    print(f"Scored {len(df)} rows in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import os
+import uuid
+
+import pandas as pd
+
+from dedup import dedupe_frame
+from schema import CALIBRATION_KEY
+
+# On-disk calibration store, one Parquet file per (backend, date) snapshot:
+#
+#   <root>/backend=<name>/date=<YYYY-MM-DD>/part-0.parquet
+#
+# The files themselves are the record of what has been downloaded: a snapshot
+# is written to a temporary file and atomically renamed into place, so a
+# partition either exists complete or not at all. A crashed pull therefore
+# resumes from the first missing day, and a nightly refresh only fetches the
+# days that are not on disk yet.
+
+PART_NAME = "part-0.parquet"
+
+
+class CalibrationStore:
+    """
+    Persistent calibration history partitioned by backend and date.
+
+    Parameters:
+    root (str): Directory holding the store (created if missing).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def partition_dir(self, backend_name, date_str):
+        """Directory of the (backend, date) partition."""
+        return os.path.join(self.root, f"backend={backend_name}", f"date={date_str}")
+
+    def backends(self):
+        """
+        List the backends that have at least one partition.
+
+        Returns:
+        list[str]: Sorted backend names.
+        """
+        names = []
+        for entry in os.listdir(self.root):
+            if entry.startswith("backend="):
+                names.append(entry[len("backend="):])
+        return sorted(names)
+
+    def dates(self, backend_name):
+        """
+        List the snapshot dates already stored for a backend.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+
+        Returns:
+        list[str]: Sorted dates in 'YYYY-MM-DD' format.
+        """
+        backend_dir = os.path.join(self.root, f"backend={backend_name}")
+        if not os.path.isdir(backend_dir):
+            return []
+        dates = []
+        for entry in os.listdir(backend_dir):
+            if entry.startswith("date=") and os.path.exists(os.path.join(backend_dir, entry, PART_NAME)):
+                dates.append(entry[len("date="):])
+        return sorted(dates)
+
+    def has(self, backend_name, date_str):
+        """Return True if the (backend, date) snapshot is stored."""
+        return os.path.exists(os.path.join(self.partition_dir(backend_name, date_str), PART_NAME))
+
+    def missing(self, backend_name, date_strs):
+        """
+        Filter a list of dates down to the ones not stored yet.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+        date_strs (list[str]): Candidate dates in 'YYYY-MM-DD' format.
+
+        Returns:
+        list[str]: Dates without a stored snapshot, in the input order.
+        """
+        stored = set(self.dates(backend_name))
+        return [d for d in date_strs if d not in stored]
+
+    def write(self, backend_name, date_str, df):
+        """
+        Atomically write (or replace) the snapshot of one backend and date.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+        date_str (str): Date of the snapshot in 'YYYY-MM-DD' format.
+        df (pd.DataFrame): Calibration records of that snapshot.
+
+        Returns:
+        str: Path of the written Parquet file.
+        """
+        part_dir = self.partition_dir(backend_name, date_str)
+        os.makedirs(part_dir, exist_ok=True)
+        final_path = os.path.join(part_dir, PART_NAME)
+        tmp_path = os.path.join(part_dir, f".{uuid.uuid4().hex}.tmp")
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return final_path
+
+    def write_frame(self, df):
+        """
+        Write a frame holding whole snapshots, one partition per (backend, date).
+
+        Every (backend, date) group replaces the stored partition, so the frame
+        must contain complete snapshots, as the batches produced by
+        `functions.iter_calibration_batches` do.
+
+        Parameters:
+        df (pd.DataFrame): Calibration records with 'backend' and 'date' columns.
+
+        Returns:
+        list[str]: Paths of the written Parquet files.
+        """
+        paths = []
+        for (backend_name, date), group in df.groupby(["backend", "date"], sort=False, observed=True):
+            date_str = pd.Timestamp(date).strftime("%Y-%m-%d")
+            paths.append(self.write(str(backend_name), date_str, group.reset_index(drop=True)))
+        return paths
+
+    def merge_frame(self, df, keep="last", order_by=None):
+        """
+        Merge records into the store, deduplicating on (backend, date, qubit).
+
+        Each (backend, date) group is combined with the stored partition (if
+        any) and deduplicated on its own, so memory is bounded by one
+        partition regardless of the size of the store. With keep='last' the
+        incoming records replace the stored ones.
+
+        Parameters:
+        df (pd.DataFrame): Calibration records with 'backend' and 'date' columns.
+        keep (str): 'first', 'last' or 'latest' (see `dedup.dedupe_frame`).
+        order_by (str): Column used by keep='latest'.
+
+        Returns:
+        int: Number of duplicate rows dropped.
+        """
+        removed = 0
+        for (backend_name, date), group in df.groupby(["backend", "date"], sort=False, observed=True):
+            date_str = pd.Timestamp(date).strftime("%Y-%m-%d")
+            if self.has(str(backend_name), date_str):
+                stored = self.read_partition(str(backend_name), date_str)
+                group = pd.concat([stored, group], ignore_index=True)
+            merged, dropped = dedupe_frame(group.reset_index(drop=True), CALIBRATION_KEY, keep, order_by)
+            self.write(str(backend_name), date_str, merged)
+            removed += dropped
+        return removed
+
+    def read_partition(self, backend_name, date_str, columns=None):
+        """
+        Load the stored snapshot of one backend and date.
+
+        Parameters:
+        backend_name (str): Name of the backend.
+        date_str (str): Date of the snapshot in 'YYYY-MM-DD' format.
+        columns (list[str]): Subset of columns to load (optional).
+
+        Returns:
+        pd.DataFrame: Calibration records of that snapshot.
+        """
+        path = os.path.join(self.partition_dir(backend_name, date_str), PART_NAME)
+        return pd.read_parquet(path, columns=columns)
+
+    def read(self, backend_name=None, start_date=None, end_date=None, dates=None, columns=None):
+        """
+        Load stored snapshots into a single DataFrame.
+
+        Parameters:
+        backend_name (str): Backend to read, or None for all backends.
+        start_date (str): First date to include ('YYYY-MM-DD'), inclusive.
+        end_date (str): Last date to include ('YYYY-MM-DD'), inclusive.
+        dates (iterable): Explicit set of dates to include (optional).
+        columns (list[str]): Subset of columns to load (optional).
+
+        Returns:
+        pd.DataFrame: Records sorted by backend and date.
+        """
+        paths = self.partition_paths(backend_name, start_date, end_date, dates)
+        if not paths:
+            return pd.DataFrame(columns=columns)
+        frames = [pd.read_parquet(path, columns=columns) for path in paths]
+        return pd.concat(frames, ignore_index=True)
+
+    def iter_batches(self, backend_name=None, start_date=None, end_date=None, dates=None,
+                     columns=None, batch_size=50_000):
+        """
+        Stream stored snapshots as DataFrame batches of whole partitions.
+
+        Parameters:
+        backend_name (str): Backend to read, or None for all backends.
+        start_date (str): First date to include ('YYYY-MM-DD'), inclusive.
+        end_date (str): Last date to include ('YYYY-MM-DD'), inclusive.
+        dates (iterable): Explicit set of dates to include (optional).
+        columns (list[str]): Subset of columns to load (optional).
+        batch_size (int): Maximum number of rows per batch (a partition larger
+            than `batch_size` forms its own batch).
+
+        Yields:
+        pd.DataFrame: Records sorted by backend and date.
+        """
+        buffer = []
+        buffered_rows = 0
+        for path in self.partition_paths(backend_name, start_date, end_date, dates):
+            frame = pd.read_parquet(path, columns=columns)
+            if buffer and buffered_rows + len(frame) > batch_size:
+                yield pd.concat(buffer, ignore_index=True)
+                buffer = []
+                buffered_rows = 0
+            buffer.append(frame)
+            buffered_rows += len(frame)
+        if buffer:
+            yield pd.concat(buffer, ignore_index=True)
+
+    def partition_paths(self, backend_name=None, start_date=None, end_date=None, dates=None):
+        """
+        List the Parquet files matching a backend and date range.
+
+        Parameters:
+        backend_name (str): Backend to list, or None for all backends.
+        start_date (str): First date to include ('YYYY-MM-DD'), inclusive.
+        end_date (str): Last date to include ('YYYY-MM-DD'), inclusive.
+        dates (iterable): Explicit set of dates to include (optional).
+
+        Returns:
+        list[str]: File paths sorted by backend and date.
+        """
+        backends = [backend_name] if backend_name is not None else self.backends()
+        wanted = set(dates) if dates is not None else None
+        paths = []
+        for name in backends:
+            for date_str in self.dates(name):
+                if start_date is not None and date_str < start_date:
+                    continue
+                if end_date is not None and date_str > end_date:
+                    continue
+                if wanted is not None and date_str not in wanted:
+                    continue
+                paths.append(os.path.join(self.partition_dir(name, date_str), PART_NAME))
+        return paths
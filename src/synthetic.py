@@ -0,0 +1,291 @@
+import numpy as np
+import pandas as pd
+
+from fake_provider import FakeProvider, FakeProviderError, SINGLE_QUBIT_GATES
+from schema import (
+    CALIBRATION_COLUMNS,
+    CALIBRATION_SCHEMA,
+    GATE_ERROR_FIELDS,
+    GATE_TIME_COLUMN,
+    OPERATIONAL_COLUMN,
+    QUBIT_FIELDS,
+    enforce_schema,
+)
+
+# Synthetic calibration histories for scale testing and offline benchmarks.
+#
+# Every backend is simulated as (days x qubits) arrays generated in one go:
+#   - T1 drifts as a per-qubit AR(1) process in log space around a lognormal
+#     baseline, with occasional two-level-system dips; T2 follows T1 with a
+#     per-qubit ratio (capped at 2 * T1),
+#   - qubit frequencies are drawn around a few clusters (fixed per qubit,
+#     with small daily jitter); anharmonicity is close to -0.31 GHz,
+#   - readout errors are correlated with the physics: Prob meas0 prep1 grows
+#     with readout length / T1 (relaxation during the measurement), Prob meas1
+#     prep0 with thermal excitation at low frequency, both with frequency
+#     crowding between neighbouring qubits, and the readout assignment error
+#     is their mean, as IBM reports it,
+#   - some days are missing entirely, some rows are bad (`Readout length (ns)`
+#     equal to 0 or missing values) and some qubits are not operational.
+# The output has exactly the columns and dtypes of `load_calibration_history`,
+# and `SyntheticProperties` serves the same values as BackendProperties
+# snapshots through the fake provider.
+
+READOUT_LENGTHS_NS = (1244.4, 1560.0, 4000.0)
+ECR_LENGTHS_NS = (533.3, 590.0, 660.0)
+
+
+def _ar1(rng, shape, phi, sigma):
+    """AR(1) series along axis 0 with stationary standard deviation `sigma`."""
+    from scipy.signal import lfilter
+
+    noise = rng.normal(0.0, sigma * np.sqrt(1 - phi ** 2), shape)
+    noise[0] /= np.sqrt(1 - phi ** 2)  # Start from the stationary distribution
+    return lfilter([1.0], [1.0, -phi], noise, axis=0)
+
+
+def simulate_backend(num_qubits=127, days=365, seed=0, freq_clusters=3, drift_phi=0.97, drift_sigma=0.2,
+                     tls_rate=0.01, missing_day_rate=0.03, bad_row_rate=0.002, non_operational_rate=0.005,
+                     gate_coverage=1.0):
+    """
+    Simulate the calibration arrays of one backend.
+
+    Parameters:
+    num_qubits (int): Number of qubits.
+    days (int): Number of consecutive days.
+    seed (int or list): Seed of the random generator.
+    freq_clusters (int): Number of frequency clusters.
+    drift_phi (float): Day-to-day autocorrelation of the T1 drift.
+    drift_sigma (float): Standard deviation of the T1 drift (log scale).
+    tls_rate (float): Probability of a T1 dip per qubit and day.
+    missing_day_rate (float): Probability that a day has no snapshot.
+    bad_row_rate (float): Probability that a row is bad (readout length 0 or missing values).
+    non_operational_rate (float): Probability that a qubit is not operational on a day.
+    gate_coverage (float): Share of the days whose snapshot includes gate errors.
+
+    Returns:
+    dict: 'days' (bool array of the days with a snapshot) and one (days, qubits)
+    float32 array per calibration column, plus 'Operational' as bool.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (days, num_qubits)
+
+    # T1 / T2 (us)
+    t1_base = rng.lognormal(np.log(220.0), 0.35, num_qubits)
+    log_t1 = np.log(t1_base) + _ar1(rng, shape, drift_phi, drift_sigma)
+    log_t1 += rng.normal(0.0, 0.08, shape)  # Measurement noise
+    t1 = np.exp(log_t1)
+    dips = rng.random(shape) < tls_rate
+    t1[dips] *= rng.uniform(0.15, 0.6, int(dips.sum()))
+    t2_ratio = rng.uniform(0.3, 1.4, num_qubits) * rng.lognormal(0.0, 0.15, shape)
+    t2 = np.minimum(t1 * t2_ratio, 2.0 * t1)
+
+    # Frequencies (GHz): clusters of qubits, fixed per qubit, with daily jitter
+    centers = np.linspace(4.65, 5.05, freq_clusters) if freq_clusters > 1 else np.array([4.85])
+    cluster = rng.integers(0, len(centers), num_qubits)
+    freq_base = centers[cluster] + rng.normal(0.0, 0.025, num_qubits)
+    freq = freq_base + rng.normal(0.0, 2e-4, shape)
+    anharm = rng.normal(-0.31, 0.004, num_qubits) + rng.normal(0.0, 5e-4, shape)
+
+    # Readout: relaxation during the measurement, thermal excitation, crowding
+    readout_length = np.full(shape, rng.choice(READOUT_LENGTHS_NS))
+    detuning = np.full(num_qubits, np.inf)
+    detuning[1:] = np.abs(np.diff(freq_base))
+    detuning[:-1] = np.minimum(detuning[:-1], np.abs(np.diff(freq_base)))
+    crowding = 0.02 * np.exp(-detuning / 0.01)
+    readout_quality = rng.lognormal(np.log(0.008), 0.5, num_qubits) * np.exp(_ar1(rng, shape, 0.9, 0.25))
+    p01 = readout_quality + 0.5 * readout_length / (t1 * 1000) + crowding
+    p10 = 0.5 * readout_quality + 0.004 * np.exp(-(freq - 4.5) * 4) + crowding / 2
+    p01 = np.clip(p01, 1e-4, 0.5)
+    p10 = np.clip(p10, 1e-4, 0.5)
+    readout_error = (p01 + p10) / 2
+
+    # Gates: single-qubit errors scale with 1/T1, ECR errors with both qubits
+    sx_error = np.clip(2e-4 * (220.0 / t1) * rng.lognormal(0.0, 0.3, shape), 1e-5, 0.05)
+    ecr_error = np.clip(6e-3 * (220.0 / t1) * rng.lognormal(0.0, 0.4, shape), 1e-4, 0.5)
+    if num_qubits > 1:
+        # One ECR per neighbouring pair (q, q + 1): the last qubit reports its only pair
+        ecr_error[:, -1] = ecr_error[:, -2]
+    gate_time = np.full(shape, rng.choice(ECR_LENGTHS_NS))
+
+    data = {
+        "T1 (us)": t1,
+        "T2 (us)": t2,
+        "Frequency (GHz)": freq,
+        "Anharmonicity (GHz)": anharm,
+        "Readout assignment error": readout_error,
+        "Prob meas0 prep1": p01,
+        "Prob meas1 prep0": p10,
+        "Readout length (ns)": readout_length,
+        "ID error": sx_error,
+        "Z-axis rotation (rz) error": np.zeros(shape),
+        "√x (sx) error": sx_error,
+        "Pauli-X error": sx_error,
+        "ECR error": ecr_error,
+        GATE_TIME_COLUMN: gate_time,
+    }
+    data = {col: values.astype(np.float32) for col, values in data.items()}
+
+    # Days without gate information (most of the public history has none)
+    no_gates = rng.random(days) >= gate_coverage
+    for col in list(GATE_ERROR_FIELDS.values()) + [GATE_TIME_COLUMN]:
+        data[col][no_gates] = np.nan
+
+    # Bad rows: half with a zero readout length, half with missing values
+    bad = rng.random(shape) < bad_row_rate
+    zero_length = bad & (rng.random(shape) < 0.5)
+    data["Readout length (ns)"][zero_length] = 0.0
+    data["Prob meas1 prep0"][bad & ~zero_length] = np.nan
+    data["Readout length (ns)"][bad & ~zero_length] = np.nan
+
+    data[OPERATIONAL_COLUMN] = rng.random(shape) >= non_operational_rate
+    data["days"] = rng.random(days) >= missing_day_rate
+    return data
+
+
+def generate_calibrations(num_qubits=127, days=365, start_date="2024-01-01", backends=1, seed=0, **kwargs):
+    """
+    Generate a synthetic calibration history.
+
+    Parameters:
+    num_qubits (int): Qubits per backend.
+    days (int): Number of consecutive days (before removing missing days).
+    start_date (str): First date ('YYYY-MM-DD').
+    backends (int or list[str]): Number of backends (named 'synthetic_<i>') or their names.
+    seed (int): Random seed (every backend gets its own stream).
+    **kwargs: Options of `simulate_backend` (drift, missing days, bad rows, ...).
+
+    Returns:
+    pd.DataFrame: Records with `schema.CALIBRATION_COLUMNS` and `CALIBRATION_SCHEMA`
+    dtypes, sorted by backend, date and qubit.
+    """
+    names = [f"synthetic_{i}" for i in range(backends)] if isinstance(backends, int) else list(backends)
+    dates = pd.date_range(start_date, periods=days, freq="D").to_numpy(dtype="datetime64[ns]")
+
+    frames = []
+    for b, name in enumerate(names):
+        sim = simulate_backend(num_qubits, days, seed=[seed, b], **kwargs)
+        kept = sim.pop("days")
+        n_days = int(kept.sum())
+        columns = {
+            "backend": pd.Categorical.from_codes(np.full(n_days * num_qubits, b, dtype=np.int16), names),
+            "date": np.repeat(dates[kept], num_qubits),
+            "qubit": np.tile(np.arange(num_qubits, dtype=np.int16), n_days),
+        }
+        for col, values in sim.items():
+            columns[col] = values[kept].ravel()
+        frames.append(pd.DataFrame(columns, columns=CALIBRATION_COLUMNS))
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df["backend"] = pd.Categorical(df["backend"], categories=names)
+    return enforce_schema(df, CALIBRATION_SCHEMA)
+
+
+class SyntheticProperties:
+    """
+    `properties_factory` of FakeBackend serving synthetic histories as BackendProperties dicts.
+
+    Each backend is simulated once (on its first request) and every snapshot
+    is read from its arrays, so a pull through the fake provider returns
+    the same values as `generate_calibrations` with the same arguments. Missing
+    days raise `FakeProviderError`, like a failed API call.
+
+    Parameters:
+    num_qubits (int): Qubits per backend.
+    days (int): Number of simulated days.
+    start_date (str): First simulated date ('YYYY-MM-DD').
+    backends (list[str]): Backend names, in the order used by `generate_calibrations`
+        (a name not in the list gets the next seed).
+    seed (int): Random seed.
+    **kwargs: Options of `simulate_backend`.
+    """
+
+    def __init__(self, num_qubits=127, days=365, start_date="2024-01-01", backends=("synthetic_0",), seed=0,
+                 **kwargs):
+        self.num_qubits = num_qubits
+        self.days = days
+        self.start = pd.Timestamp(start_date).normalize()
+        self.backends = list(backends)
+        self.seed = seed
+        self.kwargs = kwargs
+        self._sims = {}
+
+    def _simulation(self, backend_name):
+        if backend_name not in self._sims:
+            if backend_name not in self.backends:
+                self.backends.append(backend_name)
+            b = self.backends.index(backend_name)
+            self._sims[backend_name] = simulate_backend(self.num_qubits, self.days, seed=[self.seed, b],
+                                                        **self.kwargs)
+        return self._sims[backend_name]
+
+    def __call__(self, backend_name, day):
+        sim = self._simulation(backend_name)
+        d = (pd.Timestamp(day).tz_localize(None).normalize() - self.start).days
+        if not 0 <= d < self.days or not sim["days"][d]:
+            raise FakeProviderError(f"No synthetic snapshot for {backend_name} on {day:%Y-%m-%d}")
+
+        stamp = day.strftime("%Y-%m-%dT00:00:00+00:00")
+
+        def nduv(name, unit, value):
+            return {"date": stamp, "name": name, "unit": unit, "value": float(value)}
+
+        units = {"T1": "us", "T2": "us", "frequency": "GHz", "anharmonicity": "GHz", "readout_length": "ns"}
+        qubit_values = {name: sim[col][d] for name, col in QUBIT_FIELDS.items()}
+        qubits = []
+        for q in range(self.num_qubits):
+            # Missing values are left out of the snapshot, as in the real API
+            nduvs = [nduv(name, units.get(name, ""), values[q]) for name, values in qubit_values.items()
+                     if not np.isnan(values[q])]
+            if not sim[OPERATIONAL_COLUMN][d, q]:
+                nduvs.append(nduv("operational", "", 0))
+            qubits.append(nduvs)
+
+        gates = []
+        gate_time = sim[GATE_TIME_COLUMN][d]
+        if not np.isnan(gate_time).all():
+            for gate in SINGLE_QUBIT_GATES:
+                errors = sim[GATE_ERROR_FIELDS[gate]][d]
+                length = 0.0 if gate == "rz" else 35.6
+                for q in range(self.num_qubits):
+                    gates.append({"qubits": [q], "gate": gate, "name": f"{gate}{q}",
+                                  "parameters": [nduv("gate_error", "", errors[q]),
+                                                 nduv("gate_length", "ns", length)]})
+            # ECR on neighbouring pairs, listed last so that its length is the qubit's gate time
+            errors = sim[GATE_ERROR_FIELDS["ecr"]][d]
+            for q in range(self.num_qubits - 1):
+                gates.append({"qubits": [q, q + 1], "gate": "ecr", "name": f"ecr{q}_{q + 1}",
+                              "parameters": [nduv("gate_error", "", errors[q]),
+                                             nduv("gate_length", "ns", gate_time[q])]})
+
+        return {
+            "backend_name": backend_name,
+            "backend_version": "1.0.0",
+            "last_update_date": stamp,
+            "qubits": qubits,
+            "gates": gates,
+            "general": [],
+        }
+
+
+def synthetic_provider(num_qubits=127, days=365, start_date="2024-01-01", backends=("synthetic_0",), seed=0,
+                       latency=0.0, failure_rate=0.0, **kwargs):
+    """
+    FakeProvider whose backends serve synthetic calibration histories.
+
+    Parameters:
+    num_qubits (int): Qubits per backend.
+    days (int): Number of simulated days.
+    start_date (str): First simulated date ('YYYY-MM-DD').
+    backends (list[str]): Backend names.
+    seed (int): Random seed.
+    latency (float or tuple): Seconds slept per API call.
+    failure_rate (float): Probability that an API call fails.
+    **kwargs: Options of `simulate_backend`.
+
+    Returns:
+    FakeProvider: Provider to pass as `provider=` to the ingestion functions.
+    """
+    factory = SyntheticProperties(num_qubits, days, start_date, backends, seed, **kwargs)
+    return FakeProvider(num_qubits=num_qubits, latency=latency, failure_rate=failure_rate, seed=seed,
+                        properties_factory=factory)
@@ -0,0 +1,409 @@
+"""
+Hyperparameter search for the readout assignment error models.
+
+Successive halving (and Hyperband, a set of successive halving brackets) over
+XGBoost or RandomForest configurations. The budget of a trial is its number
+of trees: every rung trains the surviving configurations with `eta` times
+more trees and keeps the best `1 / eta` of them. XGBoost trials use early
+stopping, so the search also reports how many boosting rounds the best
+configuration actually needs. Early stopping watches its own split of the
+training rows, never the validation fold that ranks the trials, so the
+reported validation scores are not biased by the stopping point.
+
+Trials run in a process pool (the training data is sent once per worker) and
+every finished trial is stored on disk, keyed by its model, parameters,
+budget and a hash of the data: rerunning a sweep only trains configurations
+that were never evaluated on the same data.
+
+Usage (from the `src` directory):
+    python tuning.py --data ../data/raw/df_sherbrooke.csv --model xgb --configs 27
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Search spaces (lists of candidate values). The number of trees is the budget
+# of successive halving, so it is not part of the spaces.
+SEARCH_SPACES = {
+    "xgb": {
+        "max_depth": [3, 4, 5, 6, 8],
+        "learning_rate": [0.01, 0.03, 0.05, 0.1],
+        "subsample": [0.6, 0.7, 0.8, 1.0],
+        "colsample_bytree": [0.6, 0.7, 0.8, 1.0],
+        "gamma": [0, 0.1],
+        "reg_alpha": [0, 0.01, 0.1],
+        "reg_lambda": [1, 5],
+    },
+    "rf": {
+        "max_depth": [6, 8, 10, 14, None],
+        "max_features": [0.3, 0.5, 0.8, 1.0],
+        "min_samples_leaf": [1, 2, 5, 10],
+    },
+}
+
+# Repository-level .cache/, wherever the caller runs from
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "tuning")
+EARLY_STOPPING_ROUNDS = 50
+
+# Training data of the current worker process (set once by `_init_worker`)
+_DATA = {}
+
+
+def array_hash(*arrays):
+    """
+    SHA-256 of the content, dtype and shape of some arrays.
+
+    Parameters:
+    *arrays (np.ndarray): Arrays to hash.
+
+    Returns:
+    str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        digest.update(f"{a.dtype}{a.shape}".encode())
+        digest.update(a.tobytes())
+    return digest.hexdigest()
+
+
+def sample_configs(space, n, seed=0):
+    """
+    Draw distinct configurations from a search space.
+
+    When the space has at most `n` combinations the full grid is returned
+    (the notebook's RandomizedSearchCV asked for 20 draws from 8 combinations).
+
+    Parameters:
+    space (dict): Parameter -> list of candidate values.
+    n (int): Number of configurations.
+    seed (int): Random seed.
+
+    Returns:
+    list[dict]: Distinct configurations.
+    """
+    names = sorted(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    if total <= n:
+        return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+    rng = np.random.default_rng(seed)
+    seen = set()
+    configs = []
+    while len(configs) < n:
+        index = tuple(int(rng.integers(size)) for size in sizes)
+        if index in seen:
+            continue
+        seen.add(index)
+        configs.append({name: space[name][i] for name, i in zip(names, index)})
+    return configs
+
+
+class TrialCache:
+    """
+    On-disk store of finished trials, one JSON file per trial.
+
+    Parameters:
+    directory (str): Cache directory (created if missing), or None to disable.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(model, params, budget, seed, data_key):
+        payload = json.dumps([model, params, budget, seed, data_key], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, key, trial):
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(trial, f, default=str)
+        os.replace(tmp_path, path)
+
+
+def make_estimator(model, params, budget, seed=42, n_jobs=1):
+    """
+    Build an unfitted estimator for a trial.
+
+    Parameters:
+    model (str): 'xgb' or 'rf'.
+    params (dict): Hyperparameters (without the number of trees).
+    budget (int): Number of trees (maximum boosting rounds for XGBoost).
+    seed (int): Random seed.
+    n_jobs (int): Threads of the estimator.
+
+    Returns:
+    Estimator with fit/predict.
+    """
+    if model == "xgb":
+        from xgboost import XGBRegressor
+
+        return XGBRegressor(n_estimators=budget, early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                            eval_metric="mae", tree_method="hist", random_state=seed,
+                            n_jobs=n_jobs, verbosity=0, **params)
+    if model == "rf":
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor(n_estimators=budget, random_state=seed, n_jobs=n_jobs, **params)
+    raise ValueError(f"Unknown model '{model}' (expected one of {sorted(SEARCH_SPACES)})")
+
+
+def _init_worker(X_train, y_train, X_val, y_val, stop):
+    # XGBoost fits on the training rows outside `stop` and early-stops on `stop`;
+    # RandomForest uses all the training rows
+    _DATA.update(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val,
+                 X_fit=X_train[~stop], y_fit=y_train[~stop], X_stop=X_train[stop], y_stop=y_train[stop])
+
+
+def _run_trial(model, params, budget, seed, n_jobs):
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    estimator = make_estimator(model, params, budget, seed, n_jobs)
+    started = time.perf_counter()
+    if model == "xgb":
+        estimator.fit(_DATA["X_fit"], _DATA["y_fit"],
+                      eval_set=[(_DATA["X_stop"], _DATA["y_stop"])], verbose=False)
+        n_trees = int(estimator.best_iteration) + 1
+    else:
+        estimator.fit(_DATA["X_train"], _DATA["y_train"])
+        n_trees = budget
+    fit_seconds = time.perf_counter() - started
+
+    y_pred = estimator.predict(_DATA["X_val"])
+    return {
+        "mae": float(mean_absolute_error(_DATA["y_val"], y_pred)),
+        "r2": float(r2_score(_DATA["y_val"], y_pred)),
+        "n_trees": n_trees,
+        "fit_seconds": fit_seconds,
+    }
+
+
+class Tuner:
+    """
+    Run trials in a process pool, skipping those already in the trial cache.
+
+    Parameters:
+    model (str): 'xgb' or 'rf'.
+    X (array-like): Training features.
+    y (array-like): Training target.
+    validation_fraction (float): Share of the rows held out to score the trials.
+    early_stopping_fraction (float): Share of the remaining training rows held out
+        for XGBoost early stopping (kept apart from the validation rows).
+    cache (TrialCache): Trial cache (default: `DEFAULT_CACHE_DIR`).
+    max_workers (int): Worker processes (default: CPU count).
+    threads_per_trial (int): Threads of every estimator.
+    seed (int): Seed of the split and the estimators.
+    """
+
+    def __init__(self, model, X, y, validation_fraction=0.2, cache=None, max_workers=None,
+                 threads_per_trial=1, seed=42, early_stopping_fraction=0.1):
+        if model not in SEARCH_SPACES:
+            raise ValueError(f"Unknown model '{model}' (expected one of {sorted(SEARCH_SPACES)})")
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        val = rng.random(len(y)) < validation_fraction
+        stop = rng.random(int((~val).sum())) < early_stopping_fraction  # Over the training rows
+
+        self.model = model
+        self.seed = seed
+        self.threads_per_trial = threads_per_trial
+        self.cache = cache if cache is not None else TrialCache()
+        self.data_key = array_hash(X, y, val, stop)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._data = (X[~val], y[~val], X[val], y[val], stop)
+        self._pool = None
+        self.trials = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, configs, budget, rung=0, bracket=0):
+        """
+        Evaluate configurations with a given budget.
+
+        Parameters:
+        configs (list[dict]): Configurations to evaluate.
+        budget (int): Number of trees of every trial.
+        rung (int): Rung number, recorded in the trials.
+        bracket (int): Hyperband bracket, recorded in the trials.
+
+        Returns:
+        list[dict]: One trial per configuration, in the same order.
+        """
+        keys = [TrialCache.key(self.model, params, budget, self.seed, self.data_key) for params in configs]
+        results = [self.cache.get(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if pending:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.max_workers, initializer=_init_worker, initargs=self._data)
+            futures = {i: self._pool.submit(_run_trial, self.model, configs[i], budget, self.seed,
+                                            self.threads_per_trial) for i in pending}
+            for i, future in futures.items():
+                results[i] = future.result()
+                self.cache.put(keys[i], results[i])
+
+        trials = []
+        for i, (params, result) in enumerate(zip(configs, results)):
+            trials.append({"bracket": bracket, "rung": rung, "budget": budget, "params": params,
+                           "cached": i not in pending, **result})
+        self.trials.extend(trials)
+        return trials
+
+    def successive_halving(self, configs, min_budget, max_budget, eta=3, bracket=0):
+        """
+        Successive halving: keep the best `1 / eta` configurations of every rung.
+
+        Parameters:
+        configs (list[dict]): Initial configurations.
+        min_budget (int): Trees of the first rung.
+        max_budget (int): Maximum trees of a trial.
+        eta (int): Reduction factor.
+        bracket (int): Hyperband bracket, recorded in the trials.
+
+        Returns:
+        dict: Best trial of the last rung.
+        """
+        budget = min_budget
+        rung = 0
+        while True:
+            trials = self.run(configs, budget, rung, bracket)
+            ranked = sorted(trials, key=lambda t: t["mae"])
+            if budget >= max_budget or len(ranked) == 1:
+                return ranked[0]
+            configs = [t["params"] for t in ranked[:max(1, len(ranked) // eta)]]
+            budget = min(max_budget, budget * eta)
+            rung += 1
+
+    def hyperband(self, min_budget, max_budget, eta=3, space=None):
+        """
+        Hyperband: successive halving brackets trading configurations for budget.
+
+        Parameters:
+        min_budget (int): Smallest number of trees of a trial.
+        max_budget (int): Largest number of trees of a trial.
+        eta (int): Reduction factor.
+        space (dict): Search space (default: `SEARCH_SPACES[model]`).
+
+        Returns:
+        dict: Best trial over all brackets.
+        """
+        space = space or SEARCH_SPACES[self.model]
+        s_max = int(math.log(max_budget / min_budget, eta) + 1e-9)
+        best = None
+        for s in range(s_max, -1, -1):
+            n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            configs = sample_configs(space, n, seed=self.seed + s)
+            trial = self.successive_halving(configs, max(min_budget, int(max_budget / eta ** s)),
+                                            max_budget, eta, bracket=s_max - s)
+            if best is None or trial["mae"] < best["mae"]:
+                best = trial
+        return best
+
+    def results(self):
+        """All trials run so far, as a DataFrame sorted by validation MAE."""
+        frame = pd.DataFrame(self.trials)
+        if frame.empty:
+            return frame
+        params = pd.json_normalize(frame.pop("params").tolist())
+        return pd.concat([frame, params], axis=1).sort_values(["mae", "budget"], ascending=[True, False])
+
+
+def tune(model, X, y, method="halving", n_configs=27, min_budget=50, max_budget=2000, eta=3,
+         space=None, cache_dir=DEFAULT_CACHE_DIR, max_workers=None, seed=42):
+    """
+    Search the hyperparameters of `model` on (X, y).
+
+    Parameters:
+    model (str): 'xgb' or 'rf'.
+    X (array-like): Training features.
+    y (array-like): Training target.
+    method (str): 'halving' or 'hyperband'.
+    n_configs (int): Initial configurations of successive halving.
+    min_budget (int): Trees of the cheapest trials.
+    max_budget (int): Trees of the most expensive trials.
+    eta (int): Reduction factor.
+    space (dict): Search space (default: `SEARCH_SPACES[model]`).
+    cache_dir (str): Trial cache directory, or None to disable the cache.
+    max_workers (int): Worker processes.
+    seed (int): Random seed.
+
+    Returns:
+    tuple: (best trial dict, DataFrame of all trials).
+    """
+    with Tuner(model, X, y, cache=TrialCache(cache_dir), max_workers=max_workers, seed=seed) as tuner:
+        if method == "hyperband":
+            best = tuner.hyperband(min_budget, max_budget, eta, space)
+        elif method == "halving":
+            configs = sample_configs(space or SEARCH_SPACES[model], n_configs, seed)
+            best = tuner.successive_halving(configs, min_budget, max_budget, eta)
+        else:
+            raise ValueError(f"Unknown method '{method}' (expected 'halving' or 'hyperband')")
+        return best, tuner.results()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", required=True, help="Calibration CSV or Parquet with the target column")
+    parser.add_argument("--model", choices=sorted(SEARCH_SPACES), default="xgb")
+    parser.add_argument("--method", choices=["halving", "hyperband"], default="halving")
+    parser.add_argument("--configs", type=int, default=27)
+    parser.add_argument("--min-budget", type=int, default=50)
+    parser.add_argument("--max-budget", type=int, default=2000)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from features import INPUT_COLUMNS, TARGET, CalibrationFeatures
+
+    df = pd.read_parquet(args.data) if args.data.endswith(".parquet") else pd.read_csv(args.data)
+    df = df.dropna(subset=INPUT_COLUMNS + [TARGET])
+    X = CalibrationFeatures().fit(df).transform(df)
+
+    best, trials = tune(args.model, X, df[TARGET].to_numpy(), args.method, args.configs, args.min_budget,
+                        args.max_budget, args.eta, cache_dir=args.cache_dir, max_workers=args.workers,
+                        seed=args.seed)
+    with pd.option_context("display.width", 200, "display.max_rows", 50):
+        print(trials.head(20).to_string(index=False))
+    print(f"\n{len(trials)} trials ({int(trials['cached'].sum())} from cache)")
+    print("Best:", json.dumps({k: best[k] for k in ("params", "budget", "n_trees", "mae", "r2")}, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,15 @@
 import streamlit as st
-from streamlit_option_menu import option_menu
-import streamlit.components.v1 as components
-import pandas as pd
-import pydeck as pdk
-import altair as alt
-import numpy as np
+from streamlit_option_menu import option_menu  # Menú de la sidebar: se usa en cada rerun
 import datetime
-import zipfile
-import base64
-import time
-import io
 import os
 
+import archives
+import data_cache
+
+# Las dependencias que solo usa una página (pandas, pydeck, altair) se importan
+# dentro de esa página, así el arranque y las demás páginas no pagan su importación.
+# El presupuesto de tiempo de arranque se comprueba con benchmarks/bench_startup.py
+
 # Para ejecutar, primero en la terminal: pip install -r requirements.txt
 # Después: streamlit run app.py
 
@@ -29,8 +27,7 @@ with st.sidebar:
     # Es mejor usar el logo con el fondo transparente
     logo_path = "assets/logo.png"
     try:
-        with open(logo_path, "rb") as image_file:
-            encoded_logo = base64.b64encode(image_file.read()).decode()
+        encoded_logo = data_cache.read_base64(logo_path)  # Cacheado: no se recodifica en cada rerun
         st.markdown(
             f"""
             <div style="display: flex; justify-content: center; margin-top: 15px; margin-bottom: 40px;">
@@ -187,9 +184,12 @@ if st.session_state.current_page_key == "Overview":
 
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.image("assets/image2.png", caption="Quantum Computer", width=375)
+            st.image(data_cache.read_bytes("assets/image2.png"), caption="Quantum Computer", width=375)
 
         st.subheader("¿Sheerbrooke?")
+        import pandas as pd
+        import pydeck as pdk
+
         df = pd.DataFrame([
             {"city": "Sherbrooke", "lat": 45.4001, "lon": -71.8991}
         ])
@@ -266,7 +266,7 @@ Nuestro objetivo: **predecir el error de lectura (readout assignment error) de c
 👉 Únete a este análisis para descubrir cómo optimizar calibraciones y mejorar la fidelidad en computación cuántica.
             """)
         with right_col:
-            st.image("assets/image1.png", use_container_width=True)
+            st.image(data_cache.read_bytes("assets/image1.png"), use_container_width=True)
 
 
 elif st.session_state.current_page_key == "Interactive Analysis":
@@ -280,7 +280,7 @@ elif st.session_state.current_page_key == "Interactive Analysis":
         st.subheader("Statistics and Outliers")
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            df_csv = pd.read_csv("assets/image3.csv")
+            df_csv = data_cache.read_csv("assets/image3.csv")
             st.dataframe(df_csv)
             # Leyenda centrada debajo de la tabla
             st.markdown(
@@ -327,22 +327,22 @@ elif st.session_state.current_page_key == "Interactive Analysis":
         with graph_subtabs[0]:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
-                st.image("assets/image4.png", width=700)
+                st.image(data_cache.read_bytes("assets/image4.png"), width=700)
 
         # Normalization vs Standardization
         with graph_subtabs[1]:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
-                st.image("assets/image5.png", width=700)
+                st.image(data_cache.read_bytes("assets/image5.png"), width=700)
 
         # Correlation Heatmap
         with graph_subtabs[2]:
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
-                st.image("assets/image6.png", width=700)
+                st.image(data_cache.read_bytes("assets/image6.png"), width=700)
 
             st.markdown("#### Data Table for Correlation Heatmap")
-            df_corr = pd.read_csv("assets/image7.csv")
+            df_corr = data_cache.read_csv("assets/image7.csv")
             st.dataframe(df_corr)
             # Leyenda centrada debajo de la tabla
             st.markdown(
@@ -388,7 +388,7 @@ elif st.session_state.current_page_key == "ML/DP":  # Si solo hay ML, quitar DP
     with model_tab:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            df_models = pd.read_csv("assets/image8.csv")
+            df_models = data_cache.read_csv("assets/image8.csv")
             st.dataframe(df_models)
 
     # 2️⃣ Tab de resultado final
@@ -492,8 +492,7 @@ elif st.session_state.current_page_key == "Downloads & Resources":
 
     if lang == "English":
         report_path = os.path.join(report_base, "Executive_Summary_EN.pdf")
-        with open(report_path, "rb") as f:
-            pdf_bytes = f.read()
+        pdf_bytes = data_cache.read_bytes(report_path)
         st.download_button(
             label="📥 Download Executive Summary (English)",
             data=pdf_bytes,
@@ -502,8 +501,7 @@ elif st.session_state.current_page_key == "Downloads & Resources":
         )
     else:
         report_path = os.path.join(report_base, "Executive_Summary_ES.pdf")
-        with open(report_path, "rb") as f:
-            pdf_bytes = f.read()
+        pdf_bytes = data_cache.read_bytes(report_path)
         st.download_button(
             label="📥 Descargar Resumen Ejecutivo (Español)",
             data=pdf_bytes,
@@ -523,32 +521,28 @@ elif st.session_state.current_page_key == "Downloads & Resources":
         """
     )
 
-    # Helper para comprimir cualquier carpeta en memoria
-    def zip_folder_to_bytes(folder_path):
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, start=folder_path)
-                    z.write(file_path, arcname=arcname)
-        buffer.seek(0)
-        return buffer.read()
+    # Formato de descarga: los ficheros originales o las tablas en Parquet (zstd), con tipos y listas para pandas
+    data_format = st.radio(
+        "Download format",
+        ["Original files (ZIP)", "Parquet / zstd (ZIP)"],
+        horizontal=True,
+    )
+    fmt = "zip" if data_format.startswith("Original") else "parquet"
 
+    # Los zips se construyen una sola vez por contenido de la carpeta (ver archives.py)
+    # y solo se leen de disco al pulsar el botón
     # Raw data
-    raw_zip = zip_folder_to_bytes(os.path.join("data", "raw"))
     st.download_button(
         label="📥 Download Raw Data (ZIP)",
-        data=raw_zip,
+        data=archives.archive_loader(os.path.join("data", "raw"), "raw", fmt),
         file_name="vanguard_raw_data.zip",
         mime="application/zip",
     )
 
     # Processed data
-    processed_zip = zip_folder_to_bytes(os.path.join("data", "processed"))
     st.download_button(
         label="📥 Download Processed Data (ZIP)",
-        data=processed_zip,
+        data=archives.archive_loader(os.path.join("data", "processed"), "processed", fmt),
         file_name="vanguard_processed_data.zip",
         mime="application/zip",
     )
@@ -564,6 +558,102 @@ elif st.session_state.current_page_key == "Downloads & Resources":
 elif st.session_state.current_page_key == "Load & Quick EDA":
     st.title("Load & Quick EDA")
 
+    # El fichero se lee una sola vez por contenido (hash SHA-256) y todo lo que se
+    # calcula sobre él queda cacheado: ver uploads.py
+    import altair as alt
+    import uploads
+
+    st.markdown(
+        """
+        Upload a calibration history (CSV or Parquet, same columns as `load_calibration_history`)
+        to get a quick profile, the distribution of every numeric column and their correlations.
+        """
+    )
+
+    uploaded_file = st.file_uploader("Calibration file", type=["csv", "parquet"])
+
+    if uploaded_file is not None:
+        progress_bar = st.progress(0.0, text=f"Reading {uploaded_file.name}...")
+        try:
+            entry = uploads.load_upload(
+                uploaded_file,
+                progress=lambda fraction: progress_bar.progress(fraction, text=f"Reading {uploaded_file.name}... {fraction:.0%}"),
+            )
+        except Exception as exc:
+            progress_bar.empty()
+            st.error(f"Could not read {uploaded_file.name}: {exc}")
+            st.stop()
+        progress_bar.empty()
+
+        df_upload = entry["df"]
+        report = entry["profile"]
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Rows", f"{report.n_rows:,}")
+        col2.metric("Columns", df_upload.shape[1])
+        col3.metric("Memory (typed)", f"{entry['bytes'] / 1024 ** 2:,.1f} MB")
+        col4.metric("Duplicated rows", f"{report.duplicated_rows:,}")
+
+        tab_profile, tab_dist, tab_corr, tab_preview = st.tabs(
+            ["Profile", "Distributions", "Correlation", "Preview"]
+        )
+
+        with tab_profile:
+            st.dataframe(report.to_frame(), use_container_width=True)
+
+        numeric_cols = uploads.numeric_columns(df_upload)
+
+        with tab_dist:
+            if not numeric_cols:
+                st.info("The file has no numeric columns.")
+            else:
+                dist_col1, dist_col2 = st.columns([3, 1])
+                column = dist_col1.selectbox("Column", numeric_cols)
+                bins = dist_col2.select_slider("Bins", options=[20, 50, 100, 200], value=50)
+
+                # Histograma sobre todas las filas, pero solo `bins` barras que dibujar
+                hist = uploads.histogram(entry, column, bins)
+                st.altair_chart(
+                    alt.Chart(hist).mark_bar(color="#0059FF").encode(
+                        x=alt.X("start:Q", bin="binned", title=column),
+                        x2="end:Q",
+                        y=alt.Y("count:Q", title="Rows"),
+                        tooltip=["start", "end", "count"],
+                    ),
+                    use_container_width=True,
+                )
+
+                # Evolución diaria: un punto por día en lugar de una fila por qubit
+                daily = uploads.daily_series(entry, column)
+                if not daily.empty:
+                    band = alt.Chart(daily).mark_area(opacity=0.25, color="#0059FF").encode(
+                        x=alt.X("date:T", title="Date"), y=alt.Y("p10:Q", title=column), y2="p90:Q"
+                    )
+                    line = alt.Chart(daily).mark_line(color="#0059FF").encode(x="date:T", y="median:Q")
+                    st.altair_chart(band + line, use_container_width=True)
+                    st.caption("Daily median with the 10th-90th percentile band.")
+
+        with tab_corr:
+            if len(numeric_cols) < 2:
+                st.info("At least two numeric columns are needed.")
+            else:
+                corr = uploads.correlation_matrix(entry)
+                corr_long = corr.rename_axis("x").reset_index().melt("x", var_name="y", value_name="corr")
+                st.altair_chart(
+                    alt.Chart(corr_long).mark_rect().encode(
+                        x=alt.X("x:N", title=None, sort=list(corr.columns)),
+                        y=alt.Y("y:N", title=None, sort=list(corr.columns)),
+                        color=alt.Color("corr:Q", scale=alt.Scale(scheme="redblue", domain=[-1, 1])),
+                        tooltip=["x", "y", alt.Tooltip("corr:Q", format=".3f")],
+                    ).properties(height=520),
+                    use_container_width=True,
+                )
+                if len(df_upload) > uploads.CORR_SAMPLE_ROWS:
+                    st.caption(f"Computed on a random sample of {uploads.CORR_SAMPLE_ROWS:,} rows.")
+
+        with tab_preview:
+            st.dataframe(df_upload.head(200), use_container_width=True)
+
 
 elif st.session_state.current_page_key == "Settings":
     st.title("Settings")
@@ -0,0 +1,113 @@
+import hashlib
+import io
+import os
+import uuid
+import zipfile
+
+import streamlit as st
+
+# Archivos de descarga precalculados para "Downloads & Resources".
+# Cada carpeta se comprime una sola vez en .cache/archives/<nombre>-<hash>.zip,
+# donde <hash> es un hash del contenido de la carpeta: mientras los ficheros no
+# cambien, el zip ya construido se reutiliza (entre reruns, sesiones y reinicios).
+# El contenido solo se lee de disco cuando el usuario pulsa el botón de descarga.
+
+ARCHIVE_DIR = os.path.join(".cache", "archives")
+TABULAR_EXTENSIONS = (".csv", ".txt")
+
+
+def folder_signature(folder_path):
+    """
+    Firma barata de una carpeta: (ruta relativa, tamaño, mtime) de cada fichero.
+
+    Parameters:
+    folder_path (str): Carpeta a describir.
+
+    Returns:
+    tuple: Firma ordenada de todos los ficheros de la carpeta.
+    """
+    entries = []
+    for root, _, files in os.walk(folder_path):
+        for file in files:
+            file_path = os.path.join(root, file)
+            stat = os.stat(file_path)
+            entries.append((os.path.relpath(file_path, start=folder_path), stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+@st.cache_data(show_spinner=False)
+def _content_hash(folder_path, signature):
+    # Solo se recalcula cuando cambia la firma (algún fichero añadido, borrado o modificado)
+    digest = hashlib.sha256()
+    for rel_path, _, _ in signature:
+        digest.update(rel_path.encode())
+        with open(os.path.join(folder_path, rel_path), "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def folder_content_hash(folder_path):
+    """Hash SHA-256 del contenido de la carpeta (nombres y bytes de sus ficheros)."""
+    return _content_hash(folder_path, folder_signature(folder_path))
+
+
+def _write_zip(folder_path, target, fmt):
+    import pandas as pd  # Solo para convertir CSV a Parquet
+
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as z:
+        for rel_path, _, _ in folder_signature(folder_path):
+            file_path = os.path.join(folder_path, rel_path)
+            if fmt == "parquet" and rel_path.endswith(TABULAR_EXTENSIONS):
+                # Parquet ya va comprimido con zstd: se guarda sin volver a comprimir
+                buffer = io.BytesIO()
+                pd.read_csv(file_path).to_parquet(buffer, index=False, compression="zstd")
+                arcname = os.path.splitext(rel_path)[0] + ".parquet"
+                z.writestr(zipfile.ZipInfo(arcname), buffer.getvalue(), compress_type=zipfile.ZIP_STORED)
+            else:
+                z.write(file_path, arcname=rel_path)
+
+
+def build_archive(folder_path, name, fmt="zip"):
+    """
+    Devuelve la ruta del zip de la carpeta, construyéndolo solo si su contenido ha cambiado.
+
+    Parameters:
+    folder_path (str): Carpeta a comprimir.
+    name (str): Prefijo del fichero del archivo.
+    fmt (str): 'zip' (ficheros originales) o 'parquet' (tablas en Parquet/zstd).
+
+    Returns:
+    str: Ruta del archivo en disco.
+    """
+    content_hash = folder_content_hash(folder_path)
+    prefix = f"{name}-{fmt}-"
+    archive_path = os.path.join(ARCHIVE_DIR, f"{prefix}{content_hash[:16]}.zip")
+    if os.path.exists(archive_path):
+        return archive_path
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    tmp_path = os.path.join(ARCHIVE_DIR, f".{uuid.uuid4().hex}.tmp")
+    try:
+        _write_zip(folder_path, tmp_path, fmt)
+        os.replace(tmp_path, archive_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Borramos versiones antiguas del mismo archivo
+    for file in os.listdir(ARCHIVE_DIR):
+        if file.startswith(prefix) and os.path.join(ARCHIVE_DIR, file) != archive_path:
+            os.remove(os.path.join(ARCHIVE_DIR, file))
+    return archive_path
+
+
+def archive_loader(folder_path, name, fmt="zip"):
+    """
+    Callable para `st.download_button(data=...)`: construye (si hace falta) y lee
+    el archivo solo cuando el usuario pulsa el botón.
+    """
+    def load():
+        with open(build_archive(folder_path, name, fmt), "rb") as f:
+            return f.read()
+    return load
@@ -0,0 +1,114 @@
+import base64
+import os
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# Capa de datos cacheada de la app.
+# Streamlit vuelve a ejecutar app.py entero en cada interacción, así que todas las
+# lecturas de disco (CSV, imágenes, PDFs, logo) pasan por aquí: cada entrada se
+# guarda con el mtime y el tamaño del fichero, y solo se vuelve a leer si el
+# fichero ha cambiado. La caché tiene un tamaño máximo en bytes y expulsa las
+# entradas menos usadas recientemente (LRU).
+
+MAX_CACHE_BYTES = 256 * 1024 ** 2  # 256 MB
+
+
+class FileCache:
+    """
+    Caché LRU de ficheros, invalidada por mtime y tamaño y acotada en bytes.
+
+    Parameters:
+    max_bytes (int): Tamaño máximo aproximado de los valores guardados.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (tipo, ruta) -> (firma, valor, bytes)
+        self._lock = threading.Lock()
+
+    def get(self, kind, path, loader, sizeof):
+        """
+        Devuelve el valor cacheado de `path`, cargándolo con `loader` si hace falta.
+
+        Parameters:
+        kind (str): Tipo de lectura ('csv', 'bytes', ...), parte de la clave.
+        path (str): Ruta del fichero.
+        loader (callable): Función que lee el fichero y devuelve el valor.
+        sizeof (callable): Función que estima los bytes que ocupa el valor.
+
+        Returns:
+        object: Valor cargado (compartido entre reruns y sesiones, no modificar).
+        """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (kind, os.path.abspath(path))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        value = loader(path)
+        nbytes = sizeof(value)
+
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[2]
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (signature, value, nbytes)
+                self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Entradas, bytes ocupados, aciertos y fallos de la caché."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@st.cache_resource
+def get_cache():
+    """Única instancia de la caché, compartida por todas las sesiones y reruns."""
+    return FileCache()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_csv(path):
+    """DataFrame del CSV `path` (cacheado)."""
+    import pandas as pd  # Solo al leer el primer CSV: no en el arranque de la app
+
+    return get_cache().get("csv", path, pd.read_csv, lambda df: int(df.memory_usage(deep=True).sum()))
+
+
+def read_bytes(path):
+    """Contenido binario de `path` (cacheado): imágenes, PDFs, zips..."""
+    return get_cache().get("bytes", path, _read_bytes, len)
+
+
+def read_base64(path):
+    """Contenido de `path` codificado en base64 (cacheado), para incrustarlo en HTML."""
+    return get_cache().get("base64", path, lambda p: base64.b64encode(_read_bytes(p)).decode(), len)
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Módulos del proyecto (schema, profiling) en ../src
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from profiling import profile_chunks  # noqa: E402
+from schema import CALIBRATION_SCHEMA, enforce_schema  # noqa: E402
+
+# Carga de ficheros subidos en "Load & Quick EDA".
+# Un fichero de cientos de MB no se puede volver a leer en cada rerun de Streamlit:
+# se lee una sola vez, por trozos (con barra de progreso), se convierte a los tipos
+# del esquema de calibraciones (float32, category, ...) y se guarda en memoria con
+# la clave del hash SHA-256 de su contenido. El perfil, la matriz de correlación y
+# los histogramas se calculan también una sola vez por hash y se guardan junto al
+# DataFrame, de modo que los clics siguientes solo pintan resultados ya calculados.
+
+CSV_CHUNK_ROWS = 250_000
+PARQUET_BATCH_ROWS = 250_000
+HASH_BLOCK_BYTES = 8 * 1024 ** 2
+MAX_UPLOAD_CACHE_BYTES = 1024 ** 3  # 1 GB de DataFrames en memoria
+CORR_SAMPLE_ROWS = 500_000
+
+
+class UploadCache:
+    """
+    Caché LRU de ficheros subidos, por hash de contenido y acotada en bytes.
+
+    Parameters:
+    max_bytes (int): Tamaño máximo aproximado de los DataFrames guardados.
+    """
+
+    def __init__(self, max_bytes=MAX_UPLOAD_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # hash -> dict(df, bytes, profile, corr, charts)
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest, df, profile):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        entry = {"df": df, "bytes": nbytes, "profile": profile, "corr": None, "charts": {}}
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self.total_bytes -= old["bytes"]
+            self._entries[digest] = entry
+            self.total_bytes += nbytes
+            # Nunca se expulsa la entrada recién añadida
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted["bytes"]
+        return entry
+
+
+@st.cache_resource
+def get_upload_cache():
+    """Única caché de ficheros subidos, compartida por todas las sesiones y reruns."""
+    return UploadCache()
+
+
+def file_digest(uploaded_file):
+    """
+    Hash SHA-256 del contenido de un fichero subido (leído por bloques).
+
+    Se guarda en session_state por `file_id`, así que solo se calcula una vez por subida.
+    """
+    digests = st.session_state.setdefault("upload_digests", {})
+    if uploaded_file.file_id not in digests:
+        digest = hashlib.sha256()
+        uploaded_file.seek(0)
+        for block in iter(lambda: uploaded_file.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+        uploaded_file.seek(0)
+        digests[uploaded_file.file_id] = digest.hexdigest()
+    return digests[uploaded_file.file_id]
+
+
+def _iter_csv(uploaded_file, progress):
+    size = max(uploaded_file.size, 1)
+    uploaded_file.seek(0)
+    for chunk in pd.read_csv(uploaded_file, chunksize=CSV_CHUNK_ROWS):
+        yield chunk
+        progress(min(uploaded_file.tell() / size, 1.0))
+
+
+def _iter_parquet(uploaded_file, progress):
+    import pyarrow.parquet as pq
+
+    uploaded_file.seek(0)
+    parquet = pq.ParquetFile(uploaded_file)
+    total = max(parquet.metadata.num_rows, 1)
+    done = 0
+    for batch in parquet.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        chunk = batch.to_pandas()
+        done += len(chunk)
+        yield chunk
+        progress(done / total)
+
+
+def load_upload(uploaded_file, progress=None):
+    """
+    DataFrame tipado de un fichero subido (CSV o Parquet), leído una sola vez por contenido.
+
+    Parameters:
+    uploaded_file (UploadedFile): Fichero de `st.file_uploader`.
+    progress (callable): Función f(fracción) llamada tras cada trozo leído.
+
+    Returns:
+    dict: Entrada de la caché con 'df' (DataFrame tipado), 'bytes' y 'profile' (ProfileReport).
+    """
+    cache = get_upload_cache()
+    digest = file_digest(uploaded_file)
+    entry = cache.get(digest)
+    if entry is not None:
+        return entry
+
+    progress = progress or (lambda fraction: None)
+    reader = _iter_parquet if uploaded_file.name.lower().endswith(".parquet") else _iter_csv
+    chunks = []
+
+    def typed_chunks():
+        # Cada trozo se tipa (float32, category...) en cuanto se lee, para no tener nunca
+        # el fichero entero con los tipos por defecto de pandas
+        for chunk in reader(uploaded_file, progress):
+            chunk = enforce_schema(chunk, CALIBRATION_SCHEMA)
+            chunks.append(chunk)
+            yield chunk
+
+    # El perfil se calcula trozo a trozo durante la lectura (sin una segunda pasada)
+    profile = profile_chunks(typed_chunks())
+    if not chunks:
+        raise ValueError("El fichero no contiene filas")
+    # Las categorías pueden variar entre trozos: se vuelven a unificar tras concatenar
+    df = enforce_schema(pd.concat(chunks, ignore_index=True), CALIBRATION_SCHEMA)
+    entry = cache.put(digest, df, profile)
+    progress(1.0)
+    return entry
+
+
+def numeric_columns(df):
+    """Columnas numéricas (sin booleanos) del DataFrame."""
+    return [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+
+
+def correlation_matrix(entry):
+    """
+    Matriz de correlación de Pearson de las columnas numéricas, calculada una vez por fichero.
+
+    Con más de CORR_SAMPLE_ROWS filas se usa una muestra aleatoria fija.
+    """
+    if entry["corr"] is None:
+        df = entry["df"]
+        data = df[numeric_columns(df)]
+        if len(data) > CORR_SAMPLE_ROWS:
+            data = data.sample(n=CORR_SAMPLE_ROWS, random_state=0)
+        entry["corr"] = data.astype("float64").corr()
+    return entry["corr"]
+
+
+def histogram(entry, column, bins=50):
+    """
+    Histograma de una columna sobre todas las filas (no una muestra), calculado una vez por
+    (fichero, columna, bins). Solo se dibujan `bins` barras, nunca millones de puntos.
+
+    Returns:
+    pd.DataFrame: Columnas 'start', 'end' y 'count'.
+    """
+    key = (column, bins)
+    if key not in entry["charts"]:
+        values = entry["df"][column].to_numpy(dtype="float64", na_value=np.nan)
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(0), np.zeros(1))
+        entry["charts"][key] = pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": counts})
+    return entry["charts"][key]
+
+
+def daily_series(entry, column):
+    """
+    Serie diaria (mediana y percentiles 10/90) de una columna, calculada una vez por fichero.
+    Reduce millones de filas a un punto por día para dibujar la evolución temporal.
+
+    Returns:
+    pd.DataFrame: Columnas 'date', 'p10', 'median' y 'p90' (vacío si no hay columna 'date').
+    """
+    key = ("daily", column)
+    if key not in entry["charts"]:
+        df = entry["df"]
+        if "date" not in df.columns:
+            entry["charts"][key] = pd.DataFrame(columns=["date", "p10", "median", "p90"])
+        else:
+            grouped = df.groupby(df["date"].dt.normalize(), observed=True)[column]
+            series = grouped.quantile([0.1, 0.5, 0.9]).unstack()
+            series.columns = ["p10", "median", "p90"]
+            entry["charts"][key] = series.rename_axis("date").reset_index()
+    return entry["charts"][key]